@@ -0,0 +1,48 @@
+"""Compares per-call latency of CalculatorTool's scalar fast path against numexpr.
+
+Run from this folder with `python benchmark.py`. Every expression is first checked to
+give the same text on both paths. numexpr is timed both on a first call, which includes
+compiling the expression, and on a call that hits the compiled-expression cache.
+"""
+
+import timeit
+
+from tool import ExpressionCache, evaluate_scalar
+
+EXPRESSIONS = [
+    "2 + 3",
+    "7 / 2",
+    "-(4 - 10) * 3",
+    "1.5 * (2 + 3.25) / 7",
+    "2.0 ** 0.5",
+    "(12345 * 678 - 91011) / 1213.5",
+]
+NUMBER = 2_000
+
+
+def per_call_us(call) -> float:
+    return min(timeit.repeat(call, number=NUMBER, repeat=3)) / NUMBER * 1e6
+
+
+def main() -> None:
+    uncached = ExpressionCache(max_entries=0)
+    cached = ExpressionCache()
+
+    print(f"{'expression':<34}{'fast path':>12}{'numexpr first call':>20}{'numexpr cached':>16}")
+    for expression in EXPRESSIONS:
+        fast_value = evaluate_scalar(expression)
+        if fast_value is None:
+            raise ValueError(f"{expression} is not handled by the fast path")
+        if str(fast_value) != str(cached.get(expression)()):
+            raise ValueError(f"results differ for {expression}: {fast_value} != {cached.get(expression)()}")
+
+        timings = (
+            per_call_us(lambda: evaluate_scalar(expression)),
+            per_call_us(lambda: uncached.get(expression)()),
+            per_call_us(lambda: cached.get(expression)()),
+        )
+        print(f"{expression:<34}" + "".join(f"{timing:>{width}.2f}us" for timing, width in zip(timings, (10, 18, 14))))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,122 @@
-from schema import Literal, Schema
+import ast
+import operator
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional as OptionalType, Union
 
-from griptape.artifacts import BaseArtifact, ErrorArtifact, TextArtifact
+from attrs import define, field
+from schema import Literal, Optional, Or, Schema
+
+from griptape.artifacts import BaseArtifact, ErrorArtifact, JsonArtifact, TextArtifact
 from griptape.tools import BaseTool
 from griptape.utils.decorators import activity
 
+DEFAULT_EXPRESSION_CACHE_SIZE = 256
+# Upper bound on the rows a single calculate_batch call may evaluate
+MAX_BATCH_ROWS = 1_000_000
+
+INT32_MIN = -(2**31)
+INT32_MAX = 2**31 - 1
+# Operators the scalar fast path evaluates itself. Anything else (functions, comparisons,
+# %, //, variables, ...) is left to numexpr.
+SCALAR_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+}
+SCALAR_UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+class UnsupportedExpression(Exception):
+    pass
+
+
+def _evaluate_scalar_node(node: ast.AST) -> Union[int, float]:
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = node.value
+    elif isinstance(node, ast.UnaryOp) and type(node.op) in SCALAR_UNARY_OPERATORS:
+        value = SCALAR_UNARY_OPERATORS[type(node.op)](_evaluate_scalar_node(node.operand))
+    elif isinstance(node, ast.BinOp) and type(node.op) in SCALAR_BINARY_OPERATORS:
+        left = _evaluate_scalar_node(node.left)
+        right = _evaluate_scalar_node(node.right)
+        # Integer and negative-base powers are typed differently by numexpr, so leave them to it
+        if isinstance(node.op, ast.Pow) and not (isinstance(left, float) and isinstance(right, float) and left >= 0):
+            raise UnsupportedExpression()
+        value = SCALAR_BINARY_OPERATORS[type(node.op)](left, right)
+    else:
+        raise UnsupportedExpression()
+
+    # numexpr computes integers as int32, so only stay on the fast path while they fit
+    if isinstance(value, int) and not INT32_MIN <= value <= INT32_MAX:
+        raise UnsupportedExpression()
+
+    return value
+
+
+def evaluate_scalar(expression: str) -> OptionalType[Union[int, float]]:
+    """Evaluates plain scalar arithmetic without numexpr, or returns None if the expression needs it.
+
+    Only int and float literals with unary +/- and binary +, -, *, / and ** are supported,
+    with the same semantics numexpr gives them: / is true division, integers stay within
+    int32 and ** is limited to float operands with a non-negative base. Errors such as
+    division by zero also return None, so numexpr reports them as it always has.
+    """
+    try:
+        return _evaluate_scalar_node(ast.parse(expression.strip(), mode="eval").body)
+    except (SyntaxError, UnsupportedExpression, ArithmeticError, ValueError):
+        return None
+
+
+class ExpressionCache:
+    """LRU cache of compiled numexpr programs, keyed by expression.
 
+    Each expression is parsed and compiled once, with every variable it uses typed as
+    float64, so repeated calls skip numexpr's name lookup, argument checks and compiler.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_EXPRESSION_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, expression: str):
+        """Returns the compiled expression if it is cached, without compiling it."""
+        with self._lock:
+            compiled = self._entries.get(expression)
+            if compiled is not None:
+                self._entries.move_to_end(expression)
+            return compiled
+
+    def get(self, expression: str):
+        compiled = self.lookup(expression)
+        if compiled is not None:
+            return compiled
+
+        import numexpr  # pyright: ignore[reportMissingImports]
+        import numpy  # pyright: ignore[reportMissingImports]
+
+        names, _ = numexpr.necompiler.getExprNames(expression, {})
+        compiled = numexpr.NumExpr(expression, signature=[(name, numpy.float64) for name in names])
+
+        with self._lock:
+            self._entries[expression] = compiled
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return compiled
+
+
+@define
 class CalculatorTool(BaseTool):
+    num_threads: OptionalType[int] = field(default=None, kw_only=True)
+    expression_cache: ExpressionCache = field(factory=ExpressionCache, kw_only=True)
+
     @activity(
         config={
             "description": "Can be used for computing simple numerical or algebraic calculations in Python",
@@ -21,15 +132,89 @@ class CalculatorTool(BaseTool):
         },
     )
     def calculate(self, params: dict) -> BaseArtifact:
-        import numexpr  # pyright: ignore[reportMissingImports]
-
         try:
             expression = params["values"]["expression"]
 
-            return TextArtifact(numexpr.evaluate(expression))
+            # Repeated expressions are cheapest to run compiled. New ones are usually small scalar
+            # arithmetic, which the fast path evaluates in a fraction of numexpr's compile time.
+            compiled = self.expression_cache.lookup(expression)
+            if compiled is None:
+                value = evaluate_scalar(expression)
+                if value is not None:
+                    return TextArtifact(value)
+                compiled = self.expression_cache.get(expression)
+
+            if compiled.input_names:
+                raise ValueError(f"unknown variables {', '.join(compiled.input_names)}")
+
+            return TextArtifact(compiled())
+        except Exception as e:
+            return ErrorArtifact(f"error calculating: {e}")
+
+    @activity(
+        config={
+            "description": "Can be used for evaluating a formula over many rows of values, or many expressions, "
+            "in a single call. Returns a list of results for each expression",
+            "schema": Schema(
+                {
+                    Literal(
+                        "expressions",
+                        description="Arithmetic expressions parsable in pure Python, one per line item. "
+                        "They may use the variables given in `variables`",
+                    ): [str],
+                    Optional(
+                        Literal(
+                            "variables",
+                            description="Mapping of variable name to a list of values (one per row) or a single "
+                            "number. All lists must have the same length",
+                        )
+                    ): {str: Or(int, float, [Or(int, float)])},
+                },
+            ),
+        },
+    )
+    def calculate_batch(self, params: dict) -> BaseArtifact:
+        import numexpr  # pyright: ignore[reportMissingImports]
+        import numpy  # pyright: ignore[reportMissingImports]
+
+        try:
+            variables = {
+                name: numpy.asarray(values, dtype=numpy.float64)
+                for name, values in params["values"].get("variables", {}).items()
+            }
+            rows = {len(values) for values in variables.values() if values.ndim}
+            if len(rows) > 1:
+                raise ValueError("all variable lists must have the same length")
+            if rows and rows.pop() > MAX_BATCH_ROWS:
+                raise ValueError(f"at most {MAX_BATCH_ROWS} rows can be evaluated per call")
         except Exception as e:
             return ErrorArtifact(f"error calculating: {e}")
 
+        if self.num_threads is not None:
+            numexpr.set_num_threads(self.num_threads)
+
+        results = []
+        for expression in params["values"]["expressions"]:
+            try:
+                compiled = self.expression_cache.get(expression)
+                missing = [name for name in compiled.input_names if name not in variables]
+                if missing:
+                    raise ValueError(f"unknown variables {', '.join(missing)}")
+
+                result = compiled(*[variables[name] for name in compiled.input_names])
+                results.append({"expression": expression, "result": result.tolist()})
+            except Exception as e:
+                results.append({"expression": expression, "error": f"error calculating: {e}"})
+
+        return JsonArtifact(results)
+
 
 def init_tool() -> BaseTool:
-    return CalculatorTool()
+    num_threads = os.getenv("CALCULATOR_NUMEXPR_THREADS")
+
+    return CalculatorTool(
+        num_threads=int(num_threads) if num_threads else None,
+        expression_cache=ExpressionCache(
+            int(os.getenv("CALCULATOR_EXPRESSION_CACHE_SIZE", DEFAULT_EXPRESSION_CACHE_SIZE))
+        ),
+    )
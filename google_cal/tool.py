@@ -1,8 +1,20 @@
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
-from datetime import datetime, timedelta
-from typing import List, Dict
+from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Dict
+from zoneinfo import ZoneInfo
+from concurrent.futures import ThreadPoolExecutor
+import bisect
+import aiohttp
+import asyncio
+import google_auth_httplib2
+import httplib2
 import os
+import random
+import threading
+import yarl
 from schema import Schema, Literal, Optional
 from griptape.artifacts import ListArtifact, JsonArtifact
 from griptape.tools import BaseTool
@@ -10,7 +22,6 @@ from griptape.utils.decorators import activity
 import uuid
 from zoomus import ZoomClient
 import json
-import jwt
 import traceback
 import time
 
@@ -27,9 +38,916 @@ SERVICE_ACCOUNT_INFO = {
     #"client_x509_cert_url": f"https://www.googleapis.com/robot/v1/metadata/x509/{os.getenv('GOOGLE_CLIENT_EMAIL').replace('@', '%40')}"
 }
 
+
+class GoogleClientCache:
+    """Process-wide cache of service account credentials and built API clients.
+
+    Credentials are keyed by (scopes, delegated subject) and only refreshed when they
+    are close to expiry. Service objects are keyed by (api, version, scopes, subject)
+    and kept per thread, since googleapiclient services and their pooled httplib2
+    connections are not thread-safe.
+    """
+
+    def __init__(self, service_account_info: Callable[[], dict], refresh_margin: timedelta = timedelta(minutes=5)):
+        self.service_account_info = service_account_info
+        self.refresh_margin = refresh_margin
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._credentials = {}
+        self._local = threading.local()
+
+    def get_credentials(self, scopes: List[str], subject: str = None) -> service_account.Credentials:
+        key = (tuple(sorted(scopes)), subject)
+        with self._lock:
+            credentials = self._credentials.get(key)
+            if credentials is None:
+                credentials = service_account.Credentials.from_service_account_info(
+                    self.service_account_info(),
+                    scopes=list(key[0])
+                )
+                if subject:
+                    credentials = credentials.with_subject(subject)
+                self._credentials[key] = credentials
+
+            if self._needs_refresh(credentials):
+                credentials.refresh(google_auth_httplib2.Request(build_http()))
+
+        return credentials
+
+    def get_service(self, api: str, version: str, scopes: List[str], subject: str = None):
+        key = (api, version, tuple(sorted(scopes)), subject)
+        credentials = self.get_credentials(scopes, subject)
+
+        services = getattr(self._local, 'services', None)
+        if services is None:
+            services = self._local.services = {}
+
+        service = services.get(key)
+        with self._lock:
+            if service is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if service is None:
+            http = google_auth_httplib2.AuthorizedHttp(credentials, http=build_http())
+            service = build(api, version, http=http, cache_discovery=False)
+            services[key] = service
+
+        return service
+
+    def refresh(self, credentials: service_account.Credentials) -> None:
+        """Refreshes credentials that are close to expiry, under the same lock as get_credentials."""
+        with self._lock:
+            if self._needs_refresh(credentials):
+                credentials.refresh(google_auth_httplib2.Request(build_http()))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'credentials': len(self._credentials)
+            }
+
+    def _needs_refresh(self, credentials: service_account.Credentials) -> bool:
+        if not credentials.token or credentials.expiry is None:
+            return True
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return credentials.expiry - self.refresh_margin <= now
+
+
+CLIENT_CACHE = GoogleClientCache(lambda: SERVICE_ACCOUNT_INFO)
+
+
+DEFAULT_ASYNC_CONCURRENCY = 10
+# The socket timeout googleapiclient's build_http gives httplib2
+HTTP_TIMEOUT = 60
+
+
+class CapturedRequest(Exception):
+    """Carries what a googleapiclient request would have sent, as (uri, method, body, headers)."""
+
+
+class RecordingHttp:
+    """Stands in for httplib2.Http, raising CapturedRequest instead of sending anything."""
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        raise CapturedRequest(uri, method, body, headers or {})
+
+
+class ReplayHttp:
+    """Stands in for httplib2.Http, answering with a response that has already arrived."""
+
+    def __init__(self, response: httplib2.Response, content: bytes):
+        self.response = response
+        self.content = content
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        return self.response, self.content
+
+
+def request_credentials(request):
+    """Returns the credentials a request, or the calls in a batch request, are authorized with."""
+    # BatchHttpRequest keeps its calls in _requests
+    calls = getattr(request, '_requests', None)
+    http = next(iter(calls.values())).http if calls else request.http
+    credentials = getattr(http, 'credentials', None)
+    # A plain httplib2.Http has credentials too, for HTTP authentication
+    return None if isinstance(credentials, httplib2.Credentials) else credentials
+
+
+class AsyncGoogleTransport:
+    """Sends googleapiclient requests, batch requests included, over aiohttp.
+
+    googleapiclient still builds each request and parses each response, so URLs, bodies,
+    batch encoding and HttpErrors are the same as with httplib2: a request is executed
+    once against RecordingHttp to capture what it would send, sent with aiohttp, then
+    executed again against ReplayHttp to parse the reply. Every call runs on one event
+    loop on a background thread and shares its pooled aiohttp session, and a semaphore
+    per API caps how many calls to that API are in flight. Sync code runs coroutines on
+    the loop with run(), and sends awaited on other loops are handed over to it.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_ASYNC_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._loop = None
+        self._session = None
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def run(self, coroutine):
+        """Runs coroutine on the transport's loop, blocking the calling thread until it returns."""
+        loop = self._get_loop()
+        if self._on_loop(loop):
+            coroutine.close()
+            raise RuntimeError("run() would block the transport's own loop, await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    def iterate(self, generator):
+        """Yields the items of an async generator to sync code."""
+        try:
+            while True:
+                try:
+                    yield self.run(generator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.run(generator.aclose())
+
+    async def send(self, request, api: str):
+        """Sends request and returns what request.execute() would; a batch calls its callbacks."""
+        loop = self._get_loop()
+        if not self._on_loop(loop):
+            return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self.send(request, api), loop))
+
+        # Refreshed before capturing, since a batch writes its calls' tokens into its body
+        credentials = request_credentials(request)
+        if credentials is not None and not credentials.valid:
+            await asyncio.to_thread(CLIENT_CACHE.refresh, credentials)
+
+        try:
+            # Only an empty batch returns without sending anything
+            return request.execute(http=RecordingHttp())
+        except CapturedRequest as captured:
+            uri, method, body, headers = captured.args
+
+        # googleapiclient counts the length of the body as a str, aiohttp sets it from the bytes it sends
+        headers = {name: value for name, value in headers.items() if name.lower() != 'content-length'}
+        if credentials is not None:
+            credentials.apply(headers)
+
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(sock_connect=HTTP_TIMEOUT, sock_read=HTTP_TIMEOUT)
+            )
+        if api not in self._semaphores:
+            self._semaphores[api] = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphores[api]:
+            # encoded=True keeps the URL exactly as googleapiclient escaped it
+            async with self._session.request(
+                method,
+                yarl.URL(uri, encoded=True),
+                data=body.encode() if isinstance(body, str) else body,
+                headers=headers
+            ) as response:
+                content = await response.read()
+                info = {name.lower(): value for name, value in response.headers.items()}
+
+        # aiohttp has already decompressed the body
+        info.pop('content-encoding', None)
+        info['status'] = response.status
+        return request.execute(http=ReplayHttp(httplib2.Response(info), content))
+
+    def close(self) -> None:
+        """Closes the pooled session and stops the loop; the next call starts new ones."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), loop).result()
+        self._session = None
+        self._semaphores = {}
+        loop.call_soon_threadsafe(loop.stop)
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name='google-api-transport', daemon=True).start()
+            return self._loop
+
+    @staticmethod
+    def _on_loop(loop: asyncio.AbstractEventLoop) -> bool:
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
+
+
+TRANSPORT = AsyncGoogleTransport(int(os.getenv('GOOGLE_ASYNC_CONCURRENCY', DEFAULT_ASYNC_CONCURRENCY)))
+
+
+def field_mask(spec: dict) -> str:
+    """Builds a partial-response field mask from a nested projection spec,
+    e.g. {'id': None, 'payload': {'headers': None}} becomes 'id,payload(headers)'."""
+    return ','.join(
+        f"{name}({field_mask(children)})" if children else name
+        for name, children in spec.items()
+    )
+
+
+def fields(spec: dict) -> dict:
+    """Returns the `fields` request argument for spec, or nothing when GOOGLE_API_FIELD_MASKS=false."""
+    if os.getenv('GOOGLE_API_FIELD_MASKS', 'true').lower() == 'false':
+        return {}
+    return {'fields': field_mask(spec)}
+
+
+# Projections of the resources each call reads, used to request partial responses
+EVENT_FIELDS = {
+    'id': None,
+    'summary': None,
+    'start': None,
+    'end': None,
+    'location': None,
+    'description': None,
+    'attendees': {'email': None}
+}
+EVENT_LIST_FIELDS = {'items': EVENT_FIELDS, 'nextPageToken': None}
+EVENT_SYNC_FIELDS = {
+    'items': {**EVENT_FIELDS, 'status': None, 'attendees': {'email': None, 'displayName': None}},
+    'nextPageToken': None,
+    'nextSyncToken': None,
+    'timeZone': None
+}
+FREEBUSY_FIELDS = {'calendars': None}
+CREATED_EVENT_FIELDS = {
+    'id': None,
+    'htmlLink': None,
+    'attendees': None,
+    'status': None,
+    'conferenceData': None
+}
+
+
+# A 429 means the call was throttled and not carried out, so it is always retried. A 5xx can
+# come after the server committed a write, so it is only retried for requests that don't write
+THROTTLED_STATUS = 429
+TRANSIENT_STATUSES = {500, 502, 503, 504}
+IDEMPOTENT_HTTP_METHODS = {'GET', 'HEAD'}
+DEFAULT_RATE_LIMIT = 10.0
+DEFAULT_MAX_RETRIES = 5
+# Calendar's per-user quota of 600 queries a minute, in queries per second; every call
+# costs one (https://developers.google.com/calendar/api/guides/quota)
+DEFAULT_RATE_LIMITS = {'calendar': 10.0}
+QUOTA_UNITS = {}
+# POST methods that only read, so they can be resent like a GET
+READ_ONLY_METHODS = {'calendar.freebusy.query'}
+
+
+def parse_rate_limits(spec: str) -> Dict[str, float]:
+    """Parses GOOGLE_API_RATE_LIMITS, e.g. 'gmail=250,calendar=10', into quota units per second per API."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in (spec or '').split(','))):
+        api, _, rate = item.partition('=')
+        limits[api.strip()] = float(rate)
+    return limits
+
+
+def request_cost(request) -> int:
+    return QUOTA_UNITS.get(request.methodId, 1)
+
+
+def is_idempotent(request) -> bool:
+    return request.method in IDEMPOTENT_HTTP_METHODS or request.methodId in READ_ONLY_METHODS
+
+
+def request_key(request) -> tuple:
+    """Returns the (api, delegated user) a request is paced under."""
+    # service_account.Credentials only exposes the delegated user as _subject
+    return request.methodId.split('.')[0], getattr(request_credentials(request), '_subject', None)
+
+
+class RateLimiter:
+    """Token-bucket pacing per (api, delegated user) with jittered exponential backoff.
+
+    Each bucket refills at the API's per-user quota, in quota units per second, and holds
+    at most one second of units. Callers reserve a request's units up front and sleep off
+    any deficit, so waiters are served in arrival order and throughput flattens out near
+    the quota instead of turning into errors. A 429 response, or a 5xx to a request that
+    doesn't write, is retried after its Retry-After, or after a full-jitter exponential
+    backoff, and a Retry-After also pauses every other caller sharing the bucket.
+
+    Calls are sent through transport. execute and execute_batch block the calling
+    thread, while aexecute and aexecute_batch wait without holding it.
+    """
+
+    def __init__(
+        self,
+        rates: Dict[str, float] = None,
+        default_rate: float = DEFAULT_RATE_LIMIT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = 1.0,
+        max_delay: float = 32.0,
+        transport: AsyncGoogleTransport = None
+    ):
+        self.rates = {**DEFAULT_RATE_LIMITS, **(rates or {})}
+        self.default_rate = default_rate
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.transport = transport or TRANSPORT
+        self._buckets = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _refill(self, key: tuple) -> tuple:
+        rate = self.rates.get(key[0], self.default_rate)
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (max(rate, 1.0), now))
+        self._buckets[key] = (min(max(rate, 1.0), tokens + (now - updated) * rate), now)
+        if key not in self._metrics:
+            self._metrics[key] = {'quota_units': 0, 'retries': 0, 'queue_depth': 0, 'throttled_seconds': 0.0}
+        return rate, self._metrics[key]
+
+    def _reserve(self, key: tuple, tokens: int) -> float:
+        """Takes tokens from the bucket and returns how long the caller must wait for them."""
+        with self._lock:
+            rate, metrics = self._refill(key)
+            balance, updated = self._buckets[key]
+            self._buckets[key] = (balance - tokens, updated)
+            wait = max(0.0, (tokens - balance) / rate)
+            metrics['quota_units'] += tokens
+            if wait > 0:
+                metrics['queue_depth'] += 1
+                metrics['throttled_seconds'] += wait
+            return wait
+
+    def _release(self, key: tuple) -> None:
+        with self._lock:
+            self._metrics[key]['queue_depth'] -= 1
+
+    def _backoff(self, key: tuple, attempt: int, error: HttpError) -> float:
+        """Returns the delay before retrying error, pausing the whole bucket on a Retry-After."""
+        retry_after = None
+        try:
+            retry_after = float(error.resp.get('retry-after'))
+        except (TypeError, ValueError):
+            pass
+
+        with self._lock:
+            rate, metrics = self._refill(key)
+            metrics['retries'] += 1
+            if retry_after is None:
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+            else:
+                delay = retry_after
+                balance, updated = self._buckets[key]
+                self._buckets[key] = (min(balance, -retry_after * rate), updated)
+            metrics['throttled_seconds'] += delay
+            return delay
+
+    def _retryable(self, error: Exception, attempt: int, idempotent: bool) -> bool:
+        return (
+            isinstance(error, HttpError)
+            and attempt < self.max_retries
+            and (error.resp.status == THROTTLED_STATUS or (idempotent and error.resp.status in TRANSIENT_STATUSES))
+        )
+
+    def execute(self, request, tokens: int = None, key: tuple = None, idempotent: bool = None):
+        return self.transport.run(self.aexecute(request, tokens, key, idempotent))
+
+    async def aexecute(self, request, tokens: int = None, key: tuple = None, idempotent: bool = None):
+        """Executes a googleapiclient request under the limiter.
+
+        A batch passes its total tokens, its key, and whether every call in it is idempotent.
+        """
+        key = key or request_key(request)
+        tokens = request_cost(request) if tokens is None else tokens
+        idempotent = is_idempotent(request) if idempotent is None else idempotent
+        for attempt in range(self.max_retries + 1):
+            wait = self._reserve(key, tokens)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                self._release(key)
+            try:
+                return await self.transport.send(request, key[0])
+            except HttpError as e:
+                if not self._retryable(e, attempt, idempotent):
+                    raise
+                await asyncio.sleep(self._backoff(key, attempt, e))
+
+    def execute_batch(self, service, requests: Dict[str, object], callback: Callable) -> None:
+        self.transport.run(self.aexecute_batch(service, requests, callback))
+
+    async def aexecute_batch(self, service, requests: Dict[str, object], callback: Callable) -> None:
+        """Executes requests as one batch paced by their quota units, retrying throttled items.
+
+        callback receives (request_id, response, exception) once per request, like a
+        batch callback. Items that fail with a retryable status are resent in a smaller
+        batch after a backoff instead of being reported.
+        """
+        if not requests:
+            return
+
+        key = request_key(next(iter(requests.values())))
+        pending = dict(requests)
+        for attempt in range(self.max_retries + 1):
+            retry = {}
+
+            def on_response(request_id, response, exception):
+                if exception is not None and self._retryable(exception, attempt, is_idempotent(requests[request_id])):
+                    retry[request_id] = exception
+                else:
+                    callback(request_id, response, exception)
+
+            batch = service.new_batch_http_request(callback=on_response)
+            for request_id, request in pending.items():
+                batch.add(request, request_id=request_id)
+            await self.aexecute(
+                batch,
+                tokens=sum(request_cost(request) for request in pending.values()),
+                key=key,
+                idempotent=all(is_idempotent(request) for request in pending.values())
+            )
+
+            if not retry:
+                return
+            pending = {request_id: requests[request_id] for request_id in retry}
+            await asyncio.sleep(self._backoff(key, attempt, next(iter(retry.values()))))
+
+    def metrics(self) -> Dict[str, dict]:
+        """Returns request, retry, queue depth and throttled time counters per 'api:user' bucket."""
+        with self._lock:
+            return {f"{api}:{subject or 'default'}": dict(metrics) for (api, subject), metrics in self._metrics.items()}
+
+
+RATE_LIMITER = RateLimiter(
+    parse_rate_limits(os.getenv('GOOGLE_API_RATE_LIMITS')),
+    default_rate=float(os.getenv('GOOGLE_API_DEFAULT_RATE_LIMIT', DEFAULT_RATE_LIMIT)),
+    max_retries=int(os.getenv('GOOGLE_API_MAX_RETRIES', DEFAULT_MAX_RETRIES))
+)
+
+
+READONLY_SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
+EVENTS_SCOPES = ['https://www.googleapis.com/auth/calendar.events']
+
+
+def calendar_service(scopes: List[str]):
+    return CLIENT_CACHE.get_service('calendar', 'v3', scopes=scopes, subject=os.getenv('GOOGLE_DELEGATED_EMAIL'))
+
+# How far back the event cache is filled; windows starting earlier are listed from the API
+DEFAULT_EVENT_CACHE_DAYS = 30
+
+
+def parse_event_time(value: dict, time_zone: str = 'UTC') -> datetime:
+    """Parses an event start/end into an aware datetime; all-day dates start at midnight in time_zone."""
+    if 'dateTime' in value:
+        return parse_iso_datetime(value['dateTime'])
+    return datetime.fromisoformat(value['date']).replace(tzinfo=ZoneInfo(time_zone))
+
+
+def parse_iso_datetime(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def parse_event(event: dict) -> dict:
+    return {
+        'id': event['id'],
+        'summary': event.get('summary', 'No title'),
+        'start': event['start'].get('dateTime', event['start'].get('date')),
+        'end': event['end'].get('dateTime', event['end'].get('date')),
+        'location': event.get('location', ''),
+        'description': event.get('description', ''),
+        'attendees': [
+            attendee.get('email')
+            for attendee in event.get('attendees', [])
+        ]
+    }
+
+
+class CalendarEventCache:
+    """Local copy of one calendar's events, kept current with events().list syncToken deltas.
+
+    Events are expanded server side (singleEvents=True) once, during the initial fill,
+    and indexed by start time. Window queries then only look at events starting in
+    [timeMin - longest event duration, timeMax), so they never scan the whole calendar.
+    """
+
+    def __init__(self, calendar_id: str = 'primary', days: int = DEFAULT_EVENT_CACHE_DAYS):
+        self.calendar_id = calendar_id
+        self.days = days
+        self.sync_token = None
+        self.coverage_start = None
+        self.time_zone = 'UTC'
+        self.events = {}
+        self._index = []
+        self._max_duration = timedelta(0)
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def sync(self, service) -> None:
+        with self._lock:
+            if self.sync_token is None:
+                self._full_sync(service)
+                return
+
+            try:
+                self._apply(service, syncToken=self.sync_token)
+            except HttpError as e:
+                # 410 Gone: the sync token expired, so the cache has to be refilled from scratch
+                if e.resp.status != 410:
+                    raise
+                self._full_sync(service)
+
+    def covers(self, time_min: datetime) -> bool:
+        """Whether the cache holds every event from time_min on, or will once it is first filled."""
+        coverage_start = self.coverage_start or datetime.now(timezone.utc) - timedelta(days=self.days)
+        return time_min >= coverage_start
+
+    def search(self, time_min: datetime, time_max: datetime, q: str = None, max_results: int = 250) -> List[dict]:
+        with self._lock:
+            if self._dirty:
+                self._rebuild_index()
+
+            terms = (q or '').lower().split()
+            lo = bisect.bisect_left(self._index, (time_min - self._max_duration,))
+            hi = bisect.bisect_left(self._index, (time_max,))
+            matches = []
+
+            for _, end, event_id in self._index[lo:hi]:
+                if end <= time_min:
+                    continue
+                event = self.events[event_id]
+                if terms and not all(term in self._search_text(event) for term in terms):
+                    continue
+                matches.append(event)
+                if len(matches) >= max_results:
+                    break
+
+            return matches
+
+    def _full_sync(self, service) -> None:
+        self.events = {}
+        self.sync_token = None
+        self._dirty = True
+        self.coverage_start = datetime.now(timezone.utc) - timedelta(days=self.days)
+        self._apply(service, timeMin=self.coverage_start.isoformat())
+
+    def _apply(self, service, **kwargs) -> None:
+        page_token = None
+        changes = {}
+
+        while True:
+            results = RATE_LIMITER.execute(service.events().list(
+                calendarId=self.calendar_id,
+                singleEvents=True,
+                maxResults=2500,
+                pageToken=page_token,
+                **fields(EVENT_SYNC_FIELDS),
+                **kwargs
+            ))
+
+            self.time_zone = results.get('timeZone', self.time_zone)
+            for event in results.get('items', []):
+                changes[event['id']] = event
+
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+
+        for event_id, event in changes.items():
+            if event.get('status') == 'cancelled':
+                self.events.pop(event_id, None)
+            else:
+                self.events[event_id] = event
+
+        self.sync_token = results.get('nextSyncToken')
+        self._dirty = self._dirty or bool(changes) or not self._index
+
+    def _rebuild_index(self) -> None:
+        index = []
+        max_duration = timedelta(0)
+        for event_id, event in self.events.items():
+            start = parse_event_time(event['start'], self.time_zone)
+            end = parse_event_time(event['end'], self.time_zone)
+            index.append((start, end, event_id))
+            max_duration = max(max_duration, end - start)
+
+        index.sort()
+        self._index = index
+        self._max_duration = max_duration
+        self._dirty = False
+
+    @staticmethod
+    def _search_text(event: dict) -> str:
+        return ' '.join([
+            event.get('summary', ''),
+            event.get('description', ''),
+            event.get('location', ''),
+            *(attendee.get('email', '') for attendee in event.get('attendees', [])),
+            *(attendee.get('displayName', '') for attendee in event.get('attendees', []))
+        ]).lower()
+
+
+EVENT_CACHES = {}
+EVENT_CACHES_LOCK = threading.Lock()
+
+
+def get_event_cache(calendar_id: str, subject: str) -> CalendarEventCache:
+    """Returns the process-wide event cache for (calendar, delegated user), creating it on first use."""
+    with EVENT_CACHES_LOCK:
+        key = (calendar_id, subject)
+        if key not in EVENT_CACHES:
+            EVENT_CACHES[key] = CalendarEventCache(calendar_id)
+        return EVENT_CACHES[key]
+
+
+# freebusy.query accepts at most 50 calendars per request
+FREEBUSY_GROUP_SIZE = 50
+SLOT_STEP = timedelta(minutes=30)
+
+
+def merge_intervals(intervals: List[tuple]) -> List[tuple]:
+    """Merges overlapping or touching (start, end) intervals with a single sort-and-sweep pass."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def working_windows(time_min: datetime, time_max: datetime, day_start: str, day_end: str,
+                    time_zone: str, include_weekends: bool = False) -> List[tuple]:
+    """Returns the working-hour windows of every day in [time_min, time_max), clipped to that range."""
+    tz = ZoneInfo(time_zone)
+    start_time = datetime.strptime(day_start, '%H:%M').time()
+    end_time = datetime.strptime(day_end, '%H:%M').time()
+    windows = []
+
+    day = time_min.astimezone(tz).date()
+    while day <= time_max.astimezone(tz).date():
+        if include_weekends or day.weekday() < 5:
+            start = max(datetime.combine(day, start_time, tz), time_min)
+            end = min(datetime.combine(day, end_time, tz), time_max)
+            if start < end:
+                windows.append((start, end))
+        day += timedelta(days=1)
+
+    return windows
+
+
+def free_slots(windows: List[tuple], busy: List[tuple], duration: timedelta, step: timedelta = SLOT_STEP) -> List[tuple]:
+    """Sweeps the merged busy intervals across the windows and returns the slots of length duration
+    that fit in the free gaps, one every step from the start of each gap.
+
+    Slots are ranked so that the earliest slot of every gap comes first, followed by the
+    later alternatives within each gap, each group in chronological order.
+    """
+    slots = []
+    busy = merge_intervals(busy)
+    i = 0
+
+    for window_start, window_end in windows:
+        while i < len(busy) and busy[i][1] <= window_start:
+            i += 1
+
+        cursor = window_start
+        j = i
+        while cursor < window_end:
+            gap_end = min(busy[j][0], window_end) if j < len(busy) else window_end
+            slot_start = cursor
+            rank = 0
+            while slot_start + duration <= gap_end:
+                slots.append((rank, slot_start, slot_start + duration))
+                slot_start += step
+                rank += 1
+            if j >= len(busy) or busy[j][0] >= window_end:
+                break
+            cursor = max(cursor, busy[j][1])
+            j += 1
+
+    return [(start, end) for _, start, end in sorted(slots)]
+
+
+def freebusy_requests(service, values: dict) -> list:
+    """Builds one freebusy.query per group of FREEBUSY_GROUP_SIZE calendars (the delegated user plus attendees)."""
+    calendars = list(dict.fromkeys(['primary', *values["attendees"]]))
+    return [
+        service.freebusy().query(body={
+            'timeMin': parse_iso_datetime(values["timeMin"]).isoformat(),
+            'timeMax': parse_iso_datetime(values["timeMax"]).isoformat(),
+            'items': [{'id': calendar_id} for calendar_id in calendars[start:start + FREEBUSY_GROUP_SIZE]]
+        }, **fields(FREEBUSY_FIELDS))
+        for start in range(0, len(calendars), FREEBUSY_GROUP_SIZE)
+    ]
+
+
+def rank_free_slots(values: dict, results: List[dict]) -> dict:
+    """Merges the busy periods of freebusy results and returns the ranked slots plus per-calendar errors."""
+    busy = []
+    errors = {}
+
+    for result in results:
+        for calendar_id, calendar in result.get('calendars', {}).items():
+            if calendar.get('errors'):
+                errors[calendar_id] = [error.get('reason') for error in calendar['errors']]
+            busy.extend(
+                (parse_iso_datetime(period['start']), parse_iso_datetime(period['end']))
+                for period in calendar.get('busy', [])
+            )
+
+    time_zone = values.get("timeZone", 'UTC')
+    windows = working_windows(
+        parse_iso_datetime(values["timeMin"]),
+        parse_iso_datetime(values["timeMax"]),
+        values.get("workingHoursStart", '09:00'),
+        values.get("workingHoursEnd", '17:00'),
+        time_zone,
+        include_weekends=values.get("includeWeekends", False)
+    )
+    slots = free_slots(windows, busy, timedelta(minutes=values["duration"]))
+    tz = ZoneInfo(time_zone)
+
+    return {
+        'slots': [
+            {'start': start.astimezone(tz).isoformat(), 'end': end.astimezone(tz).isoformat()}
+            for start, end in slots[:values.get("maxResults", 10)]
+        ],
+        'errors': errors
+    }
+
+
+# Zoom meetings are created here while the Calendar insert runs on the calling thread
+ZOOM_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='zoom')
+# Zoom Server-to-Server OAuth tokens last an hour, and are refreshed this long before they expire
+ZOOM_TOKEN_LIFETIME = 3600
+ZOOM_TOKEN_MARGIN = 60
+# The Calendar batch endpoint accepts at most 50 calls per batch
+CALENDAR_BATCH_SIZE = 50
+
+
+def build_event_body(values: dict) -> dict:
+    event_body = {
+        'summary': values["summary"],
+        'start': {'dateTime': values["start"]},
+        'end': {'dateTime': values["end"]},
+    }
+
+    if values.get("description"):
+        event_body['description'] = values["description"]
+
+    if values.get("location"):
+        event_body['location'] = values["location"]
+
+    if values.get("attendees"):
+        event_body['attendees'] = [{'email': email} for email in values["attendees"]]
+
+    if (values.get("conference_type") or '').lower() == 'meet':
+        event_body['conferenceData'] = {
+            'createRequest': {
+                'requestId': f"{uuid.uuid4().hex}",
+                'conferenceSolutionKey': {'type': 'hangoutsMeet'}
+            }
+        }
+
+    return event_body
+
+
+def list_events_request(service, values: dict):
+    return service.events().list(
+        calendarId='primary',
+        timeMin=values["timeMin"],
+        timeMax=values["timeMax"],
+        maxResults=values["maxResults"],
+        q=values["q"],
+        singleEvents=True,
+        orderBy='startTime',
+        **fields(EVENT_LIST_FIELDS)
+    )
+
+
+def insert_event_request(service, event_body: dict, conference_type: str, send_updates: str):
+    return service.events().insert(
+        calendarId='primary',
+        body=event_body,
+        conferenceDataVersion=1 if conference_type == 'meet' else 0,
+        sendUpdates=send_updates,
+        **fields(CREATED_EVENT_FIELDS)
+    )
+
+
+def add_zoom_details(event_body: dict, meeting_data: dict) -> dict:
+    event_body['description'] = (
+        f"{event_body.get('description', '')}\n\n"
+        f"Zoom Meeting Link: {meeting_data['join_url']}\n"
+        f"Meeting ID: {meeting_data['id']}\n"
+    )
+    event_body['location'] = meeting_data['join_url']
+    return event_body
+
+
+def zoom_patch_request(service, event_id: str, event_body: dict, meeting_data: dict, send_updates: str):
+    """Adds the Zoom meeting details to event_body and builds the patch that writes them to the event."""
+    add_zoom_details(event_body, meeting_data)
+
+    return service.events().patch(
+        calendarId='primary',
+        eventId=event_id,
+        body={'description': event_body['description'], 'location': event_body['location']},
+        sendUpdates=send_updates,
+        **fields(CREATED_EVENT_FIELDS)
+    )
+
+
+def batch_insert_events(service, event_bodies: Dict[int, dict], conference_types: Dict[int, str], send_updates: str) -> tuple:
+    return TRANSPORT.run(abatch_insert_events(service, event_bodies, conference_types, send_updates))
+
+
+async def abatch_insert_events(service, event_bodies: Dict[int, dict], conference_types: Dict[int, str],
+                               send_updates: str) -> tuple:
+    """Inserts events through Calendar batch requests, CALENDAR_BATCH_SIZE events per round trip.
+
+    event_bodies and conference_types are keyed by the index of the event in the caller's
+    list. Returns dicts of index to created event and index to error; a failed insert does
+    not discard the rest of its batch.
+    """
+    events = {}
+    errors = {}
+
+    def callback(request_id, response, exception):
+        if exception is not None:
+            errors[int(request_id)] = str(exception)
+        else:
+            events[int(request_id)] = response
+
+    indexes = list(event_bodies)
+    await asyncio.gather(*(
+        RATE_LIMITER.aexecute_batch(service, {
+            str(index): insert_event_request(service, event_bodies[index], conference_types[index], send_updates)
+            for index in indexes[start:start + CALENDAR_BATCH_SIZE]
+        }, callback)
+        for start in range(0, len(indexes), CALENDAR_BATCH_SIZE)
+    ))
+
+    return events, errors
+
+
+def delete_event_request(service, event_id: str):
+    return service.events().delete(calendarId='primary', eventId=event_id, sendUpdates='none')
+
+
+def event_response(event: dict, event_body: dict, conference_type: str, zoom: bool) -> dict:
+    response_data = {
+        'id': event['id'],
+        'htmlLink': event['htmlLink'],
+        'attendees': event.get('attendees'),
+        'status': event['status']
+    }
+
+    if conference_type == 'meet':
+        response_data['conferenceData'] = event.get('conferenceData')
+    elif conference_type == 'zoom' and zoom:
+        response_data['zoomLink'] = event_body['location']
+
+    return response_data
+
+
 class GoogleCalendarTool(BaseTool):
-    def __init__(self):
+    def __init__(self, use_event_cache: bool = False):
         super().__init__()
+        self.use_event_cache = use_event_cache
+        self._zoom_token_expiry = 0
+        self._zoom_token_lock = threading.Lock()
         self._init_zoom_client()
 
     def _init_zoom_client(self):
@@ -39,27 +957,63 @@ class GoogleCalendarTool(BaseTool):
                 os.getenv('ZOOM_CLIENT_SECRET'),  # Second positional arg: api_secret
                 os.getenv('ZOOM_ACCOUNT_ID')  # Third positional arg: api_account_id
             )
+            # ZoomClient fetches its OAuth token when it is created
+            self._zoom_token_expiry = time.time() + ZOOM_TOKEN_LIFETIME
         else:
             self.zoom_client = None
             self.zoom_account_id = None
 
-    def _get_zoom_token(self):
-        """Generate Server-to-Server OAuth token for Zoom"""
-        if not self.zoom_client:
-            return None
-            
-        payload = {
-            'iss': os.getenv('ZOOM_CLIENT_ID'),
-            'exp': time.time() + 3600,  # Token expires in 1 hour
-            'aud': 'https://zoom.us',
-            'account_id': os.getenv('ZOOM_ACCOUNT_ID')
-        }
-        
-        return jwt.encode(
-            payload,
-            os.getenv('ZOOM_CLIENT_SECRET'),
-            algorithm='HS256'
-        )
+    def _refresh_zoom_token(self):
+        """Refreshes the Zoom client's OAuth token shortly before it expires.
+
+        ZoomClient only fetches a token when it is created, so without this every Zoom call
+        fails once the tool has been running for an hour.
+        """
+        with self._zoom_token_lock:
+            if time.time() < self._zoom_token_expiry - ZOOM_TOKEN_MARGIN:
+                return
+
+            self.zoom_client.refresh_token()
+            self._zoom_token_expiry = time.time() + ZOOM_TOKEN_LIFETIME
+
+    def _create_zoom_meeting(self, values: dict) -> dict:
+        try:
+            start_dt = datetime.fromisoformat(values["start"])
+            end_dt = datetime.fromisoformat(values["end"])
+
+            self._refresh_zoom_token()
+            zoom_meeting = self.zoom_client.meeting.create(
+                user_id=os.getenv('ZOOM_USER_ID'),
+                topic=values["summary"],
+                type=2,  # Scheduled meeting
+                start_time=start_dt,
+                duration=(end_dt - start_dt).seconds // 60,
+                timezone='UTC',
+                settings={
+                    'join_before_host': True,
+                    'waiting_room': False
+                }
+            )
+        except Exception as e:
+            print(f"Error creating Zoom meeting: {e}")
+            traceback.print_exc()
+            raise
+
+        meeting_data = json.loads(zoom_meeting.content)
+        if 'join_url' not in meeting_data:
+            raise RuntimeError(f"Error creating Zoom meeting: {meeting_data}")
+        return meeting_data
+
+    def _delete_zoom_meeting(self, zoom_future) -> None:
+        """Rolls back a Zoom meeting created for an event that could not be completed."""
+        if zoom_future.exception() is not None:
+            return  # The meeting was never created
+
+        try:
+            self._refresh_zoom_token()
+            self.zoom_client.meeting.delete(id=zoom_future.result()['id'])
+        except Exception:
+            traceback.print_exc()
 
     @activity(
         config={
@@ -86,48 +1040,89 @@ class GoogleCalendarTool(BaseTool):
     )
     def search_calendar(self, params: dict) -> ListArtifact:
         """Searches Google Calendar events within specified parameters."""
-        credentials = service_account.Credentials.from_service_account_info(
-            SERVICE_ACCOUNT_INFO,
-            scopes=['https://www.googleapis.com/auth/calendar.readonly']
-        )
-        
-        delegated_credentials = credentials.with_subject(os.getenv('GOOGLE_DELEGATED_EMAIL'))
-        
-        service = build('calendar', 'v3', credentials=delegated_credentials)
-        
-        events_result = service.events().list(
-            calendarId='primary',
-            timeMin=params["values"]["timeMin"],
-            timeMax=params["values"]["timeMax"],
-            maxResults=params["values"]["maxResults"],
-            q=params["values"]["q"],
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-
-        events = events_result.get('items', [])
-        calendar_events = []
-        
-        for event in events:
-            start = event['start'].get('dateTime', event['start'].get('date'))
-            end = event['end'].get('dateTime', event['end'].get('date'))
-            
-            event_data = {
-                'id': event['id'],
-                'summary': event.get('summary', 'No title'),
-                'start': start,
-                'end': end,
-                'location': event.get('location', ''),
-                'description': event.get('description', ''),
-                'attendees': [
-                    attendee.get('email') 
-                    for attendee in event.get('attendees', [])
-                ]
-            }
-            calendar_events.append(JsonArtifact(event_data))
+        return TRANSPORT.run(self.asearch_calendar(params))
+
+    async def asearch_calendar(self, params: dict) -> ListArtifact:
+        service = await asyncio.to_thread(calendar_service, READONLY_SCOPES)
+
+        if self.use_event_cache:
+            cache = get_event_cache('primary', os.getenv('GOOGLE_DELEGATED_EMAIL'))
+            time_min = parse_iso_datetime(params["values"]["timeMin"])
+            # Windows reaching back past the cache are listed from the API without syncing it first
+            if cache.covers(time_min):
+                await asyncio.to_thread(cache.sync, service)
+                # A 410 refill moves the coverage forward
+                if cache.covers(time_min):
+                    events = await asyncio.to_thread(
+                        cache.search,
+                        time_min,
+                        parse_iso_datetime(params["values"]["timeMax"]),
+                        params["values"]["q"],
+                        params["values"]["maxResults"]
+                    )
+                    return ListArtifact([JsonArtifact(parse_event(event)) for event in events])
+
+        events_result = await RATE_LIMITER.aexecute(list_events_request(service, params["values"]))
+
+        calendar_events = [JsonArtifact(parse_event(event)) for event in events_result.get('items', [])]
             
         return ListArtifact(calendar_events)
 
+    @activity(
+        config={
+            "description": "Finds meeting slots when all attendees are free, within working hours",
+            "schema": Schema({
+                Literal(
+                    "attendees",
+                    description="List of attendee email addresses"
+                ): [str],
+                Literal(
+                    "timeMin",
+                    description="Start of the search window in ISO format (e.g. 2024-03-20T00:00:00Z)"
+                ): str,
+                Literal(
+                    "timeMax",
+                    description="End of the search window in ISO format (e.g. 2024-03-27T00:00:00Z)"
+                ): str,
+                Literal(
+                    "duration",
+                    description="Meeting length in minutes"
+                ): int,
+                Optional(Literal(
+                    "workingHoursStart",
+                    description="Start of the working day as HH:MM, defaults to 09:00"
+                )): str,
+                Optional(Literal(
+                    "workingHoursEnd",
+                    description="End of the working day as HH:MM, defaults to 17:00"
+                )): str,
+                Optional(Literal(
+                    "timeZone",
+                    description="IANA time zone of the working hours, e.g. America/Los_Angeles. Defaults to UTC"
+                )): str,
+                Optional(Literal(
+                    "includeWeekends",
+                    description="Whether Saturdays and Sundays can be used"
+                )): bool,
+                Optional(Literal(
+                    "maxResults",
+                    description="Maximum number of slots to return, defaults to 10"
+                )): int
+            })
+        }
+    )
+    def find_free_slots(self, params: dict) -> JsonArtifact:
+        """Finds candidate meeting slots from the attendees' merged free/busy information."""
+        return TRANSPORT.run(self.afind_free_slots(params))
+
+    async def afind_free_slots(self, params: dict) -> JsonArtifact:
+        service = await asyncio.to_thread(calendar_service, READONLY_SCOPES)
+        results = await asyncio.gather(*(
+            RATE_LIMITER.aexecute(request) for request in freebusy_requests(service, params["values"])
+        ))
+
+        return JsonArtifact(rank_free_slots(params["values"], results))
+
     @activity(
         config={
             "description": "Creates a new calendar event with optional attendees and video conferencing",
@@ -169,93 +1164,116 @@ class GoogleCalendarTool(BaseTool):
     )
     def create_event(self, params: dict) -> JsonArtifact:
         """Creates a new calendar event with optional attendees and video conferencing."""
-        credentials = service_account.Credentials.from_service_account_info(
-            SERVICE_ACCOUNT_INFO,
-            scopes=['https://www.googleapis.com/auth/calendar.events']
-        )
-        
-        delegated_credentials = credentials.with_subject(os.getenv('GOOGLE_DELEGATED_EMAIL'))
-        service = build('calendar', 'v3', credentials=delegated_credentials)
-
-        event_body = {
-            'summary': params["values"]["summary"],
-            'start': {'dateTime': params["values"]["start"]},
-            'end': {'dateTime': params["values"]["end"]},
-        }
+        return TRANSPORT.run(self.acreate_event(params))
 
-        if params["values"].get("description"):
-            event_body['description'] = params["values"]["description"]
-            
-        if params["values"].get("location"):
-            event_body['location'] = params["values"]["location"]
-            
-        if params["values"].get("attendees"):
-            event_body['attendees'] = [{'email': email} for email in params["values"]["attendees"]]
-            
-        conference_type = params["values"].get("conference_type")
-        if conference_type:
-            if conference_type.lower() == 'meet':
-                event_body['conferenceData'] = {
-                    'createRequest': {
-                        'requestId': f"{uuid.uuid4().hex}",
-                        'conferenceSolutionKey': {'type': 'hangoutsMeet'}
-                    }
-                }
-            elif conference_type.lower() == 'zoom' and self.zoom_client:
+    async def acreate_event(self, params: dict) -> JsonArtifact:
+        service = await asyncio.to_thread(calendar_service, EVENTS_SCOPES)
+
+        values = params["values"]
+        event_body = build_event_body(values)
+        conference_type = (values.get("conference_type") or '').lower()
+        send_updates = 'all' if values.get("send_notifications") else 'none'
+        zoom = conference_type == 'zoom' and self.zoom_client is not None
+
+        if zoom:
+            # Create the Zoom meeting and the Calendar event concurrently, then patch the join link in
+            zoom_future = ZOOM_EXECUTOR.submit(self._create_zoom_meeting, values)
+            try:
+                event = await RATE_LIMITER.aexecute(insert_event_request(service, event_body, conference_type, 'none'))
+            except Exception:
+                await asyncio.to_thread(self._delete_zoom_meeting, zoom_future)
+                raise
+
+            try:
+                # Attendees are only notified now, so the invitation carries the Zoom link
+                event = await RATE_LIMITER.aexecute(zoom_patch_request(
+                    service, event['id'], event_body, await asyncio.wrap_future(zoom_future), send_updates
+                ))
+            except Exception:
                 try:
-                    start_dt = datetime.fromisoformat(params["values"]["start"])
-                    end_dt = datetime.fromisoformat(params["values"]["end"])
-                    
-                    print("Start:", params["values"]["start"])
-                    print("Parsed datetime:", start_dt)
-                    
-                    zoom_meeting = self.zoom_client.meeting.create(
-                        user_id=os.getenv('ZOOM_USER_ID'),
-                        topic=params["values"]["summary"],
-                        type=2,  # Scheduled meeting
-                        start_time=start_dt,
-                        duration=(end_dt - start_dt).seconds // 60,
-                        timezone='UTC',
-                        settings={
-                            'join_before_host': True,
-                            'waiting_room': False
-                        }
-                    )
-                except Exception as e:
-                    print(f"Error parsing date: {e}")
+                    await RATE_LIMITER.aexecute(delete_event_request(service, event['id']))
+                except Exception:
                     traceback.print_exc()
-                    raise
-                
-                meeting_data = json.loads(zoom_meeting.content)
-                
-                # Add Zoom meeting details to event
-                event_body['description'] = (
-                    f"{event_body.get('description', '')}\n\n"
-                    f"Zoom Meeting Link: {meeting_data['join_url']}\n"
-                    f"Meeting ID: {meeting_data['id']}\n"
-                )
-                event_body['location'] = meeting_data['join_url']
-
-        event = service.events().insert(
-            calendarId='primary',
-            body=event_body,
-            conferenceDataVersion=1 if conference_type == 'meet' else 0,
-            sendUpdates='all' if params["values"].get("send_notifications") else 'none'
-        ).execute()
-
-        response_data = {
-            'id': event['id'],
-            'htmlLink': event['htmlLink'],
-            'attendees': event.get('attendees'),
-            'status': event['status']
+                await asyncio.to_thread(self._delete_zoom_meeting, zoom_future)
+                raise
+        else:
+            event = await RATE_LIMITER.aexecute(insert_event_request(service, event_body, conference_type, send_updates))
+
+        return JsonArtifact(event_response(event, event_body, conference_type, zoom))
+
+    @activity(
+        config={
+            "description": "Creates several calendar events in one call, such as the same meeting on many dates. "
+                           "Returns a result or an error for each event, in order",
+            "schema": Schema({
+                Literal(
+                    "events",
+                    description="List of events, each with summary, start and end (ISO format) and optionally "
+                                "description, attendees, location and conference_type ('meet' or 'zoom')"
+                ): [{
+                    "summary": str,
+                    "start": str,
+                    "end": str,
+                    Optional("description"): str,
+                    Optional("attendees"): [str],
+                    Optional("location"): str,
+                    Optional("conference_type"): str
+                }],
+                Optional(Literal(
+                    "send_notifications",
+                    description="Whether to send email notifications to attendees"
+                )): bool
+            })
         }
-        
-        if conference_type == 'meet':
-            response_data['conferenceData'] = event.get('conferenceData')
-        elif conference_type == 'zoom' and 'location' in event_body:
-            response_data['zoomLink'] = event_body['location']
+    )
+    def create_events(self, params: dict) -> JsonArtifact:
+        """Creates many events with a few batch round trips instead of one create_event call each."""
+        return TRANSPORT.run(self.acreate_events(params))
+
+    async def acreate_events(self, params: dict) -> JsonArtifact:
+        service = await asyncio.to_thread(calendar_service, EVENTS_SCOPES)
+
+        specs = params["values"]["events"]
+        send_updates = 'all' if params["values"].get("send_notifications") else 'none'
+        conference_types = {index: (spec.get("conference_type") or '').lower() for index, spec in enumerate(specs)}
+        event_bodies = {index: build_event_body(spec) for index, spec in enumerate(specs)}
+        errors = {}
+
+        # Zoom meetings are created up front and concurrently, so each event is inserted with its link
+        zoom_futures = {}
+        if self.zoom_client is not None:
+            zoom_futures = {
+                index: ZOOM_EXECUTOR.submit(self._create_zoom_meeting, spec)
+                for index, spec in enumerate(specs)
+                if conference_types[index] == 'zoom'
+            }
+        for index, zoom_future in zoom_futures.items():
+            try:
+                add_zoom_details(event_bodies[index], await asyncio.wrap_future(zoom_future))
+            except Exception as e:
+                errors[index] = str(e)
+                del event_bodies[index]
+
+        events, insert_errors = await abatch_insert_events(service, event_bodies, conference_types, send_updates)
+        errors.update(insert_errors)
+
+        for index in insert_errors:
+            if index in zoom_futures:
+                await asyncio.to_thread(self._delete_zoom_meeting, zoom_futures[index])
+
+        results = []
+        for index in range(len(specs)):
+            if index in events:
+                results.append({
+                    'index': index,
+                    'event': event_response(events[index], event_bodies[index], conference_types[index], index in zoom_futures)
+                })
+            else:
+                results.append({'index': index, 'error': errors[index]})
 
-        return JsonArtifact(response_data)
+        return JsonArtifact({'created': len(events), 'failed': len(errors), 'results': results})
 
 def init_tool() -> BaseTool:
-    return GoogleCalendarTool() 
\ No newline at end of file
+    return GoogleCalendarTool(
+        use_event_cache=os.getenv('GOOGLE_CALENDAR_EVENT_CACHE', '').lower() == 'true'
+    ) 
\ No newline at end of file
@@ -1,30 +1,766 @@
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
-from typing import Dict
+from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+import aiohttp
+import asyncio
+import google_auth_httplib2
+import httplib2
 import os
+import random
+import threading
+import yarl
+import time
 from schema import Schema, Literal, Optional, Or
 from griptape.artifacts import JsonArtifact
 from griptape.tools import BaseTool
 from griptape.utils.decorators import activity
+from collections import OrderedDict
+import hashlib
+import tempfile
 import traceback
 import json
 
-SERVICE_ACCOUNT_INFO = {
-    "type": "service_account",
-    "project_id": os.getenv('GOOGLE_PROJECT_ID'),
-    "private_key_id": os.getenv('GOOGLE_PRIVATE_KEY_ID'),
-    "private_key": os.getenv('GOOGLE_PRIVATE_KEY'),
-    "client_email": os.getenv('GOOGLE_CLIENT_EMAIL'),
-    "client_id": os.getenv('GOOGLE_CLIENT_ID'),
-    "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-    "token_uri": "https://oauth2.googleapis.com/token",
-    "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
-    #"client_x509_cert_url": f"https://www.googleapis.com/robot/v1/metadata/x509/{os.getenv('GOOGLE_CLIENT_EMAIL').replace('@', '%40')}"
+def get_service_account_info() -> dict:
+    # Get the private key and clean it up
+    private_key = os.getenv('GOOGLE_PRIVATE_KEY')
+    if private_key and "\\n" in private_key:
+        private_key = private_key.replace("\\n", "\n")
+
+    return {
+        "type": "service_account",
+        "project_id": os.getenv('GOOGLE_PROJECT_ID'),
+        "private_key_id": os.getenv('GOOGLE_PRIVATE_KEY_ID'),
+        "private_key": private_key,
+        "client_email": os.getenv('GOOGLE_CLIENT_EMAIL'),
+        "client_id": os.getenv('GOOGLE_CLIENT_ID'),
+        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+        "token_uri": "https://oauth2.googleapis.com/token",
+        "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
+    }
+
+
+class GoogleClientCache:
+    """Process-wide cache of service account credentials and built API clients.
+
+    Credentials are keyed by (scopes, delegated subject) and only refreshed when they
+    are close to expiry. Service objects are keyed by (api, version, scopes, subject)
+    and kept per thread, since googleapiclient services and their pooled httplib2
+    connections are not thread-safe.
+    """
+
+    def __init__(self, service_account_info: Callable[[], dict], refresh_margin: timedelta = timedelta(minutes=5)):
+        self.service_account_info = service_account_info
+        self.refresh_margin = refresh_margin
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._credentials = {}
+        self._local = threading.local()
+
+    def get_credentials(self, scopes: List[str], subject: str = None) -> service_account.Credentials:
+        key = (tuple(sorted(scopes)), subject)
+        with self._lock:
+            credentials = self._credentials.get(key)
+            if credentials is None:
+                credentials = service_account.Credentials.from_service_account_info(
+                    self.service_account_info(),
+                    scopes=list(key[0])
+                )
+                if subject:
+                    credentials = credentials.with_subject(subject)
+                self._credentials[key] = credentials
+
+            if self._needs_refresh(credentials):
+                credentials.refresh(google_auth_httplib2.Request(build_http()))
+
+        return credentials
+
+    def get_service(self, api: str, version: str, scopes: List[str], subject: str = None):
+        key = (api, version, tuple(sorted(scopes)), subject)
+        credentials = self.get_credentials(scopes, subject)
+
+        services = getattr(self._local, 'services', None)
+        if services is None:
+            services = self._local.services = {}
+
+        service = services.get(key)
+        with self._lock:
+            if service is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if service is None:
+            http = google_auth_httplib2.AuthorizedHttp(credentials, http=build_http())
+            service = build(api, version, http=http, cache_discovery=False)
+            services[key] = service
+
+        return service
+
+    def refresh(self, credentials: service_account.Credentials) -> None:
+        """Refreshes credentials that are close to expiry, under the same lock as get_credentials."""
+        with self._lock:
+            if self._needs_refresh(credentials):
+                credentials.refresh(google_auth_httplib2.Request(build_http()))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'credentials': len(self._credentials)
+            }
+
+    def _needs_refresh(self, credentials: service_account.Credentials) -> bool:
+        if not credentials.token or credentials.expiry is None:
+            return True
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return credentials.expiry - self.refresh_margin <= now
+
+
+CLIENT_CACHE = GoogleClientCache(get_service_account_info)
+
+
+DEFAULT_ASYNC_CONCURRENCY = 10
+# The socket timeout googleapiclient's build_http gives httplib2
+HTTP_TIMEOUT = 60
+
+
+class CapturedRequest(Exception):
+    """Carries what a googleapiclient request would have sent, as (uri, method, body, headers)."""
+
+
+class RecordingHttp:
+    """Stands in for httplib2.Http, raising CapturedRequest instead of sending anything."""
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        raise CapturedRequest(uri, method, body, headers or {})
+
+
+class ReplayHttp:
+    """Stands in for httplib2.Http, answering with a response that has already arrived."""
+
+    def __init__(self, response: httplib2.Response, content: bytes):
+        self.response = response
+        self.content = content
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        return self.response, self.content
+
+
+def request_credentials(request):
+    """Returns the credentials a request, or the calls in a batch request, are authorized with."""
+    # BatchHttpRequest keeps its calls in _requests
+    calls = getattr(request, '_requests', None)
+    http = next(iter(calls.values())).http if calls else request.http
+    credentials = getattr(http, 'credentials', None)
+    # A plain httplib2.Http has credentials too, for HTTP authentication
+    return None if isinstance(credentials, httplib2.Credentials) else credentials
+
+
+class AsyncGoogleTransport:
+    """Sends googleapiclient requests, batch requests included, over aiohttp.
+
+    googleapiclient still builds each request and parses each response, so URLs, bodies,
+    batch encoding and HttpErrors are the same as with httplib2: a request is executed
+    once against RecordingHttp to capture what it would send, sent with aiohttp, then
+    executed again against ReplayHttp to parse the reply. Every call runs on one event
+    loop on a background thread and shares its pooled aiohttp session, and a semaphore
+    per API caps how many calls to that API are in flight. Sync code runs coroutines on
+    the loop with run(), and sends awaited on other loops are handed over to it.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_ASYNC_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._loop = None
+        self._session = None
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def run(self, coroutine):
+        """Runs coroutine on the transport's loop, blocking the calling thread until it returns."""
+        loop = self._get_loop()
+        if self._on_loop(loop):
+            coroutine.close()
+            raise RuntimeError("run() would block the transport's own loop, await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    def iterate(self, generator):
+        """Yields the items of an async generator to sync code."""
+        try:
+            while True:
+                try:
+                    yield self.run(generator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.run(generator.aclose())
+
+    async def send(self, request, api: str):
+        """Sends request and returns what request.execute() would; a batch calls its callbacks."""
+        loop = self._get_loop()
+        if not self._on_loop(loop):
+            return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self.send(request, api), loop))
+
+        # Refreshed before capturing, since a batch writes its calls' tokens into its body
+        credentials = request_credentials(request)
+        if credentials is not None and not credentials.valid:
+            await asyncio.to_thread(CLIENT_CACHE.refresh, credentials)
+
+        try:
+            # Only an empty batch returns without sending anything
+            return request.execute(http=RecordingHttp())
+        except CapturedRequest as captured:
+            uri, method, body, headers = captured.args
+
+        # googleapiclient counts the length of the body as a str, aiohttp sets it from the bytes it sends
+        headers = {name: value for name, value in headers.items() if name.lower() != 'content-length'}
+        if credentials is not None:
+            credentials.apply(headers)
+
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(sock_connect=HTTP_TIMEOUT, sock_read=HTTP_TIMEOUT)
+            )
+        if api not in self._semaphores:
+            self._semaphores[api] = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphores[api]:
+            # encoded=True keeps the URL exactly as googleapiclient escaped it
+            async with self._session.request(
+                method,
+                yarl.URL(uri, encoded=True),
+                data=body.encode() if isinstance(body, str) else body,
+                headers=headers
+            ) as response:
+                content = await response.read()
+                info = {name.lower(): value for name, value in response.headers.items()}
+
+        # aiohttp has already decompressed the body
+        info.pop('content-encoding', None)
+        info['status'] = response.status
+        return request.execute(http=ReplayHttp(httplib2.Response(info), content))
+
+    def close(self) -> None:
+        """Closes the pooled session and stops the loop; the next call starts new ones."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), loop).result()
+        self._session = None
+        self._semaphores = {}
+        loop.call_soon_threadsafe(loop.stop)
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name='google-api-transport', daemon=True).start()
+            return self._loop
+
+    @staticmethod
+    def _on_loop(loop: asyncio.AbstractEventLoop) -> bool:
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
+
+
+TRANSPORT = AsyncGoogleTransport(int(os.getenv('GOOGLE_ASYNC_CONCURRENCY', DEFAULT_ASYNC_CONCURRENCY)))
+
+
+def field_mask(spec: dict) -> str:
+    """Builds a partial-response field mask from a nested projection spec,
+    e.g. {'id': None, 'payload': {'headers': None}} becomes 'id,payload(headers)'."""
+    return ','.join(
+        f"{name}({field_mask(children)})" if children else name
+        for name, children in spec.items()
+    )
+
+
+def fields(spec: dict) -> dict:
+    """Returns the `fields` request argument for spec, or nothing when GOOGLE_API_FIELD_MASKS=false."""
+    if os.getenv('GOOGLE_API_FIELD_MASKS', 'true').lower() == 'false':
+        return {}
+    return {'fields': field_mask(spec)}
+
+
+# Projections of the resources each call reads, used to request partial responses
+TEMPLATE_FIELDS = {
+    'title': None,
+    'revisionId': None,
+    'body': {
+        'content': {
+            'paragraph': {
+                'paragraphStyle': None,
+                'bullet': None,
+                'elements': {
+                    'textRun': {'content': None, 'textStyle': None},
+                    'inlineObjectElement': None
+                }
+            }
+        }
+    }
 }
+CREATED_DOC_FIELDS = {'documentId': None}
+BATCH_UPDATE_FIELDS = {'documentId': None}
+
+# Keep each batchUpdate well under the API's request size limits
+MAX_REQUESTS_PER_BATCH = 500
+MAX_BATCH_BYTES = 1_000_000
+MAX_INSERT_TEXT_LENGTH = 100_000
+# Paragraphs inserted into a new document already have this style, so applying it is a no-op
+DEFAULT_PARAGRAPH_STYLE = {'namedStyleType': 'NORMAL_TEXT', 'direction': 'LEFT_TO_RIGHT'}
+
+
+
+# A 429 means the call was throttled and not carried out, so it is always retried. A 5xx can
+# come after the server committed a write, so it is only retried for requests that don't write
+THROTTLED_STATUS = 429
+TRANSIENT_STATUSES = {500, 502, 503, 504}
+IDEMPOTENT_HTTP_METHODS = {'GET', 'HEAD'}
+DEFAULT_RATE_LIMIT = 10.0
+DEFAULT_MAX_RETRIES = 5
+# Docs' per-user quota of 300 reads a minute, in reads per second. Writes have a fifth of
+# that quota, so each costs 5 (https://developers.google.com/docs/api/limits)
+DEFAULT_RATE_LIMITS = {'docs': 5.0}
+QUOTA_UNITS = {
+    'docs.documents.create': 5,
+    'docs.documents.batchUpdate': 5,
+}
+# POST methods that only read, so they can be resent like a GET
+READ_ONLY_METHODS = set()
+
+
+def parse_rate_limits(spec: str) -> Dict[str, float]:
+    """Parses GOOGLE_API_RATE_LIMITS, e.g. 'gmail=250,calendar=10', into quota units per second per API."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in (spec or '').split(','))):
+        api, _, rate = item.partition('=')
+        limits[api.strip()] = float(rate)
+    return limits
+
+
+def request_cost(request) -> int:
+    return QUOTA_UNITS.get(request.methodId, 1)
+
+
+def is_idempotent(request) -> bool:
+    return request.method in IDEMPOTENT_HTTP_METHODS or request.methodId in READ_ONLY_METHODS
+
+
+def request_key(request) -> tuple:
+    """Returns the (api, delegated user) a request is paced under."""
+    # service_account.Credentials only exposes the delegated user as _subject
+    return request.methodId.split('.')[0], getattr(request_credentials(request), '_subject', None)
+
+
+class RateLimiter:
+    """Token-bucket pacing per (api, delegated user) with jittered exponential backoff.
+
+    Each bucket refills at the API's per-user quota, in quota units per second, and holds
+    at most one second of units. Callers reserve a request's units up front and sleep off
+    any deficit, so waiters are served in arrival order and throughput flattens out near
+    the quota instead of turning into errors. A 429 response, or a 5xx to a request that
+    doesn't write, is retried after its Retry-After, or after a full-jitter exponential
+    backoff, and a Retry-After also pauses every other caller sharing the bucket.
+
+    Calls are sent through transport. execute and execute_batch block the calling
+    thread, while aexecute and aexecute_batch wait without holding it.
+    """
+
+    def __init__(
+        self,
+        rates: Dict[str, float] = None,
+        default_rate: float = DEFAULT_RATE_LIMIT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = 1.0,
+        max_delay: float = 32.0,
+        transport: AsyncGoogleTransport = None
+    ):
+        self.rates = {**DEFAULT_RATE_LIMITS, **(rates or {})}
+        self.default_rate = default_rate
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.transport = transport or TRANSPORT
+        self._buckets = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _refill(self, key: tuple) -> tuple:
+        rate = self.rates.get(key[0], self.default_rate)
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (max(rate, 1.0), now))
+        self._buckets[key] = (min(max(rate, 1.0), tokens + (now - updated) * rate), now)
+        if key not in self._metrics:
+            self._metrics[key] = {'quota_units': 0, 'retries': 0, 'queue_depth': 0, 'throttled_seconds': 0.0}
+        return rate, self._metrics[key]
+
+    def _reserve(self, key: tuple, tokens: int) -> float:
+        """Takes tokens from the bucket and returns how long the caller must wait for them."""
+        with self._lock:
+            rate, metrics = self._refill(key)
+            balance, updated = self._buckets[key]
+            self._buckets[key] = (balance - tokens, updated)
+            wait = max(0.0, (tokens - balance) / rate)
+            metrics['quota_units'] += tokens
+            if wait > 0:
+                metrics['queue_depth'] += 1
+                metrics['throttled_seconds'] += wait
+            return wait
+
+    def _release(self, key: tuple) -> None:
+        with self._lock:
+            self._metrics[key]['queue_depth'] -= 1
+
+    def _backoff(self, key: tuple, attempt: int, error: HttpError) -> float:
+        """Returns the delay before retrying error, pausing the whole bucket on a Retry-After."""
+        retry_after = None
+        try:
+            retry_after = float(error.resp.get('retry-after'))
+        except (TypeError, ValueError):
+            pass
+
+        with self._lock:
+            rate, metrics = self._refill(key)
+            metrics['retries'] += 1
+            if retry_after is None:
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+            else:
+                delay = retry_after
+                balance, updated = self._buckets[key]
+                self._buckets[key] = (min(balance, -retry_after * rate), updated)
+            metrics['throttled_seconds'] += delay
+            return delay
+
+    def _retryable(self, error: Exception, attempt: int, idempotent: bool) -> bool:
+        return (
+            isinstance(error, HttpError)
+            and attempt < self.max_retries
+            and (error.resp.status == THROTTLED_STATUS or (idempotent and error.resp.status in TRANSIENT_STATUSES))
+        )
+
+    def execute(self, request, tokens: int = None, key: tuple = None, idempotent: bool = None):
+        return self.transport.run(self.aexecute(request, tokens, key, idempotent))
+
+    async def aexecute(self, request, tokens: int = None, key: tuple = None, idempotent: bool = None):
+        """Executes a googleapiclient request under the limiter.
+
+        A batch passes its total tokens, its key, and whether every call in it is idempotent.
+        """
+        key = key or request_key(request)
+        tokens = request_cost(request) if tokens is None else tokens
+        idempotent = is_idempotent(request) if idempotent is None else idempotent
+        for attempt in range(self.max_retries + 1):
+            wait = self._reserve(key, tokens)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                self._release(key)
+            try:
+                return await self.transport.send(request, key[0])
+            except HttpError as e:
+                if not self._retryable(e, attempt, idempotent):
+                    raise
+                await asyncio.sleep(self._backoff(key, attempt, e))
+
+    def execute_batch(self, service, requests: Dict[str, object], callback: Callable) -> None:
+        self.transport.run(self.aexecute_batch(service, requests, callback))
+
+    async def aexecute_batch(self, service, requests: Dict[str, object], callback: Callable) -> None:
+        """Executes requests as one batch paced by their quota units, retrying throttled items.
+
+        callback receives (request_id, response, exception) once per request, like a
+        batch callback. Items that fail with a retryable status are resent in a smaller
+        batch after a backoff instead of being reported.
+        """
+        if not requests:
+            return
+
+        key = request_key(next(iter(requests.values())))
+        pending = dict(requests)
+        for attempt in range(self.max_retries + 1):
+            retry = {}
+
+            def on_response(request_id, response, exception):
+                if exception is not None and self._retryable(exception, attempt, is_idempotent(requests[request_id])):
+                    retry[request_id] = exception
+                else:
+                    callback(request_id, response, exception)
+
+            batch = service.new_batch_http_request(callback=on_response)
+            for request_id, request in pending.items():
+                batch.add(request, request_id=request_id)
+            await self.aexecute(
+                batch,
+                tokens=sum(request_cost(request) for request in pending.values()),
+                key=key,
+                idempotent=all(is_idempotent(request) for request in pending.values())
+            )
+
+            if not retry:
+                return
+            pending = {request_id: requests[request_id] for request_id in retry}
+            await asyncio.sleep(self._backoff(key, attempt, next(iter(retry.values()))))
+
+    def metrics(self) -> Dict[str, dict]:
+        """Returns request, retry, queue depth and throttled time counters per 'api:user' bucket."""
+        with self._lock:
+            return {f"{api}:{subject or 'default'}": dict(metrics) for (api, subject), metrics in self._metrics.items()}
+
+
+RATE_LIMITER = RateLimiter(
+    parse_rate_limits(os.getenv('GOOGLE_API_RATE_LIMITS')),
+    default_rate=float(os.getenv('GOOGLE_API_DEFAULT_RATE_LIMIT', DEFAULT_RATE_LIMIT)),
+    max_retries=int(os.getenv('GOOGLE_API_MAX_RETRIES', DEFAULT_MAX_RETRIES))
+)
+
+
+READ_SCOPES = [
+    'https://www.googleapis.com/auth/drive',        # Full Drive access
+    'https://www.googleapis.com/auth/drive.file',   # For creating/editing docs
+    'https://www.googleapis.com/auth/docs'          # For docs API
+]
+WRITE_SCOPES = ['https://www.googleapis.com/auth/documents']
+
+
+def revision_request(docs_service, template_id: str):
+    # A cheap revisionId lookup is enough to tell whether a cached extraction is still current
+    return docs_service.documents().get(documentId=template_id, fields='revisionId')
+
+
+def template_request(docs_service, template_id: str):
+    return docs_service.documents().get(documentId=template_id, **fields(TEMPLATE_FIELDS))
+
+
+def create_doc_request(docs_service, title: str):
+    return docs_service.documents().create(body={'title': title}, **fields(CREATED_DOC_FIELDS))
+
+
+def batch_update_requests(docs_service, doc_id: str, structure: List[dict]):
+    """Yields the batchUpdates for structure. They must be executed in order, since each shifts the indexes."""
+    for requests in chunk_requests(compile_doc_requests(structure)):
+        yield docs_service.documents().batchUpdate(
+            documentId=doc_id,
+            body={'requests': requests},
+            **fields(BATCH_UPDATE_FIELDS)
+        )
+
+
+def created_doc(doc_id: str, title: str) -> dict:
+    return {
+        'documentId': doc_id,
+        'title': title,
+        'url': f"https://docs.google.com/document/d/{doc_id}/edit"
+    }
+
+
+def utf16_len(text: str) -> int:
+    # Docs indexes are counted in UTF-16 code units, so characters outside the BMP count twice
+    return len(text.encode('utf-16-le')) // 2
+
+
+def merge_style_ranges(ranges: List[tuple]) -> List[tuple]:
+    """Merges adjacent (start, end, style) ranges that share the same style, dropping empty ranges."""
+    merged = []
+    for start, end, style in ranges:
+        if start >= end or not style:
+            continue
+        if merged and merged[-1][1] == start and merged[-1][2] == style:
+            merged[-1] = (merged[-1][0], end, style)
+        else:
+            merged.append((start, end, style))
+    return merged
+
+
+def compile_doc_requests(structure: List[dict], start_index: int = 1) -> List[dict]:
+    """Compiles a read_template style structure into a compact list of batchUpdate requests.
+
+    All text is inserted up front as a few large insertText requests, followed by one
+    updateParagraphStyle/updateTextStyle per run of adjacent ranges sharing a style.
+    No-op updates (empty or default styles, zero-length ranges) are dropped.
+    """
+    text_parts = []
+    paragraph_styles = []
+    text_styles = []
+    index = start_index
+
+    for item in structure:
+        paragraph_start = index
+        for element in item.get('elements', []):
+            if element['type'] == 'textRun':
+                length = utf16_len(element['text'])
+                text_styles.append((index, index + length, element.get('style')))
+                text_parts.append(element['text'])
+                index += length
+            # Inline objects are not recreated
+
+        text_parts.append('\n')
+        index += 1
+        if item.get('style') and item['style'] != DEFAULT_PARAGRAPH_STYLE:
+            paragraph_styles.append((paragraph_start, index, item['style']))
+
+    requests = []
+    text = ''.join(text_parts)
+    insert_index = start_index
+    for offset in range(0, len(text), MAX_INSERT_TEXT_LENGTH):
+        piece = text[offset:offset + MAX_INSERT_TEXT_LENGTH]
+        requests.append({'insertText': {'location': {'index': insert_index}, 'text': piece}})
+        insert_index += utf16_len(piece)
+
+    for start, end, style in merge_style_ranges(paragraph_styles):
+        requests.append({
+            'updateParagraphStyle': {
+                'range': {'startIndex': start, 'endIndex': end},
+                'paragraphStyle': style,
+                'fields': '*'
+            }
+        })
+
+    for start, end, style in merge_style_ranges(text_styles):
+        requests.append({
+            'updateTextStyle': {
+                'range': {'startIndex': start, 'endIndex': end},
+                'textStyle': style,
+                'fields': '*'
+            }
+        })
+
+    return requests
+
+
+def chunk_requests(requests: List[dict], max_requests: int = MAX_REQUESTS_PER_BATCH, max_bytes: int = MAX_BATCH_BYTES):
+    """Splits requests, in order, into batches bounded by request count and serialized size."""
+    batch = []
+    batch_bytes = 0
+    for request in requests:
+        size = len(json.dumps(request))
+        if batch and (len(batch) >= max_requests or batch_bytes + size > max_bytes):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(request)
+        batch_bytes += size
+
+    if batch:
+        yield batch
+
+
+def extract_template(template_id: str, template_doc: dict) -> dict:
+    # Extract structure (paragraphs, styles, etc)
+    structure = []
+    for element in template_doc.get('body').get('content', []):
+        if 'paragraph' in element:
+            para = element.get('paragraph')
+            para_structure = {
+                'style': para.get('paragraphStyle', {}),
+                'bullet': para.get('bullet', {}),  # Capture bullet/list formatting
+                'elements': []
+            }
+
+            for item in para.get('elements', []):
+                if 'textRun' in item:
+                    text_run = item.get('textRun', {})
+                    para_structure['elements'].append({
+                        'text': text_run.get('content', ''),
+                        'style': text_run.get('textStyle', {}),
+                        'type': 'textRun'
+                    })
+                elif 'inlineObjectElement' in item:
+                    # Handle inline objects (images, etc)
+                    para_structure['elements'].append({
+                        'type': 'inlineObject',
+                        'data': item.get('inlineObjectElement', {})
+                    })
+
+            structure.append(para_structure)
+
+    return {
+        'template_id': template_id,
+        'title': template_doc.get('title'),
+        'structure': structure
+    }
+
+
+DEFAULT_TEMPLATE_CACHE_SIZE = 32
+
+
+class TemplateCache:
+    """Caches extracted template structures, validated against the document's revisionId.
+
+    Entries live in an in-memory LRU and, when cache_dir is set, in one JSON file per
+    template on disk so they survive restarts. An entry is only served while its
+    revisionId matches the document's current one. Revision ids are not shareable
+    across users, so entries are keyed by (document id, delegated user).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_TEMPLATE_CACHE_SIZE, cache_dir: str = None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, document_id: str, subject: str, revision_id: str):
+        if not revision_id:
+            return None
+
+        key = (document_id, subject)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None and self.cache_dir:
+            try:
+                with open(self._path(key), 'r') as f:
+                    entry = tuple(json.load(f))
+            except (OSError, ValueError):
+                entry = None
+            if entry is not None:
+                self._remember(key, entry)
+
+        if entry is None or entry[0] != revision_id:
+            return None
+        return entry[1]
+
+    def put(self, document_id: str, subject: str, revision_id: str, data: str) -> None:
+        if not revision_id:
+            return
+
+        key = (document_id, subject)
+        self._remember(key, (revision_id, data))
+
+        if self.cache_dir:
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump([revision_id, data], f)
+            os.replace(temp_path, self._path(key))
+
+    def _remember(self, key: tuple, entry: tuple) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _path(self, key: tuple) -> str:
+        digest = hashlib.sha256('\0'.join(part or '' for part in key).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
 
 class GoogleDocsTool(BaseTool):
-    def __init__(self):
+    def __init__(self, template_cache: TemplateCache = None):
         super().__init__()
+        self.template_cache = template_cache or TemplateCache()
 
     @activity(
         config={
@@ -39,79 +775,30 @@ class GoogleDocsTool(BaseTool):
     )
     def read_template(self, params: dict) -> JsonArtifact:
         """Reads a template doc and returns its structure."""
+        return TRANSPORT.run(self.aread_template(params))
+
+    async def aread_template(self, params: dict) -> JsonArtifact:
         try:
-            # Get the private key and clean it up
-            private_key = os.getenv('GOOGLE_PRIVATE_KEY')
-            if private_key and "\\n" in private_key:
-                private_key = private_key.replace("\\n", "\n")
-            
-            service_account_info = {
-                "type": "service_account",
-                "project_id": os.getenv('GOOGLE_PROJECT_ID'),
-                "private_key_id": os.getenv('GOOGLE_PRIVATE_KEY_ID'),
-                "private_key": private_key,
-                "client_email": os.getenv('GOOGLE_CLIENT_EMAIL'),
-                "client_id": os.getenv('GOOGLE_CLIENT_ID'),
-                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": "https://oauth2.googleapis.com/token",
-                "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
-            }
-            
-            credentials = service_account.Credentials.from_service_account_info(
-                service_account_info,
-                scopes=[
-                    'https://www.googleapis.com/auth/drive',        # Full Drive access
-                    'https://www.googleapis.com/auth/drive.file',   # For creating/editing docs
-                    'https://www.googleapis.com/auth/docs'          # For docs API
-                ]
-            )
-            
-            delegated_credentials = credentials.with_subject(os.getenv('GOOGLE_DELEGATED_EMAIL'))
-            docs_service = build('docs', 'v1', credentials=delegated_credentials)
+            subject = os.getenv('GOOGLE_DELEGATED_EMAIL')
+            docs_service = await asyncio.to_thread(CLIENT_CACHE.get_service, 'docs', 'v1', READ_SCOPES, subject)
             
             template_id = params["values"]["template_id"]
             
+            revision_id = (await RATE_LIMITER.aexecute(revision_request(docs_service, template_id))).get('revisionId')
+
+            cached = await asyncio.to_thread(self.template_cache.get, template_id, subject, revision_id)
+            if cached is not None:
+                return JsonArtifact(cached)
+
             # Read the template content
-            template_doc = docs_service.documents().get(
-                documentId=template_id
-            ).execute()
-            
-            # Extract structure (paragraphs, styles, etc)
-            structure = []
-            for element in template_doc.get('body').get('content', []):
-                if 'paragraph' in element:
-                    para = element.get('paragraph')
-                    para_structure = {
-                        'style': para.get('paragraphStyle', {}),
-                        'bullet': para.get('bullet', {}),  # Capture bullet/list formatting
-                        'elements': []
-                    }
-                    
-                    for item in para.get('elements', []):
-                        if 'textRun' in item:
-                            text_run = item.get('textRun', {})
-                            para_structure['elements'].append({
-                                'text': text_run.get('content', ''),
-                                'style': text_run.get('textStyle', {}),
-                                'type': 'textRun'
-                            })
-                        elif 'inlineObjectElement' in item:
-                            # Handle inline objects (images, etc)
-                            para_structure['elements'].append({
-                                'type': 'inlineObject',
-                                'data': item.get('inlineObjectElement', {})
-                            })
-                    
-                    structure.append(para_structure)
-            
-            # Extract structure and convert to JSON string
-            template_data = {
-                'template_id': template_id,
-                'title': template_doc.get('title'),
-                'structure': structure
-            }
+            template_doc = await RATE_LIMITER.aexecute(template_request(docs_service, template_id))
             
-            return JsonArtifact(json.dumps(template_data))  # Return stringified JSON
+            template_data = json.dumps(extract_template(template_id, template_doc))
+            await asyncio.to_thread(
+                self.template_cache.put, template_id, subject, template_doc.get('revisionId'), template_data
+            )
+
+            return JsonArtifact(template_data)  # Return stringified JSON
             
         except Exception as e:
             print(f"Error reading template: {str(e)}")
@@ -135,96 +822,33 @@ class GoogleDocsTool(BaseTool):
     )
     def create_doc_from_json(self, params: dict) -> JsonArtifact:
         """Creates a new doc from complete JSON structure."""
+        return TRANSPORT.run(self.acreate_doc_from_json(params))
+
+    async def acreate_doc_from_json(self, params: dict) -> JsonArtifact:
         try:
             # Get credentials and service
-            credentials = service_account.Credentials.from_service_account_info(
-                SERVICE_ACCOUNT_INFO,
-                scopes=['https://www.googleapis.com/auth/documents']
-            )
-            docs_service = build('docs', 'v1', credentials=credentials)
+            docs_service = await asyncio.to_thread(CLIENT_CACHE.get_service, 'docs', 'v1', WRITE_SCOPES)
             
             # Create new empty doc
-            doc = docs_service.documents().create(body={'title': params["values"]["title"]}).execute()
+            doc = await RATE_LIMITER.aexecute(create_doc_request(docs_service, params["values"]["title"]))
             doc_id = doc.get('documentId')
             
-            # Build requests from JSON structure
-            requests = []
-            current_index = 1
+            # Compile the JSON structure into a compact request list, then apply it in bounded batches
+            structure = params["values"]["content"].get('structure', [])
+            for request in batch_update_requests(docs_service, doc_id, structure):
+                await RATE_LIMITER.aexecute(request)
             
-            content = params["values"]["content"]
-            
-            # Convert the content structure to Google Docs API requests
-            for item in content.get('structure', []):
-                # Add paragraph style
-                if item.get('style'):
-                    requests.append({
-                        'updateParagraphStyle': {
-                            'range': {
-                                'startIndex': current_index,
-                                'endIndex': current_index + 1
-                            },
-                            'paragraphStyle': item['style'],
-                            'fields': '*'  # Update all fields
-                        }
-                    })
-                
-                # Add elements (text runs, inline objects, etc)
-                for element in item.get('elements', []):
-                    if element['type'] == 'textRun':
-                        text = element['text']
-                        # Insert text
-                        requests.append({
-                            'insertText': {
-                                'location': {'index': current_index},
-                                'text': text
-                            }
-                        })
-                        
-                        # Apply text style
-                        if element.get('style'):
-                            requests.append({
-                                'updateTextStyle': {
-                                    'range': {
-                                        'startIndex': current_index,
-                                        'endIndex': current_index + len(text)
-                                    },
-                                    'textStyle': element['style'],
-                                    'fields': '*'  # Update all style fields
-                                }
-                            })
-                        current_index += len(text)
-                    
-                    elif element['type'] == 'inlineObject':
-                        # Handle inline objects if needed
-                        pass
-                
-                # Add newline after paragraph
-                requests.append({
-                    'insertText': {
-                        'location': {'index': current_index},
-                        'text': '\n'
-                    }
-                })
-                current_index += 1
-            
-            # Apply all updates
-            if requests:
-                docs_service.documents().batchUpdate(
-                    documentId=doc_id,
-                    body={'requests': requests}
-                ).execute()
-            
-            return JsonArtifact({
-                'documentId': doc_id,
-                'title': params["values"]["title"],
-                'url': f"https://docs.google.com/document/d/{doc_id}/edit"
-            })
+            return JsonArtifact(created_doc(doc_id, params["values"]["title"]))
             
         except Exception as e:
             print(f"Error creating doc: {str(e)}")
             traceback.print_exc()
             raise
 
-
 def init_tool() -> BaseTool:
-    return GoogleDocsTool() 
\ No newline at end of file
+    return GoogleDocsTool(
+        template_cache=TemplateCache(
+            max_entries=int(os.getenv('GOOGLE_DOCS_TEMPLATE_CACHE_SIZE', DEFAULT_TEMPLATE_CACHE_SIZE)),
+            cache_dir=os.getenv('GOOGLE_DOCS_TEMPLATE_CACHE_DIR')
+        )
+    ) 
\ No newline at end of file
@@ -1,13 +1,27 @@
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
-from typing import List, Dict
+from googleapiclient.http import build_http
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Dict
+import aiohttp
+import asyncio
+import google_auth_httplib2
+import httplib2
 import os
+import random
+import threading
+import yarl
 from schema import Schema, Literal, Optional
 from griptape.artifacts import ListArtifact, JsonArtifact
 from griptape.tools import BaseTool
 from griptape.utils.decorators import activity
 from email.mime.text import MIMEText
+from googleapiclient.errors import HttpError
+from contextlib import aclosing
 import base64
+import json
+import sqlite3
+import time
 
 REQUIRED_ENV_VARS = [
     "GOOGLE_PROJECT_ID",
@@ -34,7 +48,983 @@ def get_service_account_info() -> dict:
         "client_x509_cert_url": f"https://www.googleapis.com/robot/v1/metadata/x509/{os.getenv('GOOGLE_CLIENT_EMAIL').replace('@', '%40')}",
     }
 
+class GoogleClientCache:
+    """Process-wide cache of service account credentials and built API clients.
+
+    Credentials are keyed by (scopes, delegated subject) and only refreshed when they
+    are close to expiry. Service objects are keyed by (api, version, scopes, subject)
+    and kept per thread, since googleapiclient services and their pooled httplib2
+    connections are not thread-safe.
+    """
+
+    def __init__(self, service_account_info: Callable[[], dict], refresh_margin: timedelta = timedelta(minutes=5)):
+        self.service_account_info = service_account_info
+        self.refresh_margin = refresh_margin
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._credentials = {}
+        self._local = threading.local()
+
+    def get_credentials(self, scopes: List[str], subject: str = None) -> service_account.Credentials:
+        key = (tuple(sorted(scopes)), subject)
+        with self._lock:
+            credentials = self._credentials.get(key)
+            if credentials is None:
+                credentials = service_account.Credentials.from_service_account_info(
+                    self.service_account_info(),
+                    scopes=list(key[0])
+                )
+                if subject:
+                    credentials = credentials.with_subject(subject)
+                self._credentials[key] = credentials
+
+            if self._needs_refresh(credentials):
+                credentials.refresh(google_auth_httplib2.Request(build_http()))
+
+        return credentials
+
+    def get_service(self, api: str, version: str, scopes: List[str], subject: str = None):
+        key = (api, version, tuple(sorted(scopes)), subject)
+        credentials = self.get_credentials(scopes, subject)
+
+        services = getattr(self._local, 'services', None)
+        if services is None:
+            services = self._local.services = {}
+
+        service = services.get(key)
+        with self._lock:
+            if service is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if service is None:
+            http = google_auth_httplib2.AuthorizedHttp(credentials, http=build_http())
+            service = build(api, version, http=http, cache_discovery=False)
+            services[key] = service
+
+        return service
+
+    def refresh(self, credentials: service_account.Credentials) -> None:
+        """Refreshes credentials that are close to expiry, under the same lock as get_credentials."""
+        with self._lock:
+            if self._needs_refresh(credentials):
+                credentials.refresh(google_auth_httplib2.Request(build_http()))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'credentials': len(self._credentials)
+            }
+
+    def _needs_refresh(self, credentials: service_account.Credentials) -> bool:
+        if not credentials.token or credentials.expiry is None:
+            return True
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return credentials.expiry - self.refresh_margin <= now
+
+
+CLIENT_CACHE = GoogleClientCache(get_service_account_info)
+
+
+DEFAULT_ASYNC_CONCURRENCY = 10
+# The socket timeout googleapiclient's build_http gives httplib2
+HTTP_TIMEOUT = 60
+
+
+class CapturedRequest(Exception):
+    """Carries what a googleapiclient request would have sent, as (uri, method, body, headers)."""
+
+
+class RecordingHttp:
+    """Stands in for httplib2.Http, raising CapturedRequest instead of sending anything."""
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        raise CapturedRequest(uri, method, body, headers or {})
+
+
+class ReplayHttp:
+    """Stands in for httplib2.Http, answering with a response that has already arrived."""
+
+    def __init__(self, response: httplib2.Response, content: bytes):
+        self.response = response
+        self.content = content
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        return self.response, self.content
+
+
+def request_credentials(request):
+    """Returns the credentials a request, or the calls in a batch request, are authorized with."""
+    # BatchHttpRequest keeps its calls in _requests
+    calls = getattr(request, '_requests', None)
+    http = next(iter(calls.values())).http if calls else request.http
+    credentials = getattr(http, 'credentials', None)
+    # A plain httplib2.Http has credentials too, for HTTP authentication
+    return None if isinstance(credentials, httplib2.Credentials) else credentials
+
+
+class AsyncGoogleTransport:
+    """Sends googleapiclient requests, batch requests included, over aiohttp.
+
+    googleapiclient still builds each request and parses each response, so URLs, bodies,
+    batch encoding and HttpErrors are the same as with httplib2: a request is executed
+    once against RecordingHttp to capture what it would send, sent with aiohttp, then
+    executed again against ReplayHttp to parse the reply. Every call runs on one event
+    loop on a background thread and shares its pooled aiohttp session, and a semaphore
+    per API caps how many calls to that API are in flight. Sync code runs coroutines on
+    the loop with run(), and sends awaited on other loops are handed over to it.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_ASYNC_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._loop = None
+        self._session = None
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def run(self, coroutine):
+        """Runs coroutine on the transport's loop, blocking the calling thread until it returns."""
+        loop = self._get_loop()
+        if self._on_loop(loop):
+            coroutine.close()
+            raise RuntimeError("run() would block the transport's own loop, await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    def iterate(self, generator):
+        """Yields the items of an async generator to sync code."""
+        try:
+            while True:
+                try:
+                    yield self.run(generator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.run(generator.aclose())
+
+    async def send(self, request, api: str):
+        """Sends request and returns what request.execute() would; a batch calls its callbacks."""
+        loop = self._get_loop()
+        if not self._on_loop(loop):
+            return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self.send(request, api), loop))
+
+        # Refreshed before capturing, since a batch writes its calls' tokens into its body
+        credentials = request_credentials(request)
+        if credentials is not None and not credentials.valid:
+            await asyncio.to_thread(CLIENT_CACHE.refresh, credentials)
+
+        try:
+            # Only an empty batch returns without sending anything
+            return request.execute(http=RecordingHttp())
+        except CapturedRequest as captured:
+            uri, method, body, headers = captured.args
+
+        # googleapiclient counts the length of the body as a str, aiohttp sets it from the bytes it sends
+        headers = {name: value for name, value in headers.items() if name.lower() != 'content-length'}
+        if credentials is not None:
+            credentials.apply(headers)
+
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(sock_connect=HTTP_TIMEOUT, sock_read=HTTP_TIMEOUT)
+            )
+        if api not in self._semaphores:
+            self._semaphores[api] = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphores[api]:
+            # encoded=True keeps the URL exactly as googleapiclient escaped it
+            async with self._session.request(
+                method,
+                yarl.URL(uri, encoded=True),
+                data=body.encode() if isinstance(body, str) else body,
+                headers=headers
+            ) as response:
+                content = await response.read()
+                info = {name.lower(): value for name, value in response.headers.items()}
+
+        # aiohttp has already decompressed the body
+        info.pop('content-encoding', None)
+        info['status'] = response.status
+        return request.execute(http=ReplayHttp(httplib2.Response(info), content))
+
+    def close(self) -> None:
+        """Closes the pooled session and stops the loop; the next call starts new ones."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), loop).result()
+        self._session = None
+        self._semaphores = {}
+        loop.call_soon_threadsafe(loop.stop)
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name='google-api-transport', daemon=True).start()
+            return self._loop
+
+    @staticmethod
+    def _on_loop(loop: asyncio.AbstractEventLoop) -> bool:
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
+
+
+TRANSPORT = AsyncGoogleTransport(int(os.getenv('GOOGLE_ASYNC_CONCURRENCY', DEFAULT_ASYNC_CONCURRENCY)))
+
+
+def field_mask(spec: dict) -> str:
+    """Builds a partial-response field mask from a nested projection spec,
+    e.g. {'id': None, 'payload': {'headers': None}} becomes 'id,payload(headers)'."""
+    return ','.join(
+        f"{name}({field_mask(children)})" if children else name
+        for name, children in spec.items()
+    )
+
+
+def fields(spec: dict) -> dict:
+    """Returns the `fields` request argument for spec, or nothing when GOOGLE_API_FIELD_MASKS=false."""
+    if os.getenv('GOOGLE_API_FIELD_MASKS', 'true').lower() == 'false':
+        return {}
+    return {'fields': field_mask(spec)}
+
+
+# Projections of the resources each call reads, used to request partial responses
+MESSAGE_LIST_FIELDS = {'messages': {'id': None}, 'nextPageToken': None}
+MESSAGE_METADATA_FIELDS = {
+    'id': None,
+    'threadId': None,
+    'labelIds': None,
+    'internalDate': None,
+    'payload': {'headers': None, 'parts': {'partId': None}}
+}
+PROFILE_FIELDS = {'historyId': None}
+HISTORY_FIELDS = {
+    'history': {
+        'messagesAdded': {'message': {'id': None}},
+        'messagesDeleted': {'message': {'id': None}},
+        'labelsAdded': {'message': {'id': None}, 'labelIds': None},
+        'labelsRemoved': {'message': {'id': None}, 'labelIds': None}
+    },
+    'historyId': None,
+    'nextPageToken': None
+}
+DRAFT_FIELDS = {'id': None, 'message': {'id': None, 'threadId': None, 'labelIds': None}}
+SENT_MESSAGE_FIELDS = {'id': None, 'labelIds': None, 'threadId': None}
+
+
+# A 429 means the call was throttled and not carried out, so it is always retried. A 5xx can
+# come after the server committed a write, so it is only retried for requests that don't write
+THROTTLED_STATUS = 429
+TRANSIENT_STATUSES = {500, 502, 503, 504}
+IDEMPOTENT_HTTP_METHODS = {'GET', 'HEAD'}
+DEFAULT_RATE_LIMIT = 10.0
+DEFAULT_MAX_RETRIES = 5
+# Gmail's per-user quota, in quota units per second, and what each call costs in units
+# (https://developers.google.com/gmail/api/reference/quota)
+DEFAULT_RATE_LIMITS = {'gmail': 250.0}
+QUOTA_UNITS = {
+    'gmail.users.getProfile': 1,
+    'gmail.users.history.list': 2,
+    'gmail.users.messages.get': 5,
+    'gmail.users.messages.list': 5,
+    'gmail.users.drafts.create': 10,
+    'gmail.users.drafts.delete': 10,
+    'gmail.users.drafts.send': 100,
+}
+# POST methods that only read, so they can be resent like a GET
+READ_ONLY_METHODS = set()
+
+
+def parse_rate_limits(spec: str) -> Dict[str, float]:
+    """Parses GOOGLE_API_RATE_LIMITS, e.g. 'gmail=250,calendar=10', into quota units per second per API."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in (spec or '').split(','))):
+        api, _, rate = item.partition('=')
+        limits[api.strip()] = float(rate)
+    return limits
+
+
+def request_cost(request) -> int:
+    return QUOTA_UNITS.get(request.methodId, 1)
+
+
+def is_idempotent(request) -> bool:
+    return request.method in IDEMPOTENT_HTTP_METHODS or request.methodId in READ_ONLY_METHODS
+
+
+def request_key(request) -> tuple:
+    """Returns the (api, delegated user) a request is paced under."""
+    # service_account.Credentials only exposes the delegated user as _subject
+    return request.methodId.split('.')[0], getattr(request_credentials(request), '_subject', None)
+
+
+class RateLimiter:
+    """Token-bucket pacing per (api, delegated user) with jittered exponential backoff.
+
+    Each bucket refills at the API's per-user quota, in quota units per second, and holds
+    at most one second of units. Callers reserve a request's units up front and sleep off
+    any deficit, so waiters are served in arrival order and throughput flattens out near
+    the quota instead of turning into errors. A 429 response, or a 5xx to a request that
+    doesn't write, is retried after its Retry-After, or after a full-jitter exponential
+    backoff, and a Retry-After also pauses every other caller sharing the bucket.
+
+    Calls are sent through transport. execute and execute_batch block the calling
+    thread, while aexecute and aexecute_batch wait without holding it.
+    """
+
+    def __init__(
+        self,
+        rates: Dict[str, float] = None,
+        default_rate: float = DEFAULT_RATE_LIMIT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = 1.0,
+        max_delay: float = 32.0,
+        transport: AsyncGoogleTransport = None
+    ):
+        self.rates = {**DEFAULT_RATE_LIMITS, **(rates or {})}
+        self.default_rate = default_rate
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.transport = transport or TRANSPORT
+        self._buckets = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _refill(self, key: tuple) -> tuple:
+        rate = self.rates.get(key[0], self.default_rate)
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (max(rate, 1.0), now))
+        self._buckets[key] = (min(max(rate, 1.0), tokens + (now - updated) * rate), now)
+        if key not in self._metrics:
+            self._metrics[key] = {'quota_units': 0, 'retries': 0, 'queue_depth': 0, 'throttled_seconds': 0.0}
+        return rate, self._metrics[key]
+
+    def _reserve(self, key: tuple, tokens: int) -> float:
+        """Takes tokens from the bucket and returns how long the caller must wait for them."""
+        with self._lock:
+            rate, metrics = self._refill(key)
+            balance, updated = self._buckets[key]
+            self._buckets[key] = (balance - tokens, updated)
+            wait = max(0.0, (tokens - balance) / rate)
+            metrics['quota_units'] += tokens
+            if wait > 0:
+                metrics['queue_depth'] += 1
+                metrics['throttled_seconds'] += wait
+            return wait
+
+    def _release(self, key: tuple) -> None:
+        with self._lock:
+            self._metrics[key]['queue_depth'] -= 1
+
+    def _backoff(self, key: tuple, attempt: int, error: HttpError) -> float:
+        """Returns the delay before retrying error, pausing the whole bucket on a Retry-After."""
+        retry_after = None
+        try:
+            retry_after = float(error.resp.get('retry-after'))
+        except (TypeError, ValueError):
+            pass
+
+        with self._lock:
+            rate, metrics = self._refill(key)
+            metrics['retries'] += 1
+            if retry_after is None:
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+            else:
+                delay = retry_after
+                balance, updated = self._buckets[key]
+                self._buckets[key] = (min(balance, -retry_after * rate), updated)
+            metrics['throttled_seconds'] += delay
+            return delay
+
+    def _retryable(self, error: Exception, attempt: int, idempotent: bool) -> bool:
+        return (
+            isinstance(error, HttpError)
+            and attempt < self.max_retries
+            and (error.resp.status == THROTTLED_STATUS or (idempotent and error.resp.status in TRANSIENT_STATUSES))
+        )
+
+    def execute(self, request, tokens: int = None, key: tuple = None, idempotent: bool = None):
+        return self.transport.run(self.aexecute(request, tokens, key, idempotent))
+
+    async def aexecute(self, request, tokens: int = None, key: tuple = None, idempotent: bool = None):
+        """Executes a googleapiclient request under the limiter.
+
+        A batch passes its total tokens, its key, and whether every call in it is idempotent.
+        """
+        key = key or request_key(request)
+        tokens = request_cost(request) if tokens is None else tokens
+        idempotent = is_idempotent(request) if idempotent is None else idempotent
+        for attempt in range(self.max_retries + 1):
+            wait = self._reserve(key, tokens)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                self._release(key)
+            try:
+                return await self.transport.send(request, key[0])
+            except HttpError as e:
+                if not self._retryable(e, attempt, idempotent):
+                    raise
+                await asyncio.sleep(self._backoff(key, attempt, e))
+
+    def execute_batch(self, service, requests: Dict[str, object], callback: Callable) -> None:
+        self.transport.run(self.aexecute_batch(service, requests, callback))
+
+    async def aexecute_batch(self, service, requests: Dict[str, object], callback: Callable) -> None:
+        """Executes requests as one batch paced by their quota units, retrying throttled items.
+
+        callback receives (request_id, response, exception) once per request, like a
+        batch callback. Items that fail with a retryable status are resent in a smaller
+        batch after a backoff instead of being reported.
+        """
+        if not requests:
+            return
+
+        key = request_key(next(iter(requests.values())))
+        pending = dict(requests)
+        for attempt in range(self.max_retries + 1):
+            retry = {}
+
+            def on_response(request_id, response, exception):
+                if exception is not None and self._retryable(exception, attempt, is_idempotent(requests[request_id])):
+                    retry[request_id] = exception
+                else:
+                    callback(request_id, response, exception)
+
+            batch = service.new_batch_http_request(callback=on_response)
+            for request_id, request in pending.items():
+                batch.add(request, request_id=request_id)
+            await self.aexecute(
+                batch,
+                tokens=sum(request_cost(request) for request in pending.values()),
+                key=key,
+                idempotent=all(is_idempotent(request) for request in pending.values())
+            )
+
+            if not retry:
+                return
+            pending = {request_id: requests[request_id] for request_id in retry}
+            await asyncio.sleep(self._backoff(key, attempt, next(iter(retry.values()))))
+
+    def metrics(self) -> Dict[str, dict]:
+        """Returns request, retry, queue depth and throttled time counters per 'api:user' bucket."""
+        with self._lock:
+            return {f"{api}:{subject or 'default'}": dict(metrics) for (api, subject), metrics in self._metrics.items()}
+
+
+RATE_LIMITER = RateLimiter(
+    parse_rate_limits(os.getenv('GOOGLE_API_RATE_LIMITS')),
+    default_rate=float(os.getenv('GOOGLE_API_DEFAULT_RATE_LIMIT', DEFAULT_RATE_LIMIT)),
+    max_retries=int(os.getenv('GOOGLE_API_MAX_RETRIES', DEFAULT_MAX_RETRIES))
+)
+
+
+READONLY_SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
+COMPOSE_SCOPES = ['https://www.googleapis.com/auth/gmail.compose']
+
+
+def gmail_service(scopes: List[str]):
+    return CLIENT_CACHE.get_service('gmail', 'v1', scopes=scopes, subject=os.getenv('GOOGLE_DELEGATED_EMAIL'))
+
+
+def message_metadata_request(service, user_id: str, message_id: str):
+    return service.users().messages().get(
+        userId=user_id,
+        id=message_id,
+        format='metadata',
+        metadataHeaders=['From', 'Subject', 'Date'],
+        **fields(MESSAGE_METADATA_FIELDS)
+    )
+
+
+def encode_message(values: dict) -> str:
+    message = MIMEText(values["body"])
+    message['to'] = values["to"]
+    message['subject'] = values["subject"]
+
+    if values.get("cc"):
+        message['cc'] = values["cc"]
+    if values.get("bcc"):
+        message['bcc'] = values["bcc"]
+
+    return base64.urlsafe_b64encode(message.as_bytes()).decode()
+
+
+def create_draft_request(service, values: dict):
+    return service.users().drafts().create(
+        userId=values["userId"],
+        body={
+            'message': {
+                'raw': encode_message(values)
+            }
+        },
+        **fields(DRAFT_FIELDS)
+    )
+
+
+def send_draft_request(service, values: dict):
+    return service.users().drafts().send(
+        userId=values["userId"],
+        body={'id': values["draftId"]},
+        **fields(SENT_MESSAGE_FIELDS)
+    )
+
+
+def delete_draft_request(service, values: dict):
+    return service.users().drafts().delete(
+        userId=values["userId"],
+        id=values["draftId"]
+    )
+
+# Gmail accepts at most 100 calls per batch request, but recommends staying at or below 50
+DEFAULT_BATCH_SIZE = 50
+MAX_BATCH_SIZE = 100
+# messages().list returns at most 500 ids per page
+MAX_PAGE_SIZE = 500
+
+
+def batch_execute(service, requests: list, batch_size: int = DEFAULT_BATCH_SIZE) -> tuple:
+    return TRANSPORT.run(abatch_execute(service, requests, batch_size))
+
+
+async def abatch_execute(service, requests: list, batch_size: int = DEFAULT_BATCH_SIZE) -> tuple:
+    """Executes requests through Gmail batch requests, batch_size calls per round trip.
+
+    Returns a dict of request position to response and a dict of request position to
+    error. A failed call does not discard the rest of its batch. The batches are sent
+    concurrently, within the transport's per-API limit.
+    """
+    batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+    responses = {}
+    errors = {}
+
+    def callback(request_id, response, exception):
+        if exception is not None:
+            errors[int(request_id)] = str(exception)
+        else:
+            responses[int(request_id)] = response
+
+    await asyncio.gather(*(
+        RATE_LIMITER.aexecute_batch(service, {
+            str(index): requests[index] for index in range(start, min(start + batch_size, len(requests)))
+        }, callback)
+        for start in range(0, len(requests), batch_size)
+    ))
+
+    return responses, errors
+
+
+def batch_get_message_metadata(service, user_id: str, message_ids: List[str], batch_size: int = DEFAULT_BATCH_SIZE):
+    return TRANSPORT.run(abatch_get_message_metadata(service, user_id, message_ids, batch_size))
+
+
+async def abatch_get_message_metadata(service, user_id: str, message_ids: List[str],
+                                      batch_size: int = DEFAULT_BATCH_SIZE):
+    """Fetches message metadata through Gmail batch requests, batch_size messages per round trip.
+
+    Returns the fetched messages in the order of message_ids, along with a dict of
+    message id to error for the messages that failed.
+    """
+    message_ids = list(dict.fromkeys(message_ids))
+    messages, errors = await abatch_execute(
+        service,
+        [message_metadata_request(service, user_id, message_id) for message_id in message_ids],
+        batch_size
+    )
+
+    return (
+        [messages[index] for index in range(len(message_ids)) if index in messages],
+        {message_id: errors[index] for index, message_id in enumerate(message_ids) if index in errors}
+    )
+
+
+def batch_results(count: int, responses: dict, errors: dict, parse: Callable[[dict], dict]) -> dict:
+    """Collects per-item outcomes of batch_execute in request order."""
+    results = []
+    for index in range(count):
+        if index in responses:
+            results.append({'index': index, **parse(responses[index])})
+        else:
+            results.append({'index': index, 'error': errors[index]})
+
+    return {'succeeded': len(responses), 'failed': len(errors), 'results': results}
+
+
+def parse_message_metadata(msg: dict) -> dict:
+    headers = {h['name']: h['value'] for h in msg['payload'].get('headers', [])}
+    return {
+        'id': msg['id'],
+        'date': headers.get('Date', ''),
+        'from': headers.get('From', ''),
+        'subject': headers.get('Subject', ''),
+        'has_attachments': bool(msg['payload'].get('parts', []))
+    }
+
+
+
+def encode_cursor(page_token: str, offset: int, page_size: int) -> str:
+    """Encodes a resume position (list page token, offset within that page and the page size
+    the listing used) as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps({'p': page_token, 'o': offset, 's': page_size}).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return position['p'], position['o'], position['s']
+
+
+def iter_message_pages(service, user_id: str, q: str = None, label_ids: List[str] = None,
+                       page_size: int = MAX_PAGE_SIZE, page_token: str = None):
+    return TRANSPORT.iterate(aiter_message_pages(service, user_id, q, label_ids, page_size, page_token))
+
+
+async def aiter_message_pages(service, user_id: str, q: str = None, label_ids: List[str] = None,
+                              page_size: int = MAX_PAGE_SIZE, page_token: str = None):
+    """Lazily follows nextPageToken, yielding (page_token, next_page_token, message_ids) per page.
+
+    A page is only requested once the previous one has been consumed, so callers that
+    stop early never fetch pages nobody reads.
+    """
+    while True:
+        results = await RATE_LIMITER.aexecute(service.users().messages().list(
+            userId=user_id,
+            q=q,
+            labelIds=label_ids,
+            maxResults=page_size,
+            pageToken=page_token,
+            **fields(MESSAGE_LIST_FIELDS)
+        ))
+
+        next_page_token = results.get('nextPageToken')
+        yield page_token, next_page_token, [message['id'] for message in results.get('messages', [])]
+
+        if not next_page_token:
+            return
+        page_token = next_page_token
+
+
+async def aiter_email_metadata(service, user_id: str, q: str = None, label_ids: List[str] = None,
+                               page_size: int = MAX_PAGE_SIZE, batch_size: int = DEFAULT_BATCH_SIZE,
+                               cursor: str = None):
+    """Yields (cursor, email_data) for every matching message, one list page at a time.
+
+    The cursor yielded with each record resumes right after it, or is None once the
+    listing is exhausted. A cursor carries the page size it was made with, and a resumed
+    listing keeps that size, since its offset only counts within pages of that size.
+    Metadata is fetched one batch at a time, so callers that stop early don't pay for
+    the rest of the page.
+    """
+    page_token, offset = None, 0
+    if cursor:
+        page_token, offset, page_size = decode_cursor(cursor)
+
+    async with aclosing(aiter_message_pages(service, user_id, q, label_ids, page_size, page_token)) as pages:
+        async for token, next_page_token, message_ids in pages:
+            for start in range(offset, len(message_ids), batch_size):
+                batch_ids = message_ids[start:start + batch_size]
+                messages, errors = await abatch_get_message_metadata(
+                    service, user_id, batch_ids, batch_size=batch_size
+                )
+                messages = {msg['id']: msg for msg in messages}
+
+                for index, message_id in enumerate(batch_ids, start=start + 1):
+                    if index < len(message_ids):
+                        next_cursor = encode_cursor(token, index, page_size)
+                    else:
+                        next_cursor = encode_cursor(next_page_token, 0, page_size) if next_page_token else None
+
+                    if message_id in messages:
+                        yield next_cursor, parse_message_metadata(messages[message_id])
+                    else:
+                        yield next_cursor, {'id': message_id, 'error': errors.get(message_id, 'Message not returned')}
+
+            offset = 0
+
+
+async def atake(records, count: int) -> list:
+    """Returns up to count items of an async generator, closing it once they have been read."""
+    items = []
+    async with aclosing(records):
+        if count > 0:
+            async for item in records:
+                items.append(item)
+                if len(items) >= count:
+                    break
+
+    return items
+
+
+# Search operators the metadata store can answer locally, mapped to (label, required)
+STORE_QUERY_LABELS = {
+    'is:unread': ('UNREAD', True),
+    'is:read': ('UNREAD', False),
+    'is:starred': ('STARRED', True),
+    'is:important': ('IMPORTANT', True),
+    'in:inbox': ('INBOX', True),
+    'in:sent': ('SENT', True),
+    'in:drafts': ('DRAFT', True),
+    'in:spam': ('SPAM', True),
+    'in:trash': ('TRASH', True),
+}
+NEWER_THAN_SECONDS = {'d': 86400, 'm': 30 * 86400, 'y': 365 * 86400}
+DEFAULT_STORE_FILL_DAYS = 30
+DEFAULT_STORE_FILL_LIMIT = 5000
+
+
+class GmailMetadataStore:
+    """SQLite-backed store of Gmail message metadata, kept current through users.history.list.
+
+    The first sync for an account fills the store with the messages of the last
+    fill_days days (at most fill_limit of them) and remembers the mailbox historyId.
+    Later syncs only apply the history delta since that id, falling back to a full
+    fill when Gmail no longer has the history (404). Queries are answered locally
+    when they only use label operators and a newer_than window the store covers.
+    """
+
+    def __init__(self, path: str, fill_days: int = DEFAULT_STORE_FILL_DAYS, fill_limit: int = DEFAULT_STORE_FILL_LIMIT):
+        self.path = path
+        self.fill_days = fill_days
+        self.fill_limit = fill_limit
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS messages (
+                    account TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    thread_id TEXT,
+                    sender TEXT,
+                    subject TEXT,
+                    date TEXT,
+                    labels TEXT NOT NULL,
+                    has_attachments INTEGER NOT NULL,
+                    internal_date INTEGER NOT NULL,
+                    PRIMARY KEY (account, id)
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS messages_by_date ON messages (account, internal_date DESC)"
+            )
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    account TEXT PRIMARY KEY,
+                    history_id TEXT NOT NULL,
+                    coverage_start INTEGER NOT NULL
+                )
+            """)
+
+    def sync(self, service, user_id: str, account: str, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        with self._lock:
+            state = self._conn.execute(
+                "SELECT history_id FROM sync_state WHERE account = ?", (account,)
+            ).fetchone()
+
+            if state is None:
+                self._full_sync(service, user_id, account, batch_size)
+                return
+
+            try:
+                self._delta_sync(service, user_id, account, state[0], batch_size)
+            except HttpError as e:
+                if e.resp.status != 404:
+                    raise
+                self._full_sync(service, user_id, account, batch_size)
+
+    def parse_query(self, q: str = None, label_ids: List[str] = None):
+        """Returns (required labels, excluded labels, window in seconds) for a query the store
+        can answer, or None if it can't, so callers know before syncing."""
+        required = set(label_ids or [])
+        excluded = {'SPAM', 'TRASH'}
+        window = None
+
+        for term in (q or '').lower().split():
+            if term in STORE_QUERY_LABELS:
+                label, present = STORE_QUERY_LABELS[term]
+                (required if present else excluded).add(label)
+            elif term.startswith('newer_than:') and term[-1:] in NEWER_THAN_SECONDS and term[11:-1].isdigit():
+                window = int(term[11:-1]) * NEWER_THAN_SECONDS[term[-1]]
+            else:
+                return None
+
+        if window is None or window > self.fill_days * NEWER_THAN_SECONDS['d']:
+            return None
+
+        return required, excluded - required, window
+
+    def query(self, account: str, q: str = None, label_ids: List[str] = None, max_results: int = 100):
+        """Returns matching email metadata newest first, or None if the store cannot answer the query."""
+        parsed = self.parse_query(q, label_ids)
+        if parsed is None:
+            return None
+        required, excluded, window = parsed
+
+        with self._lock:
+            state = self._conn.execute(
+                "SELECT coverage_start FROM sync_state WHERE account = ?", (account,)
+            ).fetchone()
+            since = int((time.time() - window) * 1000)
+            if state is None or since < state[0]:
+                return None
+
+            sql = "SELECT id, date, sender, subject, has_attachments FROM messages WHERE account = ? AND internal_date >= ?"
+            args = [account, since]
+            for label in required:
+                sql += " AND labels LIKE ? ESCAPE '\\'"
+                args.append(self._label_pattern(label))
+            for label in excluded:
+                sql += " AND labels NOT LIKE ? ESCAPE '\\'"
+                args.append(self._label_pattern(label))
+            sql += " ORDER BY internal_date DESC LIMIT ?"
+            args.append(max_results)
+
+            return [
+                {
+                    'id': row[0],
+                    'date': row[1],
+                    'from': row[2],
+                    'subject': row[3],
+                    'has_attachments': bool(row[4])
+                }
+                for row in self._conn.execute(sql, args)
+            ]
+
+    def _full_sync(self, service, user_id: str, account: str, batch_size: int) -> None:
+        # Read the historyId before listing so that nothing arriving during the fill is missed
+        history_id = RATE_LIMITER.execute(service.users().getProfile(userId=user_id, **fields(PROFILE_FIELDS)))['historyId']
+        coverage_start = int((time.time() - self.fill_days * NEWER_THAN_SECONDS['d']) * 1000)
+
+        with self._conn:
+            self._conn.execute("DELETE FROM messages WHERE account = ?", (account,))
+
+        remaining = self.fill_limit
+        for _, _, message_ids in iter_message_pages(
+            service, user_id, q=f"newer_than:{self.fill_days}d", page_size=min(remaining, MAX_PAGE_SIZE)
+        ):
+            messages, _ = batch_get_message_metadata(service, user_id, message_ids[:remaining], batch_size=batch_size)
+            with self._conn:
+                self._upsert(account, messages)
+            remaining -= len(message_ids)
+            if remaining <= 0:
+                # The fill was capped, so only vouch for the window the stored messages span
+                oldest = self._conn.execute(
+                    "SELECT MIN(internal_date) FROM messages WHERE account = ?", (account,)
+                ).fetchone()[0]
+                coverage_start = max(coverage_start, oldest or coverage_start)
+                break
+
+        self._set_state(account, history_id, coverage_start)
+
+    def _delta_sync(self, service, user_id: str, account: str, history_id: str, batch_size: int) -> None:
+        added = set()
+        deleted = set()
+        label_changes = []
+        page_token = None
+
+        while True:
+            results = RATE_LIMITER.execute(service.users().history().list(
+                userId=user_id,
+                startHistoryId=history_id,
+                historyTypes=['messageAdded', 'messageDeleted', 'labelAdded', 'labelRemoved'],
+                pageToken=page_token,
+                **fields(HISTORY_FIELDS)
+            ))
+
+            for record in results.get('history', []):
+                for item in record.get('messagesAdded', []):
+                    added.add(item['message']['id'])
+                for item in record.get('messagesDeleted', []):
+                    deleted.add(item['message']['id'])
+                for item in record.get('labelsAdded', []):
+                    label_changes.append((item['message']['id'], set(item.get('labelIds', [])), set()))
+                for item in record.get('labelsRemoved', []):
+                    label_changes.append((item['message']['id'], set(), set(item.get('labelIds', []))))
+
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+
+        # Newly added messages are fetched with their current labels, so earlier label deltas are already applied
+        added -= deleted
+        messages, errors = batch_get_message_metadata(service, user_id, list(added), batch_size=batch_size)
+        deleted.update(errors)
+
+        with self._conn:
+            self._upsert(account, messages)
+            for message_id, labels_added, labels_removed in label_changes:
+                if message_id in added or message_id in deleted:
+                    continue
+                row = self._conn.execute(
+                    "SELECT labels FROM messages WHERE account = ? AND id = ?", (account, message_id)
+                ).fetchone()
+                if row is None:
+                    continue
+                labels = (set(filter(None, row[0].split(','))) | labels_added) - labels_removed
+                self._conn.execute(
+                    "UPDATE messages SET labels = ? WHERE account = ? AND id = ?",
+                    (self._encode_labels(labels), account, message_id)
+                )
+            self._conn.executemany(
+                "DELETE FROM messages WHERE account = ? AND id = ?",
+                [(account, message_id) for message_id in deleted]
+            )
+            self._conn.execute(
+                "UPDATE sync_state SET history_id = ? WHERE account = ?", (results['historyId'], account)
+            )
+
+    def _upsert(self, account: str, messages: List[dict]) -> None:
+        rows = []
+        for msg in messages:
+            email_data = parse_message_metadata(msg)
+            rows.append((
+                account,
+                msg['id'],
+                msg.get('threadId'),
+                email_data['from'],
+                email_data['subject'],
+                email_data['date'],
+                self._encode_labels(msg.get('labelIds', [])),
+                int(email_data['has_attachments']),
+                int(msg.get('internalDate', 0))
+            ))
+
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+
+    def _set_state(self, account: str, history_id: str, coverage_start: int) -> None:
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)", (account, history_id, coverage_start)
+            )
+
+    @staticmethod
+    def _encode_labels(labels) -> str:
+        # Wrapped in commas so a single label can be matched with LIKE '%,LABEL,%'
+        return ',' + ','.join(sorted(labels)) + ','
+
+    @staticmethod
+    def _label_pattern(label: str) -> str:
+        # User label ids look like Label_12, and _ and % are LIKE wildcards
+        escaped = label.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return f"%,{escaped},%"
+
+
 class GmailTool(BaseTool):
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, metadata_store: GmailMetadataStore = None):
+        super().__init__()
+        self.batch_size = batch_size
+        self.metadata_store = metadata_store
+
     @activity(
         config={
             "description": "Lists unread emails from Gmail inbox using service account credentials",
@@ -60,44 +1050,91 @@ class GmailTool(BaseTool):
     )
     def list_unread_emails(self, params: dict) -> ListArtifact:
         """Lists unread emails from Gmail inbox using service account credentials."""
-        credentials = service_account.Credentials.from_service_account_info(
-            get_service_account_info(),
-            scopes=['https://www.googleapis.com/auth/gmail.readonly']
-        )
-        
-        delegated_credentials = credentials.with_subject(os.getenv('GOOGLE_DELEGATED_EMAIL'))
-        
-        service = build('gmail', 'v1', credentials=delegated_credentials)
-        
-        results = service.users().messages().list(
-            userId=params["values"]["userId"],
+        return TRANSPORT.run(self.alist_unread_emails(params))
+
+    async def alist_unread_emails(self, params: dict) -> ListArtifact:
+        service = await asyncio.to_thread(gmail_service, READONLY_SCOPES)
+
+        max_results = params["values"]["maxResults"]
+
+        # Only sync the store for queries it can answer, since a first sync fills it with
+        # up to fill_limit messages
+        if self.metadata_store is not None and self.metadata_store.parse_query(
+            params["values"]["q"], params["values"]["labelIds"]
+        ) is not None:
+            user_id = params["values"]["userId"]
+            account = os.getenv('GOOGLE_DELEGATED_EMAIL') if user_id == 'me' else user_id
+            await asyncio.to_thread(self.metadata_store.sync, service, user_id, account, self.batch_size)
+            stored = await asyncio.to_thread(
+                self.metadata_store.query,
+                account,
+                params["values"]["q"],
+                params["values"]["labelIds"],
+                max_results
+            )
+            if stored is not None:
+                return ListArtifact([JsonArtifact(email_data) for email_data in stored])
+
+        emails = await atake(aiter_email_metadata(
+            service,
+            params["values"]["userId"],
             q=params["values"]["q"],
-            labelIds=params["values"]["labelIds"],
-            maxResults=params["values"]["maxResults"]
-        ).execute()
+            label_ids=params["values"]["labelIds"],
+            page_size=max(1, min(max_results, MAX_PAGE_SIZE)),
+            batch_size=self.batch_size
+        ), max_results)
 
-        messages = results.get('messages', [])
-        emails = []
-        
-        for message in messages:
-            msg = service.users().messages().get(
-                userId='me', 
-                id=message['id'],
-                format='metadata',
-                metadataHeaders=['From', 'Subject', 'Date']
-            ).execute()
-
-            headers = msg['payload']['headers']
-            email_data = {
-                'id': msg['id'],
-                'date': next(h['value'] for h in headers if h['name'] == 'Date'),
-                'from': next(h['value'] for h in headers if h['name'] == 'From'),
-                'subject': next(h['value'] for h in headers if h['name'] == 'Subject'),
-                'has_attachments': bool(msg['payload'].get('parts', []))
-            }
-            emails.append(JsonArtifact(email_data))
-            
-        return ListArtifact(emails)
+        return ListArtifact([JsonArtifact(email_data) for _, email_data in emails])
+
+    @activity(
+        config={
+            "description": "Lists emails page by page, returning a cursor that can be passed back to continue where the listing stopped",
+            "schema": Schema({
+                Literal(
+                    "userId",
+                    description="Gmail user ID, usually 'me' for authenticated user"
+                ): str,
+                Optional(Literal(
+                    "q",
+                    description="Gmail search query, e.g. 'is:unread'"
+                )): str,
+                Optional(Literal(
+                    "labelIds",
+                    description="List of Gmail label IDs to filter by"
+                )): [str],
+                Literal(
+                    "maxResults",
+                    description="Hard cap on the number of emails returned by this call"
+                ): int,
+                Optional(Literal(
+                    "cursor",
+                    description="Cursor returned by a previous call, to resume the listing"
+                )): str
+            })
+        }
+    )
+    def list_emails_paginated(self, params: dict) -> JsonArtifact:
+        """Lists emails lazily across result pages, stopping as soon as maxResults have been read."""
+        return TRANSPORT.run(self.alist_emails_paginated(params))
+
+    async def alist_emails_paginated(self, params: dict) -> JsonArtifact:
+        service = await asyncio.to_thread(gmail_service, READONLY_SCOPES)
+
+        max_results = params["values"]["maxResults"]
+        records = await atake(aiter_email_metadata(
+            service,
+            params["values"]["userId"],
+            q=params["values"].get("q"),
+            label_ids=params["values"].get("labelIds"),
+            page_size=max(1, min(max_results, MAX_PAGE_SIZE)),
+            batch_size=self.batch_size,
+            cursor=params["values"].get("cursor")
+        ), max_results)
+
+        return JsonArtifact({
+            'emails': [email_data for _, email_data in records],
+            'cursor': records[-1][0] if records else None
+        })
 
     @activity(
         config={
@@ -132,33 +1169,12 @@ class GmailTool(BaseTool):
     )
     def create_draft_email(self, params: dict) -> JsonArtifact:
         """Creates a draft email in Gmail using service account credentials."""
-        credentials = service_account.Credentials.from_service_account_info(
-            get_service_account_info(),
-            scopes=['https://www.googleapis.com/auth/gmail.compose']
-        )
-        
-        delegated_credentials = credentials.with_subject(os.getenv('GOOGLE_DELEGATED_EMAIL'))
-        service = build('gmail', 'v1', credentials=delegated_credentials)
+        return TRANSPORT.run(self.acreate_draft_email(params))
 
-        message = MIMEText(params["values"]["body"])
-        message['to'] = params["values"]["to"]
-        message['subject'] = params["values"]["subject"]
-        
-        if params["values"].get("cc"):
-            message['cc'] = params["values"]["cc"]
-        if params["values"].get("bcc"):
-            message['bcc'] = params["values"]["bcc"]
-            
-        encoded_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        
-        draft = service.users().drafts().create(
-            userId=params["values"]["userId"],
-            body={
-                'message': {
-                    'raw': encoded_message
-                }
-            }
-        ).execute()
+    async def acreate_draft_email(self, params: dict) -> JsonArtifact:
+        service = await asyncio.to_thread(gmail_service, COMPOSE_SCOPES)
+
+        draft = await RATE_LIMITER.aexecute(create_draft_request(service, params["values"]))
         
         return JsonArtifact({
             'id': draft['id'],
@@ -182,18 +1198,12 @@ class GmailTool(BaseTool):
     )
     def send_draft_email(self, params: dict) -> JsonArtifact:
         """Sends an existing draft email."""
-        credentials = service_account.Credentials.from_service_account_info(
-            get_service_account_info(),
-            scopes=['https://www.googleapis.com/auth/gmail.compose']
-        )
-        
-        delegated_credentials = credentials.with_subject(os.getenv('GOOGLE_DELEGATED_EMAIL'))
-        service = build('gmail', 'v1', credentials=delegated_credentials)
+        return TRANSPORT.run(self.asend_draft_email(params))
+
+    async def asend_draft_email(self, params: dict) -> JsonArtifact:
+        service = await asyncio.to_thread(gmail_service, COMPOSE_SCOPES)
         
-        sent_message = service.users().drafts().send(
-            userId=params["values"]["userId"],
-            body={'id': params["values"]["draftId"]}
-        ).execute()
+        sent_message = await RATE_LIMITER.aexecute(send_draft_request(service, params["values"]))
         
         return JsonArtifact({
             'id': sent_message['id'],
@@ -218,27 +1228,140 @@ class GmailTool(BaseTool):
     )
     def delete_draft_email(self, params: dict) -> JsonArtifact:
         """Deletes an existing draft email."""
-        credentials = service_account.Credentials.from_service_account_info(
-            get_service_account_info(),
-            scopes=['https://www.googleapis.com/auth/gmail.compose']
-        )
-        
-        delegated_credentials = credentials.with_subject(os.getenv('GOOGLE_DELEGATED_EMAIL'))
-        service = build('gmail', 'v1', credentials=delegated_credentials)
+        return TRANSPORT.run(self.adelete_draft_email(params))
+
+    async def adelete_draft_email(self, params: dict) -> JsonArtifact:
+        service = await asyncio.to_thread(gmail_service, COMPOSE_SCOPES)
         
-        service.users().drafts().delete(
-            userId=params["values"]["userId"],
-            id=params["values"]["draftId"]
-        ).execute()
+        await RATE_LIMITER.aexecute(delete_draft_request(service, params["values"]))
         
         return JsonArtifact({
             'success': True,
             'draftId': params["values"]["draftId"]
         })
 
+    @activity(
+        config={
+            "description": "Creates many draft emails in one call. Returns the draft or an error for each, in order",
+            "schema": Schema({
+                Literal(
+                    "userId",
+                    description="Gmail user ID, usually 'me' for authenticated user"
+                ): str,
+                Literal(
+                    "drafts",
+                    description="List of drafts, each with to, subject and body and optionally cc and bcc"
+                ): [{
+                    "to": str,
+                    "subject": str,
+                    "body": str,
+                    Optional("cc"): str,
+                    Optional("bcc"): str
+                }]
+            })
+        }
+    )
+    def create_draft_emails(self, params: dict) -> JsonArtifact:
+        """Creates draft emails through Gmail batch requests."""
+        return TRANSPORT.run(self.acreate_draft_emails(params))
+
+    async def acreate_draft_emails(self, params: dict) -> JsonArtifact:
+        service = await asyncio.to_thread(gmail_service, COMPOSE_SCOPES)
+        drafts = params["values"]["drafts"]
+
+        responses, errors = await abatch_execute(
+            service,
+            [create_draft_request(service, {**draft, "userId": params["values"]["userId"]}) for draft in drafts],
+            self.batch_size
+        )
+
+        return JsonArtifact(batch_results(
+            len(drafts), responses, errors,
+            lambda draft: {'id': draft['id'], 'message': draft['message']}
+        ))
+
+    @activity(
+        config={
+            "description": "Sends many existing draft emails in one call. Returns the sent message or an error for each, in order",
+            "schema": Schema({
+                Literal(
+                    "userId",
+                    description="Gmail user ID, usually 'me' for authenticated user"
+                ): str,
+                Literal(
+                    "draftIds",
+                    description="IDs of the drafts to send"
+                ): [str]
+            })
+        }
+    )
+    def send_draft_emails(self, params: dict) -> JsonArtifact:
+        """Sends existing drafts through Gmail batch requests."""
+        return TRANSPORT.run(self.asend_draft_emails(params))
+
+    async def asend_draft_emails(self, params: dict) -> JsonArtifact:
+        service = await asyncio.to_thread(gmail_service, COMPOSE_SCOPES)
+        draft_ids = params["values"]["draftIds"]
+
+        responses, errors = await abatch_execute(
+            service,
+            [send_draft_request(service, {"userId": params["values"]["userId"], "draftId": draft_id}) for draft_id in draft_ids],
+            self.batch_size
+        )
+
+        return JsonArtifact(batch_results(
+            len(draft_ids), responses, errors,
+            lambda message: {'id': message['id'], 'labelIds': message['labelIds'], 'threadId': message['threadId']}
+        ))
+
+    @activity(
+        config={
+            "description": "Deletes many existing draft emails in one call. Returns success or an error for each, in order",
+            "schema": Schema({
+                Literal(
+                    "userId",
+                    description="Gmail user ID, usually 'me' for authenticated user"
+                ): str,
+                Literal(
+                    "draftIds",
+                    description="IDs of the drafts to delete"
+                ): [str]
+            })
+        }
+    )
+    def delete_draft_emails(self, params: dict) -> JsonArtifact:
+        """Deletes existing drafts through Gmail batch requests."""
+        return TRANSPORT.run(self.adelete_draft_emails(params))
+
+    async def adelete_draft_emails(self, params: dict) -> JsonArtifact:
+        service = await asyncio.to_thread(gmail_service, COMPOSE_SCOPES)
+        draft_ids = params["values"]["draftIds"]
+
+        responses, errors = await abatch_execute(
+            service,
+            [delete_draft_request(service, {"userId": params["values"]["userId"], "draftId": draft_id}) for draft_id in draft_ids],
+            self.batch_size
+        )
+
+        results = batch_results(len(draft_ids), responses, errors, lambda _: {'success': True})
+        for result in results['results']:
+            result['draftId'] = draft_ids[result['index']]
+
+        return JsonArtifact(results)
+
 def init_tool() -> BaseTool:
     for var in REQUIRED_ENV_VARS:
         if os.getenv(var) is None:
             raise ValueError(f"Missing required environment variable: {var}")
 
-    return GmailTool()
\ No newline at end of file
+    metadata_store = None
+    if os.getenv("GMAIL_METADATA_STORE"):
+        metadata_store = GmailMetadataStore(
+            os.getenv("GMAIL_METADATA_STORE"),
+            fill_days=int(os.getenv("GMAIL_METADATA_STORE_FILL_DAYS", DEFAULT_STORE_FILL_DAYS))
+        )
+
+    return GmailTool(
+        batch_size=int(os.getenv("GMAIL_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+        metadata_store=metadata_store
+    )
\ No newline at end of file
@@ -7,8 +7,9 @@ from griptape.tools import BaseTool
 from griptape.utils.decorators import activity
 from griptape.drivers import GriptapeCloudFileManagerDriver
 from schema import Schema, Literal, Optional
+from datetime import datetime, timedelta, timezone
 import os.path
-import pickle
+import threading
 import traceback
 import base64
 import json
@@ -22,9 +23,118 @@ SCOPES = [
     'https://www.googleapis.com/auth/gmail.modify'
 ]
 
+TOKEN_FILE_SUFFIX = '.token.json'
+
+
+class TokenStore:
+    """Keeps OAuth credentials in memory, indexed by user email.
+
+    Tokens are persisted as authorized-user JSON (one <email>.token.json per user in
+    token_dir, written atomically) instead of pickles, and the directory is only read
+    once. A background thread refreshes tokens before they expire so lookups do not
+    have to refresh inside the request.
+    """
+
+    def __init__(self, token_dir: str = '.', refresh_margin: timedelta = timedelta(minutes=5),
+                 refresh_interval: float = 60):
+        self.token_dir = token_dir
+        self.refresh_margin = refresh_margin
+        self.refresh_interval = refresh_interval
+        self._credentials = {}
+        self._lock = threading.Lock()
+        self._refresher = None
+        self._stop = threading.Event()
+        self._load()
+
+    def get(self, email: str = None):
+        """Returns valid credentials for email, or for the first stored user that has them when email is not given."""
+        self._start_refresher()
+        with self._lock:
+            if email is None:
+                items = list(self._credentials.items())
+            else:
+                items = [(email, self._credentials[email])] if email in self._credentials else []
+
+        for user_email, creds in items:
+            if creds.valid:
+                return creds
+            # The background refresh has not caught up yet (or failed), so refresh inline
+            if self._refresh(user_email, creds):
+                return creds
+        return None
+
+    def save(self, email: str, creds: Credentials) -> None:
+        with self._lock:
+            self._credentials[email] = creds
+        self._write(email, creds)
+        self._start_refresher()
+
+    def refresh_due(self) -> None:
+        """Refreshes every token that expires within the refresh margin."""
+        with self._lock:
+            items = list(self._credentials.items())
+
+        for email, creds in items:
+            if self._needs_refresh(creds):
+                self._refresh(email, creds)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _load(self) -> None:
+        if not os.path.isdir(self.token_dir):
+            return
+
+        for filename in os.listdir(self.token_dir):
+            if not filename.endswith(TOKEN_FILE_SUFFIX):
+                continue
+            email = filename[:-len(TOKEN_FILE_SUFFIX)]
+            try:
+                with open(os.path.join(self.token_dir, filename), 'r') as f:
+                    self._credentials[email] = Credentials.from_authorized_user_info(json.load(f))
+            except Exception as e:
+                print(f"Error with {filename}: {str(e)}")
+
+    def _refresh(self, email: str, creds: Credentials) -> bool:
+        if not creds.refresh_token:
+            return False
+        try:
+            creds.refresh(Request())
+        except Exception as e:
+            print(f"Error refreshing token for {email}: {str(e)}")
+            return False
+        self._write(email, creds)
+        return True
+
+    def _write(self, email: str, creds: Credentials) -> None:
+        os.makedirs(self.token_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.token_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            f.write(creds.to_json())
+        os.replace(temp_path, os.path.join(self.token_dir, f"{email}{TOKEN_FILE_SUFFIX}"))
+
+    def _needs_refresh(self, creds: Credentials) -> bool:
+        if creds.expiry is None:
+            return not creds.valid
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return creds.expiry - self.refresh_margin <= now
+
+    def _start_refresher(self) -> None:
+        with self._lock:
+            if self._refresher is not None:
+                return
+            self._refresher = threading.Thread(target=self._run_refresher, daemon=True)
+            self._refresher.start()
+
+    def _run_refresher(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh_due()
+
+
 class GoogleOAuthTool(BaseTool):
-    def __init__(self):
+    def __init__(self, token_store: TokenStore = None):
         super().__init__()
+        self.token_store = token_store or TokenStore(os.getenv('GOOGLE_OAUTH_TOKEN_DIR', '.'))
         self.use_cloud = os.getenv('GRIPTAPE_CLOUD_GOOGLE_OAUTH', '').lower() == 'true'
         self.headless = os.getenv('GRIPTAPE_CLOUD_GOOGLE_OAUTH_HEADLESS', '').lower() == 'true'
         self.redirect_uri = os.getenv('GRIPTAPE_CLOUD_GOOGLE_OAUTH_REDIRECT_URI', 'http://localhost')
@@ -144,11 +254,8 @@ class GoogleOAuthTool(BaseTool):
                     user_email = profile.get('emailAddress')
                     
                     # Save token locally
-                    email_prefix = user_email.split('@')[0]
-                    token_file = f"{email_prefix}.pickle"
-                    with open(token_file, 'wb') as token:
-                        pickle.dump(creds, token)
-                    return TextArtifact(f"✅ Authentication successful! Credentials saved as {token_file}")
+                    self.token_store.save(user_email, creds)
+                    return TextArtifact(f"✅ Authentication successful! Credentials saved for {user_email}")
                 
             elif action == "code":
                 if not "authorization_code" in params["values"]:
@@ -202,28 +309,7 @@ class GoogleOAuthTool(BaseTool):
 
     def _get_credentials(self):
         """Helper to get/refresh credentials"""
-        # Look for any .pickle files
-        pickle_files = [f for f in os.listdir('.') if f.endswith('.pickle')]
-        
-        for pickle_file in pickle_files:
-            try:
-                with open(pickle_file, 'rb') as token:
-                    creds = pickle.load(token)
-                
-                if not creds or not creds.valid:
-                    if creds and creds.expired and creds.refresh_token:
-                        creds.refresh(Request())
-                        # Save refreshed credentials back to same file
-                        with open(pickle_file, 'wb') as token:
-                            pickle.dump(creds, token)
-                        return creds
-                else:
-                    return creds
-            except Exception as e:
-                print(f"Error with {pickle_file}: {str(e)}")
-                continue
-        
-        return None
+        return self.token_store.get()
 
     def _test_apis(self, creds):
         """Tests API access with current credentials"""
@@ -1,13 +1,104 @@
+import base64
+import os
 import random
+import threading
+from collections import OrderedDict
 
-from schema import Literal, Optional, Schema
+from attrs import Factory, define, field
+from schema import Literal, Optional, Or, Schema
 
-from griptape.artifacts import TextArtifact
+from griptape.artifacts import BaseArtifact, ErrorArtifact, JsonArtifact, TextArtifact
 from griptape.tools import BaseTool
 from griptape.utils.decorators import activity
 
+DISTRIBUTIONS = ["uniform", "integers", "normal", "sample"]
+ENCODINGS = ["json", "base64"]
+# Upper bound on the values a single generate_bulk call may return
+MAX_BULK_COUNT = 1_000_000
+DEFAULT_MAX_SESSIONS = 1024
 
+
+class GeneratorSessions:
+    """Bounded LRU of numpy Generators, one per session id.
+
+    Sessions without a seed get a child of one root SeedSequence, so every session draws
+    from an independent stream. Each session has its own lock, since a Generator must
+    not be used by two threads at once.
+    """
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_SESSIONS, seed: int = None) -> None:
+        import numpy  # pyright: ignore[reportMissingImports]
+
+        self.max_sessions = max_sessions
+        self._root = numpy.random.SeedSequence(seed)
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session: str, seed: int = None) -> tuple:
+        """Returns (generator, lock) for session, starting it over from seed if one is given."""
+        import numpy  # pyright: ignore[reportMissingImports]
+
+        with self._lock:
+            if seed is None and session in self._sessions:
+                self._sessions.move_to_end(session)
+                return self._sessions[session]
+
+            seed_sequence = numpy.random.SeedSequence(seed) if seed is not None else self._root.spawn(1)[0]
+            entry = self._sessions[session] = (numpy.random.Generator(numpy.random.PCG64(seed_sequence)), threading.Lock())
+            self._sessions.move_to_end(session)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+            return entry
+
+
+def draw(generator, values: dict):
+    """Draws values["count"] numbers from the distribution described by values."""
+    count = values["count"]
+    distribution = values["distribution"]
+
+    if distribution == "uniform":
+        return generator.uniform(values.get("low", 0.0), values.get("high", 1.0), count)
+    if distribution == "integers":
+        return generator.integers(values.get("low", 0), values["high"], count, endpoint=values.get("inclusive", False))
+    if distribution == "normal":
+        return generator.normal(values.get("mean", 0.0), values.get("std", 1.0), count)
+
+    if values.get("population") is not None:
+        # Indexes into the population, which encode maps back to its items
+        return generator.choice(len(values["population"]), count, replace=False)
+    low = values.get("low", 0)
+    return generator.choice(values["high"] - low, count, replace=False) + low
+
+
+def encode(result, values: dict) -> dict:
+    import numpy  # pyright: ignore[reportMissingImports]
+
+    population = values.get("population")
+    if values["distribution"] == "sample" and population is not None:
+        # Samples of arbitrary items are returned as the items themselves
+        return {"values": [population[index] for index in result]}
+
+    result = numpy.asarray(result)
+    if values.get("decimals") is not None and result.dtype.kind == "f":
+        result = result.round(values["decimals"])
+
+    if values.get("encoding", "json") == "base64":
+        result = numpy.ascontiguousarray(result, dtype=result.dtype.newbyteorder("<"))
+        return {
+            "encoding": "base64",
+            "dtype": result.dtype.str,
+            "count": len(result),
+            "data": base64.b64encode(result.tobytes()).decode(),
+        }
+
+    return {"values": result.tolist()}
+
+
+@define
 class RandomNumberGenerator(BaseTool):
+    sessions: GeneratorSessions = field(default=Factory(GeneratorSessions), kw_only=True)
+
     @activity(
         config={
             "description": "Can be used to generate random numbers",
@@ -28,6 +119,97 @@ class RandomNumberGenerator(BaseTool):
             str(round(random.random(), params["values"].get("decimals")))
         )
 
+    @activity(
+        config={
+            "description": "Can be used to generate many random numbers in one call: uniform floats, integers "
+            "in a range, normally distributed values, or a sample without replacement",
+            "schema": Schema(
+                {
+                    Literal("count", description="Number of values to generate"): int,
+                    Literal(
+                        "distribution",
+                        description=f"One of {', '.join(DISTRIBUTIONS)}",
+                    ): Or(*DISTRIBUTIONS),
+                    Optional(
+                        Literal(
+                            "low",
+                            description="Lower bound for uniform, integers and sample (defaults to 0)",
+                        )
+                    ): Or(int, float),
+                    Optional(
+                        Literal(
+                            "high",
+                            description="Upper bound (exclusive) for uniform (defaults to 1), integers and sample",
+                        )
+                    ): Or(int, float),
+                    Optional(
+                        Literal("inclusive", description="Whether integers may also equal high")
+                    ): bool,
+                    Optional(Literal("mean", description="Mean for normal (defaults to 0)")): Or(int, float),
+                    Optional(Literal("std", description="Standard deviation for normal (defaults to 1)")): Or(
+                        int, float
+                    ),
+                    Optional(
+                        Literal(
+                            "population",
+                            description="Items to sample from, instead of the integers from low to high",
+                        )
+                    ): list,
+                    Optional(
+                        Literal("decimals", description="Number of decimals to round floats to")
+                    ): int,
+                    Optional(
+                        Literal(
+                            "session",
+                            description="Session id. Calls with the same session continue one random stream, "
+                            "independent of other sessions",
+                        )
+                    ): str,
+                    Optional(
+                        Literal(
+                            "seed",
+                            description="Seed for reproducible values. With a session, restarts the session's "
+                            "stream from this seed",
+                        )
+                    ): int,
+                    Optional(
+                        Literal(
+                            "encoding",
+                            description="'json' for a list of values (default) or 'base64' for the little-endian "
+                            "bytes of the array",
+                        )
+                    ): Or(*ENCODINGS),
+                }
+            ),
+        }
+    )
+    def generate_bulk(self, params: dict) -> BaseArtifact:
+        import numpy  # pyright: ignore[reportMissingImports]
+
+        values = params["values"]
+        if not 0 <= values["count"] <= MAX_BULK_COUNT:
+            return ErrorArtifact(f"count must be between 0 and {MAX_BULK_COUNT}")
+
+        try:
+            if values.get("session") is not None:
+                generator, lock = self.sessions.get(values["session"], values.get("seed"))
+            else:
+                generator, lock = numpy.random.default_rng(values.get("seed")), threading.Lock()
+
+            with lock:
+                result = draw(generator, values)
+
+            return JsonArtifact(encode(result, values))
+        except Exception as e:
+            return ErrorArtifact(f"error generating random numbers: {e}")
+
 
 def init_tool() -> BaseTool:
-    return RandomNumberGenerator()
+    seed = os.getenv("RANDOM_NUMBER_GENERATOR_SEED")
+
+    return RandomNumberGenerator(
+        sessions=GeneratorSessions(
+            max_sessions=int(os.getenv("RANDOM_NUMBER_GENERATOR_MAX_SESSIONS", DEFAULT_MAX_SESSIONS)),
+            seed=int(seed) if seed else None,
+        )
+    )
@@ -1,4 +1,103 @@
+import os
+
+from griptape.drivers import SqlDriver
+from griptape.loaders import SqlLoader
 from griptape.tools import SqlTool
 
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_TIMEOUT = 30
+DEFAULT_POOL_RECYCLE = 1800
+DEFAULT_STATEMENT_CACHE_SIZE = 500
+DEFAULT_PREPARE_THRESHOLD = 2
+
+
+def is_memory_database(engine_url: str) -> bool:
+    from sqlalchemy.engine import make_url  # pyright: ignore[reportMissingImports]
+
+    url = make_url(engine_url)
+    return url.get_backend_name() == "sqlite" and (
+        url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+    )
+
+
+def normalize_engine_url(engine_url: str) -> str:
+    """Points a bare postgresql:// URL at psycopg, the driver this tool installs.
+
+    SQLAlchemy resolves postgresql:// to psycopg2, which isn't in the requirements.
+    """
+    from sqlalchemy.engine import make_url  # pyright: ignore[reportMissingImports]
+
+    url = make_url(engine_url)
+    if url.drivername != "postgresql":
+        return engine_url
+    return url.set(drivername="postgresql+psycopg").render_as_string(hide_password=False)
+
+
+def engine_params(
+    engine_url: str,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    max_overflow: int = DEFAULT_MAX_OVERFLOW,
+    pool_timeout: int = DEFAULT_POOL_TIMEOUT,
+    pool_recycle: int = DEFAULT_POOL_RECYCLE,
+    pool_pre_ping: bool = True,
+    statement_cache_size: int = DEFAULT_STATEMENT_CACHE_SIZE,
+    prepare_threshold: int = DEFAULT_PREPARE_THRESHOLD,
+) -> dict:
+    """Returns the create_engine arguments for a pooled engine that caches statements.
+
+    SQLAlchemy caches each query's compiled form in a cache of statement_cache_size entries.
+    The database driver also keeps prepared statements on each pooled connection:
+    sqlite3 caches statement_cache_size of them, and psycopg prepares a query once it
+    has run prepare_threshold times on a connection.
+    """
+    from sqlalchemy.engine import make_url  # pyright: ignore[reportMissingImports]
+
+    url = make_url(engine_url)
+    params = {
+        "pool_pre_ping": pool_pre_ping,
+        "pool_recycle": pool_recycle,
+        "query_cache_size": statement_cache_size,
+    }
+
+    # An in-memory SQLite database lives in a single connection, so it can't be pooled
+    if not is_memory_database(engine_url):
+        params.update(pool_size=pool_size, max_overflow=max_overflow, pool_timeout=pool_timeout)
+
+    if url.get_backend_name() == "sqlite":
+        params["connect_args"] = {"cached_statements": statement_cache_size}
+    elif url.get_backend_name() == "postgresql" and url.get_driver_name() == "psycopg":
+        params["connect_args"] = {"prepare_threshold": prepare_threshold}
+    else:
+        print(
+            f"Statement caching on connections isn't supported for {url.drivername}, "
+            "so only SQLAlchemy's compiled query cache is used"
+        )
+
+    return params
+
+
 def init_tool() -> SqlTool:
-    return SqlTool()
+    engine_url = normalize_engine_url(os.environ["SQL_ENGINE_URL"])
+
+    sql_driver = SqlDriver(
+        engine_url=engine_url,
+        create_engine_params=engine_params(
+            engine_url,
+            pool_size=int(os.getenv("SQL_POOL_SIZE", DEFAULT_POOL_SIZE)),
+            max_overflow=int(os.getenv("SQL_MAX_OVERFLOW", DEFAULT_MAX_OVERFLOW)),
+            pool_timeout=int(os.getenv("SQL_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT)),
+            pool_recycle=int(os.getenv("SQL_POOL_RECYCLE", DEFAULT_POOL_RECYCLE)),
+            pool_pre_ping=os.getenv("SQL_POOL_PRE_PING", "true").lower() == "true",
+            statement_cache_size=int(os.getenv("SQL_STATEMENT_CACHE_SIZE", DEFAULT_STATEMENT_CACHE_SIZE)),
+            prepare_threshold=int(os.getenv("SQL_PREPARE_THRESHOLD", DEFAULT_PREPARE_THRESHOLD)),
+        ),
+    )
+
+    return SqlTool(
+        sql_loader=SqlLoader(sql_driver=sql_driver),
+        table_name=os.environ["SQL_TABLE_NAME"],
+        schema_name=os.getenv("SQL_SCHEMA_NAME"),
+        table_description=os.getenv("SQL_TABLE_DESCRIPTION"),
+        engine_name=os.getenv("SQL_ENGINE_NAME"),
+    )
@@ -0,0 +1,20 @@
+import pytest
+
+from helpers import LocalServer
+
+
+@pytest.fixture
+def http_server():
+    server = LocalServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def unthrottled(monkeypatch):
+    """Lifts the Google tools' rate limits, so tests against fake servers don't sleep."""
+    from helpers import load_tool
+
+    for folder in ("google_mail", "google_cal", "google_docs"):
+        module = load_tool(folder)
+        monkeypatch.setattr(module, "RATE_LIMITER", module.RateLimiter(default_rate=1e9, rates={"gmail": 1e9, "calendar": 1e9, "docs": 1e9}))
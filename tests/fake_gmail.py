@@ -0,0 +1,153 @@
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import httplib2
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build_from_document
+
+BOUNDARY = "batch_boundary"
+
+
+class FakeGmail:
+    """Local stand-in for the parts of the Gmail API the tool uses.
+
+    The mailbox holds messages m0000, m0001, ... newest first. messages.list pages with
+    numeric page tokens (the offset of the page), ignores q and labelIds, and records
+    them. Ids in missing are listed but answer 404 when fetched. Every HTTP round trip
+    is counted in round_trips, with one entry per request, batches included. Each round
+    trip takes at least delay seconds; max_in_flight records how many overlapped at most
+    and client_ports which client connections they came in on.
+    """
+
+    def __init__(self, count: int, missing=(), labels=("INBOX", "UNREAD")) -> None:
+        self.messages = [
+            {
+                "id": f"m{index:04d}",
+                "threadId": f"t{index:04d}",
+                "labelIds": list(labels),
+                "internalDate": str(2_000_000_000_000 - index * 1000),
+                "payload": {"headers": [{"name": "Subject", "value": f"subject {index}"}]},
+            }
+            for index in range(count)
+        ]
+        self.missing = set(missing)
+        self.history_id = "1"
+        self.round_trips = []
+        self.list_calls = []
+        self.delay = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.client_ports = set()
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                with fake.serving(self.client_address[1]):
+                    fake.round_trips.append(("GET", urlsplit(self.path).path))
+                    self._reply(*fake.answer("GET", self.path))
+
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with fake.serving(self.client_address[1]):
+                    fake.round_trips.append(("POST", urlsplit(self.path).path))
+                    if self.path.startswith("/batch"):
+                        self._reply_batch(body)
+                    else:
+                        self._reply(404, {"error": {"code": 404, "message": "not faked"}})
+
+            def _reply(self, status: int, payload: dict) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _reply_batch(self, body: bytes) -> None:
+                message = BytesParser().parsebytes(
+                    b"Content-Type: " + self.headers["Content-Type"].encode() + b"\r\n\r\n" + body
+                )
+                parts = []
+                for part in message.get_payload():
+                    method, path, _ = part.get_payload().splitlines()[0].split(" ")
+                    status, payload = fake.answer(method, path)
+                    parts.append(
+                        f"--{BOUNDARY}\r\nContent-Type: application/http\r\n"
+                        f"Content-ID: <response-{part['Content-ID'][1:-1]}>\r\n\r\n"
+                        f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                        f"Content-Type: application/json\r\n\r\n{json.dumps(payload)}\r\n"
+                    )
+                data = ("".join(parts) + f"--{BOUNDARY}--\r\n").encode()
+                self.send_response(200)
+                self.send_header("Content-Type", f"multipart/mixed; boundary={BOUNDARY}")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    @contextmanager
+    def serving(self, client_port: int):
+        with self._lock:
+            self.client_ports.add(client_port)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def answer(self, method: str, path: str) -> tuple:
+        parts = urlsplit(path)
+        query = parse_qs(parts.query)
+
+        if parts.path.endswith("/messages"):
+            self.list_calls.append(query)
+            start = int(query.get("pageToken", ["0"])[0])
+            size = int(query.get("maxResults", ["100"])[0])
+            page = self.messages[start:start + size]
+            result = {"messages": [{"id": message["id"]} for message in page]}
+            if start + size < len(self.messages):
+                result["nextPageToken"] = str(start + size)
+            return 200, result
+
+        if match := re.search(r"/messages/([^/?]+)$", parts.path):
+            message = next((m for m in self.messages if m["id"] == match.group(1)), None)
+            if message is None or message["id"] in self.missing:
+                return 404, {"error": {"code": 404, "message": "Requested entity was not found."}}
+            return 200, message
+
+        if parts.path.endswith("/profile"):
+            return 200, {"historyId": self.history_id}
+
+        if parts.path.endswith("/history"):
+            return 200, {"history": [], "historyId": self.history_id}
+
+        return 404, {"error": {"code": 404, "message": "not faked"}}
+
+    def service(self):
+        """Returns a googleapiclient Gmail service whose requests, batches included, go to this server."""
+        document = json.loads(discovery_cache.get_static_doc("gmail", "v1"))
+        document["rootUrl"] = document["baseUrl"] = self.url
+        return build_from_document(document, http=httplib2.Http())
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,79 @@
+import asyncio
+import importlib.util
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_tool(folder: str):
+    """Imports folder/tool.py under a name of its own, since every tool folder has a tool.py."""
+    name = f"{folder.replace('-', '_')}_tool"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, folder, "tool.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+class FakeTransport:
+    """Executes requests directly, in place of the Google tools' aiohttp transport."""
+
+    def run(self, coroutine):
+        return asyncio.run(coroutine)
+
+    async def send(self, request, api):
+        return request.execute()
+
+
+class LocalServer:
+    """HTTP server on a free local port that answers from routes.
+
+    routes maps a path to (status, headers, body), where body is bytes or a list of byte
+    chunks; a number in that list pauses for that many seconds before the next chunk.
+    Every request's path and headers are kept in requests.
+    """
+
+    def __init__(self) -> None:
+        self.routes = {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                server.requests.append((self.path, dict(self.headers)))
+                status, headers, body = server.routes.get(self.path, (404, {}, b""))
+                chunks = body if isinstance(body, list) else [body]
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(sum(len(c) for c in chunks if isinstance(c, bytes))))
+                self.end_headers()
+                try:
+                    for chunk in chunks:
+                        if isinstance(chunk, bytes):
+                            self.wfile.write(chunk)
+                            self.wfile.flush()
+                        else:
+                            time.sleep(chunk)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
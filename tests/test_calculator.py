@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from helpers import load_tool
+
+tool = load_tool("calculator")
+
+
+@pytest.fixture(scope="module")
+def calculator():
+    return tool.CalculatorTool()
+
+
+@pytest.fixture(scope="module")
+def compiling_calculator():
+    return tool.CalculatorTool()
+
+
+def calculate_batch(calculator, expressions, variables=None):
+    values = {"expressions": expressions}
+    if variables is not None:
+        values["variables"] = variables
+    return calculator.calculate_batch({"values": values})
+
+
+def test_batch_evaluates_every_row(calculator):
+    result = json.loads(calculate_batch(
+        calculator,
+        ["a * b + c", "a / 2", "a + d"],
+        {"a": [1, 2, 3], "b": [4, 5, 6], "c": 1},
+    ).to_text())
+
+    assert result[0] == {"expression": "a * b + c", "result": [5.0, 11.0, 19.0]}
+    assert result[1] == {"expression": "a / 2", "result": [0.5, 1.0, 1.5]}
+    # A bad expression only fails its own item
+    assert "unknown variables d" in result[2]["error"]
+
+
+def test_batch_rejects_columns_of_different_lengths(calculator):
+    result = calculate_batch(calculator, ["a + b"], {"a": [1, 2, 3], "b": [1, 2]})
+
+    assert isinstance(result, tool.ErrorArtifact)
+    assert "same length" in result.to_text()
+
+
+@pytest.mark.parametrize("expression", [
+    "1 + 2 * 3",
+    "7 / 2",
+    "-3 - -4",
+    "10 / 4 * 3",
+    "0.1 + 0.2",
+    "2.0 ** 0.5",
+    "2147483647 - 1",
+    "1e300 * 10",
+])
+def test_fast_path_matches_numexpr(calculator, compiling_calculator, expression):
+    assert tool.evaluate_scalar(expression) is not None
+
+    # The fast path never fills the cache, while a cached expression always runs compiled
+    fast = calculator.calculate({"values": {"expression": expression}})
+    compiling_calculator.expression_cache.get(expression)
+    slow = compiling_calculator.calculate({"values": {"expression": expression}})
+
+    assert fast.to_text() == slow.to_text()
+
+
+@pytest.mark.parametrize("expression", ["2 ** 3", "(-8.0) ** 0.5", "2147483647 + 1", "1 / 0", "7 // 2", "sqrt(4)"])
+def test_expressions_the_fast_path_leaves_to_numexpr(expression):
+    assert tool.evaluate_scalar(expression) is None
+
+
+def test_expression_cache_evicts_the_least_recently_used():
+    cache = tool.ExpressionCache(max_entries=2)
+    first = cache.get("a + 1")
+    cache.get("a + 2")
+
+    assert cache.lookup("a + 1") is first
+    cache.get("a + 3")
+
+    assert cache.lookup("a + 2") is None
+    assert cache.get("a + 1") is first and cache.lookup("a + 3") is not None
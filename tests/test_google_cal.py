@@ -0,0 +1,396 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from helpers import FakeTransport, load_tool
+
+cal = load_tool("google_cal")
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.content = json.dumps(payload).encode()
+
+
+class FakeZoomClient:
+    """Stands in for zoomus.ZoomClient, counting token refreshes and meeting calls."""
+
+    def __init__(self):
+        self.refreshes = 0
+        self.meeting = self
+        self.deleted = []
+
+    def refresh_token(self):
+        self.refreshes += 1
+
+    def create(self, **kwargs):
+        if kwargs["topic"].startswith("broken"):
+            return FakeResponse({"code": 300, "message": "Invalid meeting"})
+        return FakeResponse({"id": kwargs["topic"], "join_url": f"https://zoom.example/j/{kwargs['topic']}"})
+
+    def delete(self, id):
+        self.deleted.append(id)
+
+
+def make_tool(monkeypatch, now, expiry):
+    monkeypatch.setattr(cal.time, "time", lambda: now)
+    tool = cal.GoogleCalendarTool()
+    tool.zoom_client = FakeZoomClient()
+    tool._zoom_token_expiry = expiry
+    return tool
+
+
+MEETING = {"summary": "sync", "start": "2024-03-20T10:00:00", "end": "2024-03-20T10:30:00"}
+
+
+def test_fresh_token_is_not_refreshed(monkeypatch):
+    tool = make_tool(monkeypatch, now=1000, expiry=1000 + cal.ZOOM_TOKEN_LIFETIME)
+
+    assert tool._create_zoom_meeting(MEETING)["join_url"]
+    assert tool.zoom_client.refreshes == 0
+
+
+def test_expiring_token_is_refreshed_once(monkeypatch):
+    tool = make_tool(monkeypatch, now=1000, expiry=1000 + cal.ZOOM_TOKEN_MARGIN - 1)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(tool._create_zoom_meeting, [MEETING] * 8))
+
+    assert all(result["join_url"] for result in results)
+    assert tool.zoom_client.refreshes == 1
+    assert tool._zoom_token_expiry == 1000 + cal.ZOOM_TOKEN_LIFETIME
+
+
+def test_rollback_refreshes_an_expired_token(monkeypatch):
+    tool = make_tool(monkeypatch, now=1000, expiry=0)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        tool._delete_zoom_meeting(executor.submit(lambda: {"id": 7}))
+
+    assert tool.zoom_client.refreshes == 1
+    assert tool.zoom_client.deleted == [7]
+
+
+class FakeListRequest:
+    """Stands in for an events().list request, answering with a page or raising an HttpError."""
+
+    http = None
+    method = "GET"
+    methodId = "calendar.events.list"
+
+    def __init__(self, answer):
+        self.answer = answer
+
+    def execute(self):
+        if isinstance(self.answer, int):
+            raise HttpError(httplib2.Response({"status": self.answer}), b"")
+        return self.answer
+
+
+class FakeCalendar:
+    """Stands in for a Calendar service whose events().list answers in turn, recording the arguments."""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.list_calls = []
+
+    def events(self):
+        return self
+
+    def list(self, **kwargs):
+        self.list_calls.append(kwargs)
+        return FakeListRequest(self.answers.pop(0))
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    monkeypatch.setattr(cal, "RATE_LIMITER", cal.RateLimiter(base_delay=0, max_delay=0, transport=FakeTransport()))
+
+
+def event(event_id, start, hours=1, **extra):
+    start = datetime(2024, 3, 20, tzinfo=timezone.utc) + timedelta(hours=start)
+    return {
+        "id": event_id,
+        "start": {"dateTime": start.isoformat()},
+        "end": {"dateTime": (start + timedelta(hours=hours)).isoformat()},
+        **extra,
+    }
+
+
+def page(*items, sync_token="next"):
+    return {"items": list(items), "nextSyncToken": sync_token}
+
+
+def ids(events):
+    return [event["id"] for event in events]
+
+
+DAY = datetime(2024, 3, 20, tzinfo=timezone.utc)
+
+
+def test_cache_applies_deltas(limiter):
+    cache = cal.CalendarEventCache()
+    cache.sync(FakeCalendar(page(event("a", 9), event("b", 10), sync_token="s1")))
+
+    service = FakeCalendar(page(event("b", 10, summary="moved"), event("c", 11), sync_token="s2"))
+    cache.sync(service)
+
+    assert service.list_calls[0]["syncToken"] == "s1"
+    assert cache.sync_token == "s2"
+    assert ids(cache.search(DAY, DAY + timedelta(days=1))) == ["a", "b", "c"]
+    assert cache.events["b"]["summary"] == "moved"
+
+
+def test_cancelled_events_are_removed(limiter):
+    cache = cal.CalendarEventCache()
+    cache.sync(FakeCalendar(page(event("a", 9), event("b", 10))))
+
+    cache.sync(FakeCalendar(page({"id": "a", "status": "cancelled"})))
+
+    assert ids(cache.search(DAY, DAY + timedelta(days=1))) == ["b"]
+
+
+def test_expired_sync_token_refills_the_cache(limiter):
+    cache = cal.CalendarEventCache()
+    cache.sync(FakeCalendar(page(event("a", 9), event("b", 10), sync_token="s1")))
+
+    service = FakeCalendar(410, page(event("b", 10), sync_token="s2"))
+    cache.sync(service)
+
+    assert "syncToken" in service.list_calls[0] and "timeMin" in service.list_calls[1]
+    assert cache.sync_token == "s2"
+    assert ids(cache.search(DAY, DAY + timedelta(days=1))) == ["b"]
+
+
+def test_search_matches_window_overlap_and_text(limiter):
+    cache = cal.CalendarEventCache()
+    cache.sync(FakeCalendar(page(
+        event("offsite", 0, hours=48, summary="Offsite"),
+        event("before", 8, summary="Standup"),
+        event("inside", 12, summary="Design review", attendees=[{"email": "ana@example.com"}]),
+        event("after", 20, summary="Review"),
+    )))
+
+    window = (DAY + timedelta(hours=10), DAY + timedelta(hours=14))
+    # The two day offsite started before the window but still overlaps it
+    assert ids(cache.search(*window)) == ["offsite", "inside"]
+    assert ids(cache.search(*window, q="REVIEW")) == ["inside"]
+    assert ids(cache.search(*window, q="ana@example.com design")) == ["inside"]
+    assert ids(cache.search(*window, max_results=1)) == ["offsite"]
+
+
+def test_windows_before_the_cache_are_listed_without_syncing(limiter, monkeypatch):
+    service = FakeCalendar({"items": [event("old", 9)]})
+    cache = cal.CalendarEventCache()
+    monkeypatch.setattr(cal, "calendar_service", lambda scopes: service)
+    monkeypatch.setattr(cal, "get_event_cache", lambda calendar_id, subject: cache)
+    monkeypatch.setattr(cal, "TRANSPORT", FakeTransport())
+    time_min = datetime.now(timezone.utc) - timedelta(days=cache.days + 1)
+
+    result = cal.GoogleCalendarTool(use_event_cache=True).search_calendar({"values": {
+        "timeMin": time_min.isoformat(),
+        "timeMax": (time_min + timedelta(days=1)).isoformat(),
+        "maxResults": 10,
+        "q": "",
+    }})
+
+    assert [json.loads(artifact.to_text())["id"] for artifact in result.value] == ["old"]
+    # Only the direct listing was requested; the cache was never filled
+    assert len(service.list_calls) == 1 and "syncToken" not in service.list_calls[0]
+    assert cache.sync_token is None
+
+
+def at(day, hour, minute=0):
+    """Returns a UTC datetime on a day of March 2024 (the 22nd is a Friday)."""
+    return datetime(2024, 3, day, hour, minute, tzinfo=timezone.utc)
+
+
+def test_merge_intervals_joins_overlapping_and_touching_intervals():
+    intervals = [(at(20, 13), at(20, 14)), (at(20, 9), at(20, 10)), (at(20, 9, 30), at(20, 11)),
+                 (at(20, 11), at(20, 12)), (at(20, 13, 15), at(20, 13, 45))]
+
+    assert cal.merge_intervals(intervals) == [(at(20, 9), at(20, 12)), (at(20, 13), at(20, 14))]
+    assert cal.merge_intervals([]) == []
+
+
+def test_working_windows_skip_weekends_unless_asked():
+    windows = cal.working_windows(at(22, 0), at(26, 0), "09:00", "17:00", "UTC")
+    assert windows == [(at(22, 9), at(22, 17)), (at(25, 9), at(25, 17))]
+
+    with_weekends = cal.working_windows(at(22, 0), at(26, 0), "09:00", "17:00", "UTC", include_weekends=True)
+    assert [start.day for start, _ in with_weekends] == [22, 23, 24, 25]
+
+
+def test_working_windows_are_clipped_to_the_search_range():
+    assert cal.working_windows(at(20, 10), at(21, 12), "09:00", "17:00", "UTC") == [
+        (at(20, 10), at(20, 17)), (at(21, 9), at(21, 12))
+    ]
+
+
+def test_working_windows_follow_the_time_zone_across_dst():
+    # Friday March 8 starts at 08:00 UTC in Los Angeles, which moves from PST (UTC-8) to PDT (UTC-7)
+    # on Sunday March 10
+    windows = cal.working_windows(at(8, 8), at(12, 0), "09:00", "17:00", "America/Los_Angeles")
+
+    assert [(start.astimezone(timezone.utc), end.astimezone(timezone.utc)) for start, end in windows] == [
+        (at(8, 17), at(9, 1)), (at(11, 16), at(12, 0))
+    ]
+
+
+def test_free_slots_handle_busy_periods_straddling_the_window():
+    window = [(at(20, 9), at(20, 17))]
+    busy = [(at(20, 8), at(20, 10)), (at(20, 12), at(20, 13)), (at(20, 16), at(20, 18))]
+
+    slots = cal.free_slots(window, busy, timedelta(hours=1), step=timedelta(hours=1))
+
+    assert sorted(slots) == [(at(20, 10), at(20, 11)), (at(20, 11), at(20, 12)),
+                             (at(20, 13), at(20, 14)), (at(20, 14), at(20, 15)), (at(20, 15), at(20, 16))]
+
+
+def test_free_slots_rank_the_first_slot_of_every_gap_first():
+    windows = [(at(20, 9), at(20, 12)), (at(21, 9), at(21, 11))]
+    busy = [(at(20, 10), at(20, 10, 30))]
+
+    slots = cal.free_slots(windows, busy, timedelta(minutes=30))
+
+    assert [start for start, _ in slots] == [
+        # The earliest slot of each gap, in order
+        at(20, 9), at(20, 10, 30), at(21, 9),
+        # Then the second slot of each gap, and so on
+        at(20, 9, 30), at(20, 11), at(21, 9, 30),
+        at(20, 11, 30), at(21, 10),
+        at(21, 10, 30),
+    ]
+
+
+def test_free_slots_ignore_gaps_shorter_than_the_meeting():
+    window = [(at(20, 9), at(20, 12))]
+    busy = [(at(20, 9, 45), at(20, 10)), (at(20, 10, 50), at(20, 12))]
+
+    assert cal.free_slots(window, busy, timedelta(minutes=50)) == [(at(20, 10), at(20, 10, 50))]
+
+
+def test_rank_free_slots_merges_calendars_and_reports_errors():
+    values = {"timeMin": "2024-03-22T00:00:00Z", "timeMax": "2024-03-26T00:00:00Z", "duration": 60,
+              "timeZone": "Europe/Berlin", "maxResults": 3}
+    results = [
+        {"calendars": {"primary": {"busy": [{"start": "2024-03-22T08:00:00Z", "end": "2024-03-22T10:00:00Z"}]}}},
+        {"calendars": {
+            "ana@example.com": {"busy": [{"start": "2024-03-22T09:30:00Z", "end": "2024-03-22T15:00:00Z"}]},
+            "bo@example.com": {"errors": [{"reason": "notFound"}]},
+        }},
+    ]
+
+    ranked = cal.rank_free_slots(values, results)
+
+    # Berlin is UTC+1 in March before DST, so the Friday is busy from 09:00 to 16:00 local time.
+    # The weekend is skipped, so the second gap is Monday morning
+    assert ranked["slots"] == [
+        {"start": "2024-03-22T16:00:00+01:00", "end": "2024-03-22T17:00:00+01:00"},
+        {"start": "2024-03-25T09:00:00+01:00", "end": "2024-03-25T10:00:00+01:00"},
+        {"start": "2024-03-25T09:30:00+01:00", "end": "2024-03-25T10:30:00+01:00"},
+    ]
+    assert ranked["errors"] == {"bo@example.com": ["notFound"]}
+
+
+class FakeInsertRequest:
+    http = None
+    method = "POST"
+    methodId = "calendar.events.insert"
+
+    def __init__(self, service, body):
+        self.service = service
+        self.body = body
+
+    def execute(self):
+        summary = self.body["summary"]
+        self.service.inserted.append(summary)
+        if summary in self.service.failing:
+            raise HttpError(httplib2.Response({"status": 400}), b"")
+        return {"id": f"event-{summary}", "htmlLink": f"https://calendar.example/{summary}", "status": "confirmed"}
+
+
+class FakeBatch:
+    """Answers its calls in reverse order, the way a batch response may order its parts."""
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in reversed(self.requests):
+            try:
+                self.callback(request_id, request.execute(), None)
+            except HttpError as e:
+                self.callback(request_id, None, e)
+
+
+class FakeEventsService:
+    """Stands in for a Calendar service whose inserts fail for the summaries in failing."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.inserted = []
+        self.batches = []
+
+    def events(self):
+        return self
+
+    def insert(self, calendarId, body, **kwargs):
+        return FakeInsertRequest(self, body)
+
+    def new_batch_http_request(self, callback):
+        self.batches.append(FakeBatch(callback))
+        return self.batches[-1]
+
+
+@pytest.fixture
+def events_service(monkeypatch, limiter):
+    def make(failing=()):
+        service = FakeEventsService(failing)
+        monkeypatch.setattr(cal, "calendar_service", lambda scopes: service)
+        monkeypatch.setattr(cal, "TRANSPORT", FakeTransport())
+        return service
+    return make
+
+
+def create_events(tool, *specs):
+    return json.loads(tool.create_events({"values": {"events": [
+        {**MEETING, "summary": summary, **extra} for summary, extra in specs
+    ]}}).to_text())
+
+
+def test_create_events_keeps_per_item_errors_in_order(monkeypatch, events_service):
+    service = events_service(failing={"e7", "e55"})
+    tool = make_tool(monkeypatch, now=1000, expiry=10**9)
+
+    result = create_events(tool, *((f"e{index}", {}) for index in range(60)))
+
+    assert len(service.batches) == 2
+    assert result["created"] == 58 and result["failed"] == 2
+    assert [item["index"] for item in result["results"]] == list(range(60))
+    assert "error" in result["results"][7] and "error" in result["results"][55]
+    assert result["results"][8]["event"]["id"] == "event-e8"
+    assert result["results"][59]["event"]["id"] == "event-e59"
+
+
+def test_create_events_rolls_back_zoom_meetings_of_failed_inserts(monkeypatch, events_service):
+    service = events_service(failing={"zoom-failing"})
+    tool = make_tool(monkeypatch, now=1000, expiry=10**9)
+    zoom = {"conference_type": "zoom"}
+
+    result = create_events(tool, ("zoom-ok", zoom), ("zoom-failing", zoom), ("broken-zoom", zoom), ("plain", {}))
+
+    assert result["results"][0]["event"]["zoomLink"] == "https://zoom.example/j/zoom-ok"
+    assert "error" in result["results"][1] and "error" in result["results"][2]
+    assert "zoomLink" not in result["results"][3]["event"]
+    # The event whose Zoom meeting could not be created is never inserted
+    assert sorted(service.inserted) == ["plain", "zoom-failing", "zoom-ok"]
+    assert tool.zoom_client.deleted == ["zoom-failing"]
@@ -0,0 +1,175 @@
+import asyncio
+import json
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from fake_gmail import FakeGmail
+from helpers import load_tool
+
+mail = load_tool("google_mail")
+
+
+@pytest.fixture
+def gmail(monkeypatch, unthrottled):
+    fake = FakeGmail(1000, missing={"m0003", "m0077"})
+    service = fake.service()
+    monkeypatch.setattr(mail, "gmail_service", lambda scopes: service)
+    yield fake
+    fake.close()
+
+
+def emails(artifacts):
+    return [json.loads(artifact.to_text()) for artifact in artifacts.value]
+
+
+def test_list_unread_emails_batches_metadata(gmail):
+    result = emails(mail.GmailTool().list_unread_emails(
+        {"values": {"userId": "me", "q": "is:unread", "labelIds": [], "maxResults": 100}}
+    ))
+
+    # One list call and two batches of 50, instead of one call per message
+    assert len(gmail.round_trips) == 3
+    assert [email["id"] for email in result] == [f"m{index:04d}" for index in range(100)]
+    assert result[1]["subject"] == "subject 1"
+    assert "error" in result[3] and "error" in result[77]
+    assert "error" not in result[4]
+
+
+def test_batch_get_message_metadata_keeps_per_item_errors(gmail):
+    messages, errors = mail.batch_get_message_metadata(gmail.service(), "me", ["m0002", "m0003", "m0001"])
+
+    assert [message["id"] for message in messages] == ["m0002", "m0001"]
+    assert set(errors) == {"m0003"}
+
+
+def test_activities_can_be_awaited_together(gmail):
+    async def list_three():
+        tool = mail.GmailTool()
+        values = {"userId": "me", "q": "is:unread", "labelIds": [], "maxResults": 10}
+        return await asyncio.gather(*(tool.alist_unread_emails({"values": values}) for _ in range(3)))
+
+    for result in asyncio.run(list_three()):
+        assert [email["id"] for email in emails(result)] == [f"m{index:04d}" for index in range(10)]
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    transport = mail.AsyncGoogleTransport(max_concurrency=2)
+    monkeypatch.setattr(mail, "TRANSPORT", transport)
+    monkeypatch.setattr(mail, "RATE_LIMITER", mail.RateLimiter(default_rate=1e9, rates={"gmail": 1e9}, transport=transport))
+    yield transport
+    transport.close()
+
+
+def test_batches_are_sent_concurrently_up_to_the_limit(gmail, transport):
+    gmail.delay = 0.2
+    message_ids = [f"m{index:04d}" for index in range(10, 20)]
+
+    messages, _ = mail.batch_get_message_metadata(gmail.service(), "me", message_ids, batch_size=1)
+
+    assert [message["id"] for message in messages] == message_ids
+    assert gmail.max_in_flight == 2
+
+
+def test_calls_reuse_pooled_connections(gmail, transport):
+    tool = mail.GmailTool()
+    for _ in range(3):
+        tool.list_unread_emails(
+            {"values": {"userId": "me", "q": "is:unread", "labelIds": [], "maxResults": 5}}
+        )
+
+    assert len(gmail.round_trips) == 6
+    assert len(gmail.client_ports) == 1
+
+
+def test_failed_calls_raise_http_errors(gmail):
+    with pytest.raises(HttpError) as error:
+        mail.RATE_LIMITER.execute(mail.message_metadata_request(gmail.service(), "me", "m0003"))
+
+    assert error.value.resp.status == 404
+
+
+def list_page(max_results, cursor=None):
+    values = {"userId": "me", "maxResults": max_results}
+    if cursor is not None:
+        values["cursor"] = cursor
+    return json.loads(mail.GmailTool().list_emails_paginated({"values": values}).to_text())
+
+
+@pytest.mark.parametrize("first, second", [(600, 10), (10, 40), (30, 7)])
+def test_resume_with_a_different_max_results(gmail, first, second):
+    page = list_page(first)
+    resumed = list_page(second, page["cursor"])
+
+    ids = [email["id"] for email in page["emails"] + resumed["emails"]]
+    assert ids == [f"m{index:04d}" for index in range(first + second)]
+
+
+def test_stopping_early_fetches_one_batch(gmail):
+    first = list_page(600)
+    gmail.round_trips.clear()
+
+    list_page(10, first["cursor"])
+
+    # The listing keeps the cursor's 500-message pages, but only one batch of metadata is read
+    assert gmail.list_calls[-1]["maxResults"] == ["500"]
+    assert len(gmail.round_trips) == 2
+
+
+def test_cursor_is_none_when_exhausted(gmail):
+    del gmail.messages[650:]
+    page = list_page(600)
+    rest = list_page(600, page["cursor"])
+
+    assert len(rest["emails"]) == 50
+    assert rest["cursor"] is None
+
+
+@pytest.fixture
+def small_gmail(monkeypatch, unthrottled):
+    fake = FakeGmail(60)
+    service = fake.service()
+    monkeypatch.setattr(mail, "gmail_service", lambda scopes: service)
+    yield fake
+    fake.close()
+
+
+def list_unread(tool, q, label_ids=()):
+    return emails(tool.list_unread_emails(
+        {"values": {"userId": "someone@example.com", "q": q, "labelIds": list(label_ids), "maxResults": 10}}
+    ))
+
+
+def test_store_is_not_synced_for_queries_it_cannot_answer(small_gmail, tmp_path):
+    tool = mail.GmailTool(metadata_store=mail.GmailMetadataStore(str(tmp_path / "store.db")))
+
+    assert len(list_unread(tool, "is:unread", ["INBOX"])) == 10
+    assert not any(path.endswith(("/profile", "/history")) for _, path in small_gmail.round_trips)
+
+
+def test_store_answers_queries_it_covers(small_gmail, tmp_path):
+    tool = mail.GmailTool(metadata_store=mail.GmailMetadataStore(str(tmp_path / "store.db")))
+    list_unread(tool, "is:unread newer_than:2d")
+    small_gmail.round_trips.clear()
+
+    result = list_unread(tool, "is:unread newer_than:2d", ["INBOX"])
+
+    assert [email["id"] for email in result] == [f"m{index:04d}" for index in range(10)]
+    # Only the history delta is read, the listing comes from the store
+    assert [path for _, path in small_gmail.round_trips] == ["/gmail/v1/users/someone%40example.com/history"]
+
+
+def test_store_label_filters_are_not_wildcards(tmp_path):
+    store = mail.GmailMetadataStore(str(tmp_path / "store.db"))
+    message = {"payload": {"headers": []}, "internalDate": "2000000000000"}
+    with store._conn:
+        store._upsert("me", [
+            {**message, "id": "exact", "labelIds": ["Label_1"]},
+            {**message, "id": "wildcard", "labelIds": ["LabelX1"]},
+            {**message, "id": "percent", "labelIds": ["Label%1"]},
+        ])
+    store._set_state("me", "1", 0)
+
+    assert [email["id"] for email in store.query("me", "newer_than:1d", ["Label_1"])] == ["exact"]
+    assert [email["id"] for email in store.query("me", "newer_than:1d", ["Label%1"])] == ["percent"]
@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+
+from google.oauth2.credentials import Credentials
+
+from helpers import load_tool
+
+oauth = load_tool("google_oauth")
+
+
+def credentials(token, expires_in):
+    return Credentials(token=token, expiry=datetime.utcnow() + expires_in)
+
+
+def make_store(tmp_path, users):
+    store = oauth.TokenStore(str(tmp_path), refresh_interval=3600)
+    for email, creds in users:
+        store.save(email, creds)
+    return store
+
+
+def test_get_without_email_skips_users_whose_tokens_are_unusable(tmp_path):
+    # The first user's token has expired and has no refresh token, so it can't be used
+    store = make_store(tmp_path, [
+        ("expired@example.com", credentials("old", timedelta(hours=-1))),
+        ("valid@example.com", credentials("new", timedelta(hours=1))),
+    ])
+
+    try:
+        assert store.get().token == "new"
+        assert store.get("valid@example.com").token == "new"
+        assert store.get("expired@example.com") is None
+    finally:
+        store.stop()
+
+
+def test_get_without_email_returns_none_when_no_user_has_valid_tokens(tmp_path):
+    store = make_store(tmp_path, [("expired@example.com", credentials("old", timedelta(hours=-1)))])
+
+    try:
+        assert store.get() is None
+        assert store.get("unknown@example.com") is None
+    finally:
+        store.stop()
@@ -0,0 +1,106 @@
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from helpers import FakeTransport, load_tool
+
+mail = load_tool("google_mail")
+cal = load_tool("google_cal")
+
+
+class FakeRequest:
+    """Stands in for a googleapiclient HttpRequest that answers with statuses in turn."""
+
+    http = None
+
+    def __init__(self, method, method_id, statuses=(200,)):
+        self.method = method
+        self.methodId = method_id
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def execute(self):
+        self.calls += 1
+        status = self.statuses.pop(0)
+        if status != 200:
+            raise HttpError(httplib2.Response({"status": status}), b"")
+        return {"status": status}
+
+
+class FakeBatch:
+    def __init__(self, callback):
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request.execute(), None)
+            except HttpError as e:
+                self.callback(request_id, None, e)
+
+
+class FakeService:
+    def new_batch_http_request(self, callback):
+        return FakeBatch(callback)
+
+
+@pytest.fixture
+def limiter():
+    return mail.RateLimiter(base_delay=0, max_delay=0, transport=FakeTransport())
+
+
+def test_reads_are_retried_on_5xx(limiter):
+    request = FakeRequest("GET", "gmail.users.messages.get", [503, 200])
+
+    assert limiter.execute(request) == {"status": 200}
+    assert request.calls == 2
+
+
+@pytest.mark.parametrize("method_id", ["gmail.users.drafts.send", "gmail.users.drafts.create"])
+def test_writes_are_not_retried_on_5xx(limiter, method_id):
+    request = FakeRequest("POST", method_id, [503, 200])
+
+    with pytest.raises(HttpError):
+        limiter.execute(request)
+    assert request.calls == 1
+
+
+def test_writes_are_retried_on_429(limiter):
+    request = FakeRequest("POST", "gmail.users.drafts.send", [429, 200])
+
+    assert limiter.execute(request) == {"status": 200}
+    assert request.calls == 2
+
+
+def test_batch_retries_only_idempotent_items_on_5xx(limiter):
+    requests = {
+        "get": FakeRequest("GET", "gmail.users.messages.get", [500, 200]),
+        "send": FakeRequest("POST", "gmail.users.drafts.send", [500, 200]),
+        "throttled": FakeRequest("POST", "gmail.users.drafts.send", [429, 200]),
+    }
+    results = {}
+    limiter.execute_batch(FakeService(), requests, lambda request_id, response, e: results.update({request_id: e or response}))
+
+    assert results["get"] == {"status": 200}
+    assert isinstance(results["send"], HttpError) and requests["send"].calls == 1
+    assert results["throttled"] == {"status": 200}
+
+
+def test_batches_are_charged_in_quota_units(limiter):
+    requests = {str(i): FakeRequest("GET", "gmail.users.messages.get") for i in range(100)}
+    limiter.execute_batch(FakeService(), requests, lambda *args: None)
+
+    # 100 gets cost 500 units against Gmail's 250 units a second, about a second of pacing
+    metrics = limiter.metrics()["gmail:default"]
+    assert metrics["quota_units"] == 500
+    assert metrics["throttled_seconds"] == pytest.approx(1.0, abs=0.05)
+
+
+def test_free_busy_queries_are_retried_on_5xx():
+    request = FakeRequest("POST", "calendar.freebusy.query", [502, 200])
+
+    assert cal.RateLimiter(base_delay=0, max_delay=0, transport=FakeTransport()).execute(request) == {"status": 200}
@@ -0,0 +1,78 @@
+import base64
+import json
+
+import numpy
+import pytest
+
+from helpers import load_tool
+
+tool = load_tool("random-number-generator")
+
+
+@pytest.fixture(scope="module")
+def rng():
+    return tool.RandomNumberGenerator()
+
+
+def generate_bulk(rng, **values):
+    return json.loads(rng.generate_bulk({"values": {"count": 5, "distribution": "uniform", **values}}).to_text())
+
+
+def test_a_seed_reproduces_the_same_values(rng):
+    first = generate_bulk(rng, seed=42)
+
+    assert generate_bulk(rng, seed=42) == first
+    assert generate_bulk(tool.RandomNumberGenerator(), seed=42) == first
+    assert generate_bulk(rng, seed=43) != first
+
+
+def test_a_seed_restarts_a_session(rng):
+    first = generate_bulk(rng, session="seeded", seed=7)
+    second = generate_bulk(rng, session="seeded")
+
+    assert second != first
+    assert generate_bulk(rng, session="seeded", seed=7) == first
+    assert generate_bulk(rng, session="seeded") == second
+
+
+def test_sessions_draw_independent_streams():
+    alone = tool.RandomNumberGenerator(sessions=tool.GeneratorSessions(seed=1))
+    interleaved = tool.RandomNumberGenerator(sessions=tool.GeneratorSessions(seed=1))
+
+    expected = [generate_bulk(alone, session="a") for _ in range(2)]
+    first = generate_bulk(interleaved, session="a")
+    other = generate_bulk(interleaved, session="b")
+    second = generate_bulk(interleaved, session="a")
+
+    # Draws from session b neither repeat session a's values nor move its stream along
+    assert [first, second] == expected
+    assert other not in expected
+
+
+@pytest.mark.parametrize("distribution, extra, dtype", [
+    ("uniform", {}, "<f8"),
+    ("normal", {"mean": 10, "std": 2}, "<f8"),
+    ("integers", {"low": -5, "high": 5}, "<i8"),
+])
+def test_base64_encodes_the_little_endian_array(rng, distribution, extra, dtype):
+    values = {"distribution": distribution, "seed": 3, "count": 100, **extra}
+    encoded = generate_bulk(rng, encoding="base64", **values)
+
+    assert encoded["encoding"] == "base64" and encoded["dtype"] == dtype and encoded["count"] == 100
+    decoded = numpy.frombuffer(base64.b64decode(encoded["data"]), dtype=encoded["dtype"])
+    assert decoded.tolist() == generate_bulk(rng, **values)["values"]
+
+
+def test_samples_are_drawn_without_replacement(rng):
+    population = ["a", "b", "c", "d", "e", "f"]
+    sample = generate_bulk(rng, distribution="sample", population=population, count=6)["values"]
+    numbers = generate_bulk(rng, distribution="sample", low=10, high=20, count=10)["values"]
+
+    assert sorted(sample) == population
+    assert sorted(numbers) == list(range(10, 20))
+
+
+def test_count_is_bounded(rng):
+    result = rng.generate_bulk({"values": {"count": tool.MAX_BULK_COUNT + 1, "distribution": "uniform"}})
+
+    assert isinstance(result, tool.ErrorArtifact)
@@ -0,0 +1,94 @@
+import json
+import time
+
+from helpers import load_tool
+
+tool = load_tool("web-research")
+
+
+class FakeSearchDriver(tool.BaseWebSearchDriver):
+    def __init__(self, urls):
+        self.urls = urls
+
+    def search(self, query, **kwargs):
+        return tool.ListArtifact(
+            [tool.TextArtifact(json.dumps({"title": url, "url": url, "description": ""})) for url in self.urls]
+        )
+
+
+def search_and_read(research_tool):
+    artifacts = research_tool.search_and_read({"values": {"query": "q"}})
+    return [json.loads(artifact.value) for artifact in artifacts.value]
+
+
+def test_reads_pages_without_header_charset(http_server):
+    http_server.routes["/html"] = (
+        200, {"Content-Type": "text/html"}, "<html><body><p>Café naïve — résumé</p></body></html>".encode()
+    )
+    http_server.routes["/text"] = (200, {"Content-Type": "text/plain"}, "Crème brûlée".encode())
+    research_tool = tool.WebResearchTool(
+        web_search_driver=FakeSearchDriver([http_server.url + "/html", http_server.url + "/text"])
+    )
+
+    html, text = search_and_read(research_tool)
+
+    assert "Café naïve — résumé" in html["content"]
+    assert text["content"] == "Crème brûlée"
+
+
+def test_errors_and_deadline_are_per_result(http_server):
+    http_server.routes["/slow"] = (200, {"Content-Type": "text/plain"}, [2.0, b"late"])
+    http_server.routes["/fast"] = (200, {"Content-Type": "text/plain"}, b"x" * 5000)
+    research_tool = tool.WebResearchTool(
+        web_search_driver=FakeSearchDriver([http_server.url + p for p in ("/slow", "/missing", "/fast", "/unread")]),
+        deadline=1,
+        max_page_bytes=1000,
+        max_page_chars=100,
+    )
+
+    slow, missing, fast, unread = search_and_read(research_tool)
+
+    assert "timed out" in slow["error"]
+    assert "404" in missing["error"]
+    assert fast["content"] == "x" * 100
+    assert "content" not in unread and "error" not in unread
+
+
+class TrackedResearchTool(tool.WebResearchTool):
+    """Records when each page read returns, that is when its worker thread is free again."""
+
+    finished = []
+
+    def _read(self, url, deadline_at):
+        try:
+            return super()._read(url, deadline_at)
+        finally:
+            self.finished.append(time.monotonic())
+
+
+def test_timed_out_downloads_release_their_worker(http_server):
+    http_server.routes["/slow"] = (200, {"Content-Type": "text/plain"}, [b"x", 0.2] * 30)
+    TrackedResearchTool.finished = []
+    research_tool = TrackedResearchTool(web_search_driver=FakeSearchDriver([http_server.url + "/slow"]), deadline=1)
+
+    [slow] = search_and_read(research_tool)
+    returned = time.monotonic()
+    time.sleep(0.5)
+
+    assert "timed out" in slow["error"]
+    # The download stopped at the deadline instead of trickling on for six seconds
+    assert len(TrackedResearchTool.finished) == 1
+    assert TrackedResearchTool.finished[0] - returned < 0.5
+
+
+def test_slow_pages_are_cut_at_the_page_budget(http_server):
+    http_server.routes["/slow"] = (200, {"Content-Type": "text/plain"}, [b"x", 0.2] * 30)
+    research_tool = tool.WebResearchTool(
+        web_search_driver=FakeSearchDriver([http_server.url + "/slow"]), deadline=10, max_page_seconds=0.5
+    )
+    started = time.monotonic()
+
+    [slow] = search_and_read(research_tool)
+
+    assert set(slow["content"]) == {"x"} and len(slow["content"]) < 10
+    assert time.monotonic() - started < 1.5
@@ -0,0 +1,263 @@
+import gzip
+import os
+import time
+
+import pytest
+
+from helpers import load_tool
+
+tool = load_tool("web-scraper")
+
+PAGE = "<html><head><title>t</title></head><body><p>Café naïve — résumé</p></body></html>"
+
+
+@pytest.fixture
+def driver():
+    return tool.StreamingWebScraperDriver(web_scraper_driver=tool.TrafilaturaWebScraperDriver())
+
+
+def test_utf8_page_without_header_charset(http_server, driver):
+    http_server.routes["/"] = (200, {"Content-Type": "text/html"}, PAGE.encode())
+
+    assert "Café naïve — résumé" in driver.fetch_url(http_server.url + "/")
+
+
+def test_meta_charset_without_header_charset(http_server, driver):
+    page = PAGE.replace("<head>", '<head><meta charset="windows-1252">').replace("—", "-")
+    http_server.routes["/"] = (200, {"Content-Type": "text/html"}, page.encode("cp1252"))
+
+    assert "Café naïve - résumé" in driver.fetch_url(http_server.url + "/")
+
+
+def test_header_charset_wins(http_server, driver):
+    page = PAGE.replace("<head>", '<head><meta charset="utf-8">').replace("—", "-")
+    http_server.routes["/"] = (200, {"Content-Type": "text/html; charset=iso-8859-1"}, page.encode("latin-1"))
+
+    assert "Café naïve - résumé" in driver.fetch_url(http_server.url + "/")
+
+
+def test_character_split_across_chunks(http_server, driver):
+    body = ("x" * (tool.SNIFF_BYTES - 1) + "é" * 10).encode()
+    http_server.routes["/"] = (200, {"Content-Type": "text/plain"}, body)
+
+    assert driver.fetch_url(http_server.url + "/").endswith("é" * 10)
+
+
+def test_sends_trafilatura_user_agent(http_server, driver):
+    http_server.routes["/"] = (200, {"Content-Type": "text/html"}, PAGE.encode())
+    driver.fetch_url(http_server.url + "/")
+
+    assert http_server.requests[0][1]["User-Agent"].startswith("trafilatura/")
+
+
+class PassThroughDriver(tool.BaseWebScraperDriver):
+    def fetch_url(self, url):
+        raise NotImplementedError
+
+    def extract_page(self, page):
+        return tool.TextArtifact(page)
+
+
+class LineChunker:
+    def chunk(self, artifact):
+        if "bad" in artifact.value:
+            raise ValueError("can't chunk")
+        return [tool.TextArtifact(line) for line in artifact.value.splitlines()]
+
+
+def concurrent_tool(**kwargs):
+    driver = tool.StreamingWebScraperDriver(web_scraper_driver=PassThroughDriver())
+    return tool.ConcurrentWebScraperTool(
+        web_loader=tool.WebLoader(web_scraper_driver=driver), text_chunker=LineChunker(), **kwargs
+    )
+
+
+def test_timed_out_downloads_stop_at_the_deadline(http_server):
+    http_server.routes["/slow"] = (200, {"Content-Type": "text/plain"}, [b"x", 0.2] * 30)
+    http_server.routes["/fast"] = (200, {"Content-Type": "text/plain"}, b"fast")
+    scraper = concurrent_tool(per_host_limit=1, deadline=1)
+
+    [timed_out] = scraper.get_contents({"values": {"urls": [http_server.url + "/slow"]}}).value
+    started = time.monotonic()
+    [fast] = scraper.get_contents({"values": {"urls": [http_server.url + "/fast"]}}).value
+
+    assert "timed out" in timed_out.value
+    # The slow download gave up the host's only slot at the deadline instead of running on
+    assert fast.value.endswith("fast")
+    assert time.monotonic() - started < 0.5
+
+
+def test_chunking_errors_are_per_url(http_server):
+    http_server.routes["/good"] = (200, {"Content-Type": "text/plain"}, b"one\ntwo")
+    http_server.routes["/bad"] = (200, {"Content-Type": "text/plain"}, b"bad")
+    scraper = concurrent_tool()
+
+    artifacts = scraper.get_contents({"values": {"urls": [http_server.url + "/good", http_server.url + "/bad"]}}).value
+
+    assert [artifact.value.split("\n\n")[-1] for artifact in artifacts[:2]] == ["one", "two"]
+    assert isinstance(artifacts[2], tool.ErrorArtifact) and "can't chunk" in artifacts[2].value
+
+
+def test_compressed_pages_are_decoded(http_server, driver):
+    http_server.routes["/"] = (200, {"Content-Type": "text/html", "Content-Encoding": "gzip"}, gzip.compress(PAGE.encode()))
+
+    assert "Café naïve — résumé" in driver.fetch_url(http_server.url + "/")
+
+
+def caching_driver(tmp_path, max_bytes, **kwargs):
+    return tool.CachingWebScraperDriver(
+        web_scraper_driver=tool.StreamingWebScraperDriver(web_scraper_driver=PassThroughDriver(), max_bytes=max_bytes),
+        cache=tool.DiskCache(str(tmp_path), 1024 * 1024),
+        **kwargs,
+    )
+
+
+def test_complete_pages_are_cached(http_server, tmp_path):
+    http_server.routes["/"] = (200, {"Content-Type": "text/plain"}, b"x" * 100)
+    driver = caching_driver(tmp_path, max_bytes=1000)
+
+    assert driver.fetch_url(http_server.url + "/") == driver.fetch_url(http_server.url + "/") == "x" * 100
+    assert len(http_server.requests) == 1
+
+
+def test_truncated_pages_are_not_cached(http_server, tmp_path):
+    http_server.routes["/"] = (200, {"Content-Type": "text/plain"}, b"x" * 100)
+    driver = caching_driver(tmp_path, max_bytes=10)
+
+    assert driver.fetch_url(http_server.url + "/") == driver.fetch_url(http_server.url + "/") == "x" * 10
+    assert len(http_server.requests) == 2
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tool.time, "time", lambda: now[0])
+    return now
+
+
+def test_stale_pages_are_revalidated(http_server, tmp_path, clock):
+    validators = {"ETag": '"v1"', "Last-Modified": "Wed, 20 Mar 2024 10:00:00 GMT"}
+    http_server.routes["/"] = (200, {"Content-Type": "text/plain", **validators}, b"first")
+    driver = caching_driver(tmp_path, max_bytes=1000, default_ttl=60)
+    url = http_server.url + "/"
+
+    assert driver.fetch_url(url) == "first"
+    clock[0] += 30
+    assert driver.fetch_url(url) == "first"
+    assert len(http_server.requests) == 1
+
+    # Past the TTL the page is revalidated, and a 304 keeps the cached body for another TTL
+    http_server.routes["/"] = (304, {}, b"")
+    clock[0] += 60
+    assert driver.fetch_url(url) == "first"
+    headers = http_server.requests[1][1]
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == validators["Last-Modified"]
+    clock[0] += 30
+    assert driver.fetch_url(url) == "first"
+    assert len(http_server.requests) == 2
+
+    http_server.routes["/"] = (200, {"Content-Type": "text/plain", "ETag": '"v2"'}, b"second")
+    clock[0] += 60
+    assert driver.fetch_url(url) == "second"
+
+
+def test_domain_ttls_override_the_default(http_server, tmp_path):
+    driver = caching_driver(tmp_path, max_bytes=1000, default_ttl=3600, domain_ttls={"example.com": 5, "127.0.0.1": 0})
+
+    assert driver.ttl("https://example.com/a") == driver.ttl("https://docs.Example.com/a") == 5
+    assert driver.ttl("https://notexample.com/a") == 3600
+
+    # A TTL of 0 sends every fetch back to the server
+    http_server.routes["/"] = (200, {"Content-Type": "text/plain"}, b"page")
+    driver.fetch_url(http_server.url + "/")
+    driver.fetch_url(http_server.url + "/")
+    assert len(http_server.requests) == 2
+
+
+def test_disk_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = tool.DiskCache(str(tmp_path), max_bytes=300)
+    for mtime, key in enumerate("abc", start=1):
+        cache.put(key, key.encode() * 100)
+        os.utime(cache._path(key), (mtime, mtime))
+
+    assert cache.get("a") == b"a" * 100
+    cache.put("d", b"d" * 100)
+
+    # b and c are the least recently used, and evicting both brings the cache under 90% of its limit
+    assert cache.get("b") is None and cache.get("c") is None
+    assert cache.get("a") == b"a" * 100 and cache.get("d") == b"d" * 100
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(cache._path("a")), os.path.basename(cache._path("d"))])
+
+
+def test_words_split_at_a_space_between_reads_stay_apart():
+    extractor = tool.HTMLTextExtractor()
+    text = ""
+    for data in ["<p>hello ", "world and ", "more</p><p>next", " para</p>"]:
+        extractor.feed(data)
+        text += extractor.take()
+    extractor.close()
+
+    assert text + extractor.take() == "\nhello world and more\n\nnext para\n"
+
+
+def paging_tool(page_chars, idle_timeout=60, max_seconds=tool.DEFAULT_MAX_PAGE_SECONDS):
+    driver = tool.StreamingWebScraperDriver(web_scraper_driver=PassThroughDriver(), max_seconds=max_seconds)
+    streams = tool.PageStreams(driver, page_chars, max_streams=4, idle_timeout=idle_timeout)
+    scraper = concurrent_tool(page_streams=streams)
+    return scraper, streams
+
+
+def get_page(scraper, url, page):
+    return scraper.get_content_page({"values": {"url": url, "page": page}})
+
+
+def test_pages_continue_one_download(http_server):
+    body = [b"<html><body><p>one two ", 0.05, b"three four</p><p>five six</p></body></html>"]
+    http_server.routes["/"] = (200, {"Content-Type": "text/html"}, body)
+    scraper, streams = paging_tool(page_chars=10)
+
+    try:
+        pages = [get_page(scraper, http_server.url + "/", page).value for page in range(3)]
+        past_the_end = get_page(scraper, http_server.url + "/", 3)
+        first_again = get_page(scraper, http_server.url + "/", 0).value
+    finally:
+        streams.stop()
+
+    assert [(page["content"], page["has_more"]) for page in pages] == [
+        ("one two", True), ("three four", True), ("five six", False),
+    ]
+    assert isinstance(past_the_end, tool.ErrorArtifact)
+    assert first_again["content"] == "one two"
+    assert len(http_server.requests) == 1
+
+
+def test_time_between_pages_does_not_count_against_the_budget(http_server):
+    lines = [f"line {index}\n".encode() for index in range(5000)]
+    http_server.routes["/"] = (200, {"Content-Type": "text/plain"}, lines)
+    scraper, streams = paging_tool(page_chars=20000, max_seconds=0.3)
+
+    try:
+        pages = [get_page(scraper, http_server.url + "/", 0).value]
+        time.sleep(0.5)
+        while pages[-1]["has_more"]:
+            pages.append(get_page(scraper, http_server.url + "/", len(pages)).value)
+    finally:
+        streams.stop()
+
+    assert "\n".join(page["content"] for page in pages).split("\n")[-1] == "line 4999"
+
+
+def test_idle_streams_are_closed(http_server):
+    http_server.routes["/"] = (200, {"Content-Type": "text/plain"}, [b"one two three four five six ", 1, b"seven"])
+    scraper, streams = paging_tool(page_chars=10, idle_timeout=0.2)
+
+    try:
+        assert get_page(scraper, http_server.url + "/", 0).value["content"] == "one two"
+        time.sleep(0.5)
+        assert not streams._streams
+        assert get_page(scraper, http_server.url + "/", 1).value["content"] == "three four"
+    finally:
+        streams.stop()
+
+    assert len(http_server.requests) == 2
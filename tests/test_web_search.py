@@ -0,0 +1,149 @@
+import json
+import time
+
+import pytest
+
+from helpers import load_tool
+
+tool = load_tool("web-search")
+
+
+class FakeSearchDriver(tool.BaseWebSearchDriver):
+    def __init__(self, urls, delay=0.0, error=None):
+        self.urls = urls
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.results_count = 5
+
+    def search(self, query, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise Exception(self.error)
+        return tool.ListArtifact(
+            [tool.TextArtifact(json.dumps({"title": url, "url": url, "description": ""})) for url in self.urls]
+        )
+
+
+def urls(artifacts):
+    return [json.loads(artifact.value)["url"] for artifact in artifacts.value]
+
+
+def test_merge_queries_every_provider_when_the_primary_is_fast():
+    primary = FakeSearchDriver(["https://a.com", "https://b.com"])
+    secondary = FakeSearchDriver(["https://www.b.com/", "https://c.com"], delay=0.2)
+    driver = tool.FanOutWebSearchDriver(
+        web_search_drivers=[primary, secondary], mode="merge", hedge_delay=1.0, results_count=5
+    )
+
+    # b.com is ranked by both providers, so reciprocal rank fusion puts it first
+    assert urls(driver.search("q")) == ["https://b.com", "https://a.com", "https://c.com"]
+    assert secondary.calls == 1
+
+
+def test_first_holds_back_secondaries_while_the_primary_is_fast():
+    primary = FakeSearchDriver(["https://a.com"])
+    secondary = FakeSearchDriver(["https://c.com"])
+    driver = tool.FanOutWebSearchDriver(web_search_drivers=[primary, secondary], mode="first", hedge_delay=1.0)
+
+    assert urls(driver.search("q")) == ["https://a.com"]
+    assert secondary.calls == 0
+
+
+def test_first_hedges_a_slow_primary():
+    primary = FakeSearchDriver(["https://a.com"], delay=1.0)
+    secondary = FakeSearchDriver(["https://c.com"])
+    driver = tool.FanOutWebSearchDriver(web_search_drivers=[primary, secondary], mode="first", hedge_delay=0.1)
+
+    assert urls(driver.search("q")) == ["https://c.com"]
+
+
+def test_every_provider_failed():
+    driver = tool.FanOutWebSearchDriver(
+        web_search_drivers=[FakeSearchDriver([], error="down"), FakeSearchDriver([], error="down")],
+        mode="merge",
+    )
+
+    with pytest.raises(Exception, match="every provider failed"):
+        driver.search("q")
+
+
+@pytest.mark.parametrize(
+    "query, normalized",
+    [
+        ("What is the  capital of France?", "what is the capital of france"),
+        ("to be or not to be", "to be or not to be"),
+        ('"exact phrase" -python site:example.com', '"exact phrase" -python site:example.com'),
+        ("node.js, c++ and c#!", "node.js c++ and c#"),
+    ],
+)
+def test_normalize_query(query, normalized):
+    assert tool.normalize_query(query) == normalized
+
+
+def test_queries_that_mean_different_things_have_different_keys():
+    driver = tool.CachingWebSearchDriver(web_search_driver=FakeSearchDriver(["https://a.com"]))
+
+    assert driver._key("flights from paris to london", {}) != driver._key("flights to paris from london", {})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tool.time, "time", lambda: now[0])
+    return now
+
+
+def test_cached_results_expire_after_the_ttl(clock):
+    inner = FakeSearchDriver(["https://a.com"])
+    driver = tool.CachingWebSearchDriver(web_search_driver=inner, ttl=60)
+
+    assert urls(driver.search("Python?")) == urls(driver.search("python")) == ["https://a.com"]
+    assert inner.calls == 1
+
+    clock[0] += 60
+    driver.search("python")
+    assert inner.calls == 2
+
+
+def test_least_recently_used_results_are_evicted():
+    inner = FakeSearchDriver(["https://a.com"])
+    driver = tool.CachingWebSearchDriver(web_search_driver=inner, max_entries=2)
+
+    for query in ["one", "two", "one", "three"]:
+        driver.search(query)
+    assert inner.calls == 3
+
+    driver.search("one")
+    assert inner.calls == 3
+    driver.search("two")
+    assert inner.calls == 4
+
+
+def test_results_on_disk_are_shared_and_expire(tmp_path, clock):
+    inner = FakeSearchDriver(["https://a.com"])
+    tool.CachingWebSearchDriver(web_search_driver=inner, ttl=60, cache_dir=str(tmp_path)).search("python")
+
+    # A second worker, or the same one after a restart, finds the results on disk
+    restarted = tool.CachingWebSearchDriver(web_search_driver=inner, ttl=60, cache_dir=str(tmp_path))
+    assert urls(restarted.search("python")) == ["https://a.com"]
+    assert inner.calls == 1
+
+    clock[0] += 60
+    restarted = tool.CachingWebSearchDriver(web_search_driver=inner, ttl=60, cache_dir=str(tmp_path))
+    restarted.search("python")
+    assert inner.calls == 2
+
+
+def test_failed_searches_are_not_cached(tmp_path):
+    inner = FakeSearchDriver(["https://a.com"], error="down")
+    driver = tool.CachingWebSearchDriver(web_search_driver=inner, cache_dir=str(tmp_path))
+
+    with pytest.raises(Exception, match="down"):
+        driver.search("python")
+    assert not list(tmp_path.iterdir())
+
+    inner.error = None
+    assert urls(driver.search("python")) == ["https://a.com"]
+    assert inner.calls == 2
@@ -0,0 +1,212 @@
+import codecs
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from email.message import Message
+
+import requests
+from attrs import Factory, define, field
+from schema import Literal, Optional as OptionalKey, Schema
+
+from griptape.artifacts import ErrorArtifact, ListArtifact, TextArtifact
+from griptape.tools import BaseTool
+from griptape.utils.decorators import activity
+from griptape.drivers import (
+    BaseWebScraperDriver,
+    BaseWebSearchDriver,
+    DuckDuckGoWebSearchDriver,
+    TavilyWebSearchDriver,
+    ExaWebSearchDriver,
+    TrafilaturaWebScraperDriver,
+)
+
+DEFAULT_PREFETCH_COUNT = 3
+DEFAULT_MAX_PAGE_KB = 1024
+DEFAULT_MAX_PAGE_CHARS = 8000
+DEFAULT_DEADLINE = 30
+DEFAULT_MAX_PAGE_SECONDS = 10
+READ_CHUNK_BYTES = 16 * 1024
+# How much of a page is looked at to work out its encoding
+SNIFF_BYTES = 4096
+META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+BOMS = [(codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16")]
+
+
+def sniff_encoding(content_type: str, head: bytes) -> str:
+    """Returns the encoding of a page served as content_type whose body starts with head.
+
+    A charset in the Content-Type header wins, then a byte order mark, then a <meta charset>
+    near the top of the page. Failing those, the page is read as UTF-8 if head is valid
+    UTF-8 and otherwise as whatever charset_normalizer guesses. requests' own fallback of
+    ISO-8859-1 for text/* without a charset is never used, as it garbles UTF-8 pages.
+    """
+    header = Message()
+    header["Content-Type"] = content_type or ""
+    candidates = [header.get_param("charset")]
+    candidates += [encoding for bom, encoding in BOMS if head.startswith(bom)]
+    if (match := META_CHARSET.search(head)) is not None:
+        candidates.append(match.group(1).decode("ascii"))
+
+    for candidate in filter(None, candidates):
+        try:
+            return codecs.lookup(candidate).name
+        except LookupError:
+            pass
+
+    try:
+        # Not final, so a character cut in two at the end of head doesn't count against UTF-8
+        codecs.getincrementaldecoder("utf-8")().decode(head)
+        return "utf-8"
+    except UnicodeDecodeError:
+        from charset_normalizer import from_bytes
+
+        guess = from_bytes(head).best()
+        return guess.encoding if guess is not None else "utf-8"
+
+
+@define
+class WebResearchTool(BaseTool):
+    """Searches the web and reads the top results in one activity call.
+
+    The top prefetch_count result pages are downloaded concurrently as soon as the search
+    returns. Each download stops after max_page_bytes or max_page_seconds, keeping what has
+    arrived, and the extracted text is cut to max_page_chars. Pages still loading at the
+    deadline are returned without content, and their downloads stop then too, so they
+    don't hold a worker into later calls.
+    """
+
+    web_search_driver: BaseWebSearchDriver = field(kw_only=True)
+    web_scraper_driver: BaseWebScraperDriver = field(default=Factory(TrafilaturaWebScraperDriver), kw_only=True)
+    prefetch_count: int = field(default=DEFAULT_PREFETCH_COUNT, kw_only=True)
+    max_page_bytes: int = field(default=DEFAULT_MAX_PAGE_KB * 1024, kw_only=True)
+    max_page_chars: int = field(default=DEFAULT_MAX_PAGE_CHARS, kw_only=True)
+    deadline: float = field(default=DEFAULT_DEADLINE, kw_only=True)
+    max_page_seconds: float = field(default=DEFAULT_MAX_PAGE_SECONDS, kw_only=True)
+    session: requests.Session = field(default=Factory(requests.Session), kw_only=True)
+    _executor: ThreadPoolExecutor = field(
+        default=Factory(lambda self: ThreadPoolExecutor(max(1, self.prefetch_count) * 2), takes_self=True),
+        init=False,
+    )
+
+    @activity(
+        config={
+            "description": "Can be used to search the web and read the top results in one step. Returns each "
+            "result's title, URL and description, plus the extracted text of the top pages",
+            "schema": Schema(
+                {
+                    Literal(
+                        "query",
+                        description="Search engine request that returns a list of pages with titles, descriptions, and URLs",
+                    ): str,
+                    OptionalKey(
+                        Literal("prefetch_count", description="Number of top results to read (defaults to 3)")
+                    ): int,
+                }
+            ),
+        },
+    )
+    def search_and_read(self, params: dict) -> ListArtifact | ErrorArtifact:
+        query = params["values"]["query"]
+        prefetch_count = params["values"].get("prefetch_count", self.prefetch_count)
+        started = time.monotonic()
+
+        try:
+            results = [json.loads(artifact.value) for artifact in self.web_search_driver.search(query).value]
+        except Exception as e:
+            return ErrorArtifact(f"Error searching '{query}' with {self.web_search_driver.__class__.__name__}: {e}")
+
+        deadline_at = started + self.deadline
+        futures = {
+            index: self._executor.submit(self._read, result["url"], deadline_at)
+            for index, result in enumerate(results[:prefetch_count])
+            if result.get("url")
+        }
+        wait(futures.values(), timeout=max(0.0, deadline_at - time.monotonic()))
+
+        for index, future in futures.items():
+            if not future.done():
+                future.cancel()
+                results[index]["error"] = f"timed out after {self.deadline}s"
+            elif future.exception() is not None:
+                results[index]["error"] = str(future.exception())
+            else:
+                results[index]["content"] = future.result()
+
+        return ListArtifact([TextArtifact(json.dumps(result)) for result in results])
+
+    def _read(self, url: str, deadline_at: float) -> str:
+        headers = {}
+        verify = True
+        if isinstance(self.web_scraper_driver, TrafilaturaWebScraperDriver):
+            from trafilatura.downloads import DEFAULT_HEADERS
+
+            # Send what trafilatura.fetch_url would, since some sites answer it differently
+            headers = dict(DEFAULT_HEADERS)
+            verify = not self.web_scraper_driver.no_ssl
+
+        stop_at = min(deadline_at, time.monotonic() + self.max_page_seconds)
+        if (remaining := stop_at - time.monotonic()) <= 0:
+            raise TimeoutError("deadline passed before the page was requested")
+
+        with self.session.get(url, headers=headers, verify=verify, stream=True, timeout=remaining) as response:
+            response.raise_for_status()
+            data = self._read_capped(response, stop_at, deadline_at)
+
+        content_type = response.headers.get("Content-Type", "html")
+        page = data.decode(sniff_encoding(content_type, data[:SNIFF_BYTES]), errors="replace")
+        if "html" in content_type:
+            text = self.web_scraper_driver.extract_page(page).value
+        else:
+            text = page
+
+        return text[: self.max_page_chars]
+
+    def _read_capped(self, response: requests.Response, stop_at: float, deadline_at: float) -> bytes:
+        """Reads the body until max_page_bytes have arrived or stop_at, so a huge or slow page
+        can't stall or bloat the call. Past deadline_at nobody is waiting for the page any more,
+        so it raises a TimeoutError instead.
+
+        The body is read with urllib3 2's read1, which returns whatever has arrived, as
+        iter_content would wait for a whole chunk and could run far past the deadline.
+        """
+        parts = []
+        received = 0
+        read1 = getattr(response.raw, "read1", None)
+        arrived = (
+            iter(lambda: read1(READ_CHUNK_BYTES, decode_content=True), b"")
+            if read1 is not None
+            else response.iter_content(READ_CHUNK_BYTES)
+        )
+
+        for data in arrived:
+            if time.monotonic() >= deadline_at:
+                raise TimeoutError("deadline passed while the page was downloading")
+            data = data[: self.max_page_bytes - received]
+            received += len(data)
+            parts.append(data)
+            if received >= self.max_page_bytes or time.monotonic() >= stop_at:
+                break
+
+        return b"".join(parts)
+
+
+def init_tool() -> WebResearchTool:
+    driver = DuckDuckGoWebSearchDriver()
+    # Check the environment variable to determine which driver to use
+    if os.getenv("TAVILY_API_KEY") is not None:
+        driver = TavilyWebSearchDriver(api_key=os.environ["TAVILY_API_KEY"])
+    elif os.getenv("EXA_API_KEY") is not None:
+        driver = ExaWebSearchDriver(api_key=os.environ["EXA_API_KEY"])
+
+    driver.results_count = int(os.getenv("WEBSEARCH_RESULTS_COUNT", 5))
+
+    return WebResearchTool(
+        web_search_driver=driver,
+        prefetch_count=int(os.getenv("WEB_RESEARCH_PREFETCH_COUNT", DEFAULT_PREFETCH_COUNT)),
+        max_page_bytes=int(os.getenv("WEB_RESEARCH_MAX_PAGE_KB", DEFAULT_MAX_PAGE_KB)) * 1024,
+        max_page_chars=int(os.getenv("WEB_RESEARCH_MAX_PAGE_CHARS", DEFAULT_MAX_PAGE_CHARS)),
+        deadline=float(os.getenv("WEB_RESEARCH_DEADLINE", DEFAULT_DEADLINE)),
+        max_page_seconds=float(os.getenv("WEB_RESEARCH_MAX_PAGE_SECONDS", DEFAULT_MAX_PAGE_SECONDS)),
+    )
@@ -1,14 +1,674 @@
+import codecs
+import contextvars
+import hashlib
+import json
 import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from email.message import Message
+from html.parser import HTMLParser
+from itertools import zip_longest
+from typing import Iterator, Optional
+from urllib.parse import urlparse
 
+import requests
+from attrs import Factory, define, field
+from schema import Literal, Optional as OptionalKey, Schema
+
+from griptape.artifacts import ErrorArtifact, JsonArtifact, ListArtifact, TextArtifact
+from griptape.utils.decorators import activity
 from griptape.tools import WebScraperTool
 from griptape.loaders import WebLoader
 from griptape.drivers import (
+    BaseWebScraperDriver,
     TrafilaturaWebScraperDriver,
     ProxyWebScraperDriver,
 )
 
+DEFAULT_CACHE_TTL = 3600
+DEFAULT_CACHE_MAX_MB = 256
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PER_HOST_LIMIT = 2
+DEFAULT_DEADLINE = 60
+DEFAULT_MAX_PAGE_MB = 5
+DEFAULT_MAX_PAGE_SECONDS = 120
+DEFAULT_PAGE_CHARS = 4000
+DEFAULT_OPEN_PAGE_STREAMS = 16
+DEFAULT_PAGE_STREAM_IDLE_SECONDS = 300
+READ_CHUNK_BYTES = 16 * 1024
+# How much of a page is looked at to work out its encoding
+SNIFF_BYTES = 4096
+META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+BOMS = [(codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16")]
+# Monotonic time at which page reads in the current context give up with a TimeoutError, set by
+# callers with a deadline of their own such as ConcurrentWebScraperTool.get_contents
+READ_DEADLINE = contextvars.ContextVar("read_deadline", default=None)
+
+
+def pooled_session(pool_size: int) -> requests.Session:
+    """Returns a session that keeps up to pool_size keep-alive connections per host."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def sniff_encoding(content_type: str, head: bytes) -> str:
+    """Returns the encoding of a page served as content_type whose body starts with head.
+
+    A charset in the Content-Type header wins, then a byte order mark, then a <meta charset>
+    near the top of the page. Failing those, the page is read as UTF-8 if head is valid
+    UTF-8 and otherwise as whatever charset_normalizer guesses. requests' own fallback of
+    ISO-8859-1 for text/* without a charset is never used, as it garbles UTF-8 pages.
+    """
+    header = Message()
+    header["Content-Type"] = content_type or ""
+    candidates = [header.get_param("charset")]
+    candidates += [encoding for bom, encoding in BOMS if head.startswith(bom)]
+    if (match := META_CHARSET.search(head)) is not None:
+        candidates.append(match.group(1).decode("ascii"))
+
+    for candidate in filter(None, candidates):
+        try:
+            return codecs.lookup(candidate).name
+        except LookupError:
+            pass
+
+    try:
+        # Not final, so a character cut in two at the end of head doesn't count against UTF-8
+        codecs.getincrementaldecoder("utf-8")().decode(head)
+        return "utf-8"
+    except UnicodeDecodeError:
+        from charset_normalizer import from_bytes
+
+        guess = from_bytes(head).best()
+        return guess.encoding if guess is not None else "utf-8"
+
+
+def parse_domain_ttls(spec: Optional[str]) -> dict:
+    """Parses WEB_SCRAPER_CACHE_TTLS, e.g. 'news.ycombinator.com=300,docs.python.org=86400'."""
+    ttls = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        domain, _, ttl = item.partition("=")
+        ttls[domain.strip().lower()] = int(ttl)
+    return ttls
+
+
+class DiskCache:
+    """Byte strings stored as files under directory, keyed by the hash of a string key.
+
+    Reads bump a file's mtime, and once the files exceed max_bytes the least recently
+    used ones are removed until the cache is back under 90% of the limit.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = sum(size for _, _, size in self._entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    def _entries(self) -> list:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+
+        with self._lock:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self._size += len(data) - previous
+
+            if self._size > self.max_bytes:
+                for _, entry_path, size in sorted(self._entries()):
+                    if self._size <= self.max_bytes * 0.9:
+                        break
+                    try:
+                        os.remove(entry_path)
+                        self._size -= size
+                    except FileNotFoundError:
+                        pass
+
+
+class HTMLTextExtractor(HTMLParser):
+    """Extracts readable text from HTML fed to it in pieces.
+
+    Text inside non-content elements (scripts, styles, ...) is dropped and block elements
+    become line breaks. take() returns the text extracted since the previous call, so text
+    can be handed on while the rest of the page is still downloading.
+    """
+
+    SKIPPED_TAGS = {"script", "style", "noscript", "head", "svg", "template", "iframe"}
+    BLOCK_TAGS = {
+        "p", "div", "br", "li", "ul", "ol", "tr", "table", "section", "article", "header",
+        "footer", "h1", "h2", "h3", "h4", "h5", "h6", "pre", "blockquote",
+    }
+
+    # A line break, a run of other whitespace, or a word
+    TOKENS = re.compile(r"\n|[^\S\n]+|\S+")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._skip_depth = 0
+        self._parts = []
+        # Whether a word has been written on the current line, and whether whitespace followed it
+        self._in_line = False
+        self._pending_space = False
+        # Line breaks written since the last word
+        self._line_breaks = 0
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self.SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in self.BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._parts.append(data)
+
+    def take(self) -> str:
+        """Returns the text extracted since the last call, with the whitespace of the HTML source
+        collapsed and at most one blank line in a row.
+
+        Whitespace at the end of one call's text is carried over to the next, so a word break
+        that falls between two reads isn't lost.
+        """
+        text = "".join(self._parts)
+        self._parts = []
+        out = []
+
+        for token in self.TOKENS.findall(text):
+            if token == "\n":
+                self._in_line = self._pending_space = False
+                if self._line_breaks < 2:
+                    out.append("\n")
+                    self._line_breaks += 1
+            elif token.isspace():
+                self._pending_space = self._in_line
+            else:
+                if self._pending_space:
+                    out.append(" ")
+                out.append(token)
+                self._in_line = True
+                self._pending_space = False
+                self._line_breaks = 0
+        return "".join(out)
+
+
+@define
+class StreamingWebScraperDriver(BaseWebScraperDriver):
+    """Fetches pages as a stream within a byte and time budget.
+
+    Pages are read through a shared keep-alive session, using the wrapped driver's proxies
+    and params when it has them (as ProxyWebScraperDriver does). Reading stops once
+    max_bytes have arrived or max_seconds have passed, so a huge or slow page can't hold
+    a worker or its memory. extract_page is left to the wrapped driver, while iter_text
+    extracts HTML incrementally and yields text as the page downloads.
+    """
+
+    web_scraper_driver: BaseWebScraperDriver = field(kw_only=True)
+    session: requests.Session = field(default=Factory(requests.Session), kw_only=True)
+    max_bytes: int = field(default=DEFAULT_MAX_PAGE_MB * 1024 * 1024, kw_only=True)
+    max_seconds: float = field(default=DEFAULT_MAX_PAGE_SECONDS, kw_only=True)
+
+    def open(self, url: str, headers: Optional[dict] = None) -> requests.Response:
+        params = dict(getattr(self.web_scraper_driver, "params", {}))
+        params.setdefault("timeout", self.max_seconds)
+        default_headers = {}
+
+        if (deadline := READ_DEADLINE.get()) is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("deadline passed before the page was requested")
+            params["timeout"] = min(params["timeout"], remaining)
+
+        if isinstance(self.web_scraper_driver, TrafilaturaWebScraperDriver):
+            from trafilatura.downloads import DEFAULT_HEADERS
+
+            # Send what trafilatura.fetch_url would, since some sites answer it differently
+            default_headers = dict(DEFAULT_HEADERS)
+            params.setdefault("verify", not self.web_scraper_driver.no_ssl)
+
+        return self.session.get(
+            url,
+            headers={**default_headers, **params.pop("headers", {}), **(headers or {})},
+            proxies=getattr(self.web_scraper_driver, "proxies", None),
+            stream=True,
+            **params,
+        )
+
+    def read(self, response: requests.Response) -> Iterator[str]:
+        """Yields the decoded body of response until it ends or the budget runs out.
+
+        The encoding is worked out from the header and the first SNIFF_BYTES of the body,
+        see sniff_encoding. If the budget runs out first, response.truncated is set, so
+        callers can tell a cut-off page from a complete one.
+        """
+        raw = self._read_raw(response)
+        try:
+            head = b""
+            for data in raw:
+                head += data
+                if len(head) >= SNIFF_BYTES:
+                    break
+
+            encoding = sniff_encoding(response.headers.get("Content-Type", ""), head)
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+            yield decoder.decode(head)
+            for data in raw:
+                yield decoder.decode(data)
+            yield decoder.decode(b"", final=True)
+        finally:
+            raw.close()
+
+    def _read_raw(self, response: requests.Response) -> Iterator[bytes]:
+        deadline = READ_DEADLINE.get()
+        received = 0
+        # Only time spent reading counts against max_seconds, not time the caller spends
+        # between reads, as when a page is read one get_content_page call at a time
+        reading_seconds = 0.0
+        arrived = self._arrived(response)
+        response.truncated = False
+
+        try:
+            while True:
+                resumed = time.monotonic()
+                data = next(arrived, None)
+                if data is None:
+                    break
+                reading_seconds += time.monotonic() - resumed
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError("deadline passed while the page was downloading")
+                data = data[: self.max_bytes - received]
+                received += len(data)
+                yield data
+
+                if received >= self.max_bytes or reading_seconds >= self.max_seconds:
+                    response.truncated = True
+                    break
+        finally:
+            response.close()
+
+    @staticmethod
+    def _arrived(response: requests.Response) -> Iterator[bytes]:
+        """Yields the body as it arrives, at most READ_CHUNK_BYTES at a time.
+
+        iter_content waits until a whole chunk has arrived, so a page trickling in could
+        run far past the budget and deadline between checks. urllib3 2's read1 returns
+        whatever has arrived instead.
+        """
+        read1 = getattr(response.raw, "read1", None)
+        if read1 is None:
+            yield from response.iter_content(READ_CHUNK_BYTES)
+            return
+
+        while data := read1(READ_CHUNK_BYTES, decode_content=True):
+            yield data
+
+    def fetch_url(self, url: str) -> str:
+        response = self.open(url)
+        response.raise_for_status()
+
+        return "".join(self.read(response))
+
+    def extract_page(self, page: str) -> TextArtifact:
+        return self.web_scraper_driver.extract_page(page)
+
+    def iter_text(self, url: str) -> Iterator[str]:
+        """Yields the page's text as it downloads. HTML is extracted on the fly, anything else
+        (such as ZenRows' markdown responses) is passed through."""
+        response = self.open(url)
+        response.raise_for_status()
+        is_html = "html" in response.headers.get("Content-Type", "")
+        extractor = HTMLTextExtractor()
+
+        for text in self.read(response):
+            if not is_html:
+                yield text
+                continue
+            extractor.feed(text)
+            yield extractor.take()
+
+        if is_html:
+            extractor.close()
+            yield extractor.take()
+
+
+@define
+class CachingWebScraperDriver(BaseWebScraperDriver):
+    """Caches the pages fetched and extracted by web_scraper_driver on disk.
+
+    Raw pages are cached by URL together with their ETag and Last-Modified headers. A page
+    younger than its domain's TTL is served from disk; an older one is revalidated with a
+    conditional request and only downloaded again if it changed. Extracted text is cached
+    by the hash of the raw page, so an unchanged page is never extracted twice.
+
+    Pages are fetched through the wrapped StreamingWebScraperDriver, which keeps the
+    download within its budget, so the validators can be read and sent. Pages the budget
+    cut short are returned but not cached.
+    """
+
+    web_scraper_driver: StreamingWebScraperDriver = field(kw_only=True)
+    cache: DiskCache = field(kw_only=True)
+    default_ttl: int = field(default=DEFAULT_CACHE_TTL, kw_only=True)
+    domain_ttls: dict = field(default=Factory(dict), kw_only=True)
+
+    def ttl(self, url: str) -> int:
+        host = (urlparse(url).hostname or "").lower()
+        for domain, ttl in self.domain_ttls.items():
+            if host == domain or host.endswith(f".{domain}"):
+                return ttl
+        return self.default_ttl
+
+    def fetch_url(self, url: str) -> str:
+        cached = self.cache.get(f"raw:{url}")
+        entry = json.loads(cached) if cached is not None else None
+
+        if entry is not None and time.time() - entry["fetched_at"] < self.ttl(url):
+            return entry["body"]
+
+        headers = {}
+        if entry is not None and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry is not None and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.web_scraper_driver.open(url, headers)
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            entry["fetched_at"] = time.time()
+        else:
+            response.raise_for_status()
+            entry = {
+                "body": "".join(self.web_scraper_driver.read(response)),
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+            }
+            # A page cut short by the download budget isn't the page, so it is not kept
+            if response.truncated:
+                return entry["body"]
+        self.cache.put(f"raw:{url}", json.dumps(entry).encode())
+
+        return entry["body"]
+
+    def extract_page(self, page: str) -> TextArtifact:
+        # The extracting driver's class is part of the key, since each driver extracts differently
+        extractor = type(self.web_scraper_driver.web_scraper_driver).__name__
+        key = f"text:{extractor}:{hashlib.sha256(page.encode()).hexdigest()}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            return TextArtifact(cached.decode())
+
+        artifact = self.web_scraper_driver.extract_page(page)
+        self.cache.put(key, artifact.value.encode())
+
+        return artifact
+
+
+class PageStreams:
+    """Open page streams, so consecutive pages of one URL continue a single download.
+
+    Each stream remembers the pages it has produced and reads further only when a later
+    page is requested. At most max_streams are kept open; the least recently used is
+    closed first. A stream that hasn't been read for idle_timeout seconds is closed by a
+    background thread, giving its connection back, and the page is downloaded again if
+    it is asked for later.
+    """
+
+    def __init__(
+        self,
+        driver: StreamingWebScraperDriver,
+        page_chars: int,
+        max_streams: int,
+        idle_timeout: float = DEFAULT_PAGE_STREAM_IDLE_SECONDS,
+    ) -> None:
+        self.driver = driver
+        self.page_chars = page_chars
+        self.max_streams = max_streams
+        self.idle_timeout = idle_timeout
+        self._streams = OrderedDict()
+        self._lock = threading.Lock()
+        self._sweeper = None
+        self._stop = threading.Event()
+
+    def get_page(self, url: str, page: int) -> tuple:
+        """Returns (text, has_more) for page number page of url."""
+        self._start_sweeper()
+        with self._lock:
+            stream = self._streams.get(url)
+            if stream is None:
+                stream = self._streams[url] = {
+                    "text": self.driver.iter_text(url), "pages": [], "buffer": "", "done": False,
+                    "lock": threading.Lock(), "used_at": time.monotonic(),
+                }
+            self._streams.move_to_end(url)
+            evicted = [self._streams.popitem(last=False)[1] for _ in range(len(self._streams) - self.max_streams)]
+
+        for evicted_stream in evicted:
+            with evicted_stream["lock"]:
+                evicted_stream["text"].close()
+
+        with stream["lock"]:
+            try:
+                while len(stream["pages"]) <= page and not (stream["done"] and not stream["buffer"]):
+                    self._read_page(stream)
+            except Exception:
+                with self._lock:
+                    if self._streams.get(url) is stream:
+                        del self._streams[url]
+                raise
+            finally:
+                stream["used_at"] = time.monotonic()
+
+            if page >= len(stream["pages"]):
+                return None, False
+            return stream["pages"][page], page + 1 < len(stream["pages"]) or not stream["done"] or bool(stream["buffer"])
+
+    def close_idle(self) -> None:
+        """Closes the streams that haven't been read for idle_timeout seconds."""
+        idle_since = time.monotonic() - self.idle_timeout
+        with self._lock:
+            idle = [
+                (url, stream) for url, stream in self._streams.items()
+                # A stream being read right now isn't idle, however long ago it was last used
+                if stream["used_at"] <= idle_since and stream["lock"].acquire(blocking=False)
+            ]
+            for url, _ in idle:
+                del self._streams[url]
+
+        for _, stream in idle:
+            try:
+                stream["text"].close()
+            finally:
+                stream["lock"].release()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _start_sweeper(self) -> None:
+        with self._lock:
+            if self._sweeper is not None:
+                return
+            self._sweeper = threading.Thread(target=self._run_sweeper, daemon=True)
+            self._sweeper.start()
+
+    def _run_sweeper(self) -> None:
+        while not self._stop.wait(self.idle_timeout / 2):
+            self.close_idle()
+
+    def _read_page(self, stream: dict) -> None:
+        while not stream["done"] and len(stream["buffer"]) < self.page_chars:
+            try:
+                stream["buffer"] += next(stream["text"])
+            except StopIteration:
+                stream["done"] = True
+
+        buffer = stream["buffer"]
+        if len(buffer) > self.page_chars:
+            # Break at the last line or word boundary that fits, which may be right after the page
+            cut = max(buffer.rfind("\n", 0, self.page_chars + 1), buffer.rfind(" ", 0, self.page_chars + 1))
+            cut = cut if cut > 0 else self.page_chars
+        else:
+            cut = len(buffer)
+
+        if buffer[:cut].strip():
+            stream["pages"].append(buffer[:cut].strip())
+        # The line or word break the page was cut at doesn't start the next page
+        stream["buffer"] = buffer[cut:].lstrip()
+
+
+@define
+class ConcurrentWebScraperTool(WebScraperTool):
+    """WebScraperTool that can also load many URLs concurrently in one activity call.
+
+    URLs are loaded on a shared pool of max_workers threads, with at most per_host_limit
+    requests in flight to any one host. Whatever has not finished by the deadline is
+    reported as timed out and its download is stopped, so a call takes about as long as
+    its slowest page, capped by the deadline.
+    """
+
+    max_workers: int = field(default=DEFAULT_MAX_WORKERS, kw_only=True)
+    per_host_limit: int = field(default=DEFAULT_PER_HOST_LIMIT, kw_only=True)
+    deadline: float = field(default=DEFAULT_DEADLINE, kw_only=True)
+    page_streams: Optional[PageStreams] = field(default=None, kw_only=True)
+    _executor: ThreadPoolExecutor = field(
+        default=Factory(lambda self: ThreadPoolExecutor(self.max_workers), takes_self=True), init=False
+    )
+    _host_semaphores: dict = field(default=Factory(dict), init=False)
+    _host_lock: threading.Lock = field(default=Factory(threading.Lock), init=False)
+
+    @activity(
+        config={
+            "description": "Can be used to browse several web pages at once and load their content",
+            "schema": Schema(
+                {
+                    Literal("urls", description="Valid HTTP URLs"): [str],
+                    OptionalKey(
+                        Literal(
+                            "deadline",
+                            description="Seconds to wait before returning whatever pages have loaded",
+                        )
+                    ): int,
+                }
+            ),
+        },
+    )
+    def get_contents(self, params: dict) -> ListArtifact:
+        urls = list(dict.fromkeys(params["values"]["urls"]))
+        deadline = min(params["values"].get("deadline", self.deadline), self.deadline)
+
+        # Submit the URLs round-robin across hosts, so workers waiting on one busy host
+        # don't hold up the pages of every other host
+        by_host = {}
+        for url in urls:
+            by_host.setdefault(urlparse(url).hostname, []).append(url)
+        interleaved = [url for round_urls in zip_longest(*by_host.values()) for url in round_urls if url is not None]
+
+        deadline_at = time.monotonic() + deadline
+        futures = {url: self._executor.submit(self._load, url, deadline_at) for url in interleaved}
+        wait(futures.values(), timeout=deadline)
+
+        artifacts = []
+        for url in urls:
+            future = futures[url]
+            if not future.done():
+                future.cancel()
+                artifacts.append(ErrorArtifact(f"Error getting page content from {url}: timed out after {deadline}s"))
+            elif future.exception() is not None:
+                artifacts.append(ErrorArtifact(f"Error getting page content from {url}: {future.exception()}"))
+            else:
+                try:
+                    chunks = self.text_chunker.chunk(future.result())
+                except Exception as e:
+                    artifacts.append(ErrorArtifact(f"Error getting page content from {url}: {e}"))
+                    continue
+                artifacts.extend(TextArtifact(f"Source: {url}\n\n{chunk.value}") for chunk in chunks)
+
+        return ListArtifact(artifacts)
+
+    @activity(
+        config={
+            "description": "Can be used to read a large web page one page of text at a time, "
+            "without loading the whole page first",
+            "schema": Schema(
+                {
+                    Literal("url", description="Valid HTTP URL"): str,
+                    OptionalKey(
+                        Literal("page", description="Page number to read, starting at 0 (defaults to 0)")
+                    ): int,
+                }
+            ),
+        },
+    )
+    def get_content_page(self, params: dict) -> JsonArtifact | ErrorArtifact:
+        url = params["values"]["url"]
+        page = params["values"].get("page", 0)
+
+        if self.page_streams is None:
+            return ErrorArtifact("Error getting page content: paged reading is not configured")
+
+        try:
+            text, has_more = self.page_streams.get_page(url, page)
+            if text is None:
+                return ErrorArtifact(f"Error getting page content: {url} has no page {page}")
+
+            return JsonArtifact({"url": url, "page": page, "content": text, "has_more": has_more})
+        except Exception as e:
+            return ErrorArtifact("Error getting page content: " + str(e))
+
+    def _load(self, url: str, deadline_at: float) -> TextArtifact:
+        host = urlparse(url).hostname or ""
+        with self._host_lock:
+            semaphore = self._host_semaphores.setdefault(host, threading.BoundedSemaphore(self.per_host_limit))
+
+        # Reads stop at the call's deadline, so a timed-out page doesn't keep its worker and
+        # host slot busy for the next call
+        token = READ_DEADLINE.set(deadline_at)
+        try:
+            with semaphore:
+                return self.web_loader.load(url)
+        finally:
+            READ_DEADLINE.reset(token)
+
 
 def init_tool() -> WebScraperTool:
+    max_workers = int(os.getenv("WEB_SCRAPER_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+    session = pooled_session(max_workers)
+
     driver = TrafilaturaWebScraperDriver()
     # Check the environment variable to determine which driver to use
     if (zenrows_api_key := os.getenv("ZENROWS_API_KEY")) is not None:
@@ -29,6 +689,33 @@ def init_tool() -> WebScraperTool:
         }
         driver = ProxyWebScraperDriver(proxies=proxies, params=params)
 
-    return WebScraperTool(
+    driver = streaming_driver = StreamingWebScraperDriver(
+        web_scraper_driver=driver,
+        session=session,
+        max_bytes=int(float(os.getenv("WEB_SCRAPER_MAX_PAGE_MB", DEFAULT_MAX_PAGE_MB)) * 1024 * 1024),
+        max_seconds=float(os.getenv("WEB_SCRAPER_MAX_PAGE_SECONDS", DEFAULT_MAX_PAGE_SECONDS)),
+    )
+
+    if (cache_dir := os.getenv("WEB_SCRAPER_CACHE_DIR")) is not None:
+        driver = CachingWebScraperDriver(
+            web_scraper_driver=driver,
+            cache=DiskCache(
+                cache_dir,
+                int(os.getenv("WEB_SCRAPER_CACHE_MAX_MB", DEFAULT_CACHE_MAX_MB)) * 1024 * 1024,
+            ),
+            default_ttl=int(os.getenv("WEB_SCRAPER_CACHE_TTL", DEFAULT_CACHE_TTL)),
+            domain_ttls=parse_domain_ttls(os.getenv("WEB_SCRAPER_CACHE_TTLS")),
+        )
+
+    return ConcurrentWebScraperTool(
         web_loader=WebLoader(web_scraper_driver=driver),
+        max_workers=max_workers,
+        per_host_limit=int(os.getenv("WEB_SCRAPER_PER_HOST_LIMIT", DEFAULT_PER_HOST_LIMIT)),
+        deadline=float(os.getenv("WEB_SCRAPER_DEADLINE", DEFAULT_DEADLINE)),
+        page_streams=PageStreams(
+            streaming_driver,
+            int(os.getenv("WEB_SCRAPER_PAGE_CHARS", DEFAULT_PAGE_CHARS)),
+            DEFAULT_OPEN_PAGE_STREAMS,
+            float(os.getenv("WEB_SCRAPER_PAGE_IDLE_SECONDS", DEFAULT_PAGE_STREAM_IDLE_SECONDS)),
+        ),
     )
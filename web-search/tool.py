@@ -1,12 +1,230 @@
+import hashlib
+import json
 import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
+from attrs import Factory, define, field
+
+from griptape.artifacts import ListArtifact, TextArtifact
 from griptape.tools import WebSearchTool
 from griptape.drivers import (
+    BaseWebSearchDriver,
     DuckDuckGoWebSearchDriver,
     TavilyWebSearchDriver,
     ExaWebSearchDriver,
 )
 
+DEFAULT_CACHE_TTL = 600
+DEFAULT_CACHE_SIZE = 256
+FAN_OUT_MODES = ["first", "merge"]
+DEFAULT_HEDGE_DELAY = 1.0
+DEFAULT_DEADLINE = 10.0
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "ref", "ref_src"}
+# Sentence punctuation around a word, which search engines ignore. Quotes, a leading "-" and
+# operators like "site:" change the results, so they are kept
+SENTENCE_PUNCTUATION = ",;!?."
+
+
+def normalize_query(query: str) -> str:
+    """Casefolds query, drops sentence punctuation around its words and collapses whitespace.
+
+    Every word is kept, in order, since even short words like "to" and "not" can change
+    what the query means.
+    """
+    words = (word.strip(SENTENCE_PUNCTUATION) for word in query.casefold().split())
+
+    return " ".join(word for word in words if word)
+
+
+@define
+class CachingWebSearchDriver(BaseWebSearchDriver):
+    """Caches the results of web_search_driver for ttl seconds.
+
+    Results are keyed by the provider, the normalized query, results_count and any extra
+    search arguments. Recent results are kept in an in-memory LRU of max_entries, and,
+    when cache_dir is set, also on disk so they survive restarts and are shared between
+    workers. Failed searches are not cached.
+    """
+
+    web_search_driver: BaseWebSearchDriver = field(kw_only=True)
+    ttl: int = field(default=DEFAULT_CACHE_TTL, kw_only=True)
+    max_entries: int = field(default=DEFAULT_CACHE_SIZE, kw_only=True)
+    cache_dir: Optional[str] = field(default=None, kw_only=True)
+    _entries: OrderedDict = field(default=Factory(OrderedDict), init=False)
+    _lock: threading.Lock = field(default=Factory(threading.Lock), init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.results_count = self.web_search_driver.results_count
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._prune_disk()
+
+    def search(self, query: str, **kwargs) -> ListArtifact:
+        key = self._key(query, kwargs)
+
+        results = self._get(key)
+        if results is None:
+            results = [artifact.value for artifact in self.web_search_driver.search(query, **kwargs).value]
+            self._put(key, results)
+
+        return ListArtifact([TextArtifact(result) for result in results])
+
+    def _key(self, query: str, kwargs: dict) -> str:
+        return json.dumps(
+            [
+                type(self.web_search_driver).__name__,
+                normalize_query(query),
+                self.web_search_driver.results_count,
+                kwargs,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+
+    def _get(self, key: str) -> Optional[list]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        if self.cache_dir is None:
+            return None
+
+        try:
+            with open(self._path(key)) as f:
+                stored_at, results = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if now - stored_at >= self.ttl:
+            return None
+
+        self._remember(key, stored_at, results)
+        return results
+
+    def _put(self, key: str, results: list) -> None:
+        stored_at = time.time()
+        self._remember(key, stored_at, results)
+
+        if self.cache_dir is not None:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump([stored_at, results], f)
+            os.replace(tmp_path, self._path(key))
+
+    def _remember(self, key: str, stored_at: float, results: list) -> None:
+        with self._lock:
+            self._entries[key] = (stored_at, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _prune_disk(self) -> None:
+        """Removes the disk entries that have expired, so the directory doesn't grow forever."""
+        now = time.time()
+        for entry in os.scandir(self.cache_dir):
+            try:
+                if now - entry.stat().st_mtime >= self.ttl:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{hashlib.sha256(key.encode()).hexdigest()}.json")
+
+
+def canonical_url(url: str) -> str:
+    """Returns url without the differences that don't change the page: scheme and host case,
+    a leading www., tracking parameters, the fragment and a trailing slash."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    query = urlencode(
+        [
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not name.startswith("utm_") and name not in TRACKING_PARAMS
+        ]
+    )
+
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme, host, parts.path.rstrip("/"), query, ""))
+
+
+@define
+class FanOutWebSearchDriver(BaseWebSearchDriver):
+    """Sends each search to several providers, so one slow or failing provider doesn't stall it.
+
+    In "first" mode the first driver in web_search_drivers is queried at once and the
+    others join after hedge_delay seconds, unless it has already answered; the first
+    successful result set is returned. In "merge" mode every driver is queried at once and
+    the result sets that arrive before the deadline are merged: results are deduplicated by
+    canonical URL and ranked by reciprocal rank fusion, and the top results_count are returned.
+    """
+
+    web_search_drivers: list = field(kw_only=True)
+    mode: str = field(default="first", kw_only=True)
+    hedge_delay: float = field(default=DEFAULT_HEDGE_DELAY, kw_only=True)
+    deadline: float = field(default=DEFAULT_DEADLINE, kw_only=True)
+    _executor: ThreadPoolExecutor = field(
+        default=Factory(lambda self: ThreadPoolExecutor(4 * len(self.web_search_drivers)), takes_self=True),
+        init=False,
+    )
+
+    def search(self, query: str, **kwargs) -> ListArtifact:
+        started = time.monotonic()
+        for driver in self.web_search_drivers:
+            driver.results_count = self.results_count
+
+        primary, *secondaries = self.web_search_drivers
+        futures = {self._executor.submit(primary.search, query, **kwargs): primary}
+        # Merging needs every provider's results, so only "first" mode holds the others back
+        if self.mode == "first":
+            wait(futures, timeout=self.hedge_delay)
+        if self.mode == "merge" or not self._succeeded(futures):
+            futures.update({self._executor.submit(driver.search, query, **kwargs): driver for driver in secondaries})
+
+        pending = set(futures)
+        while pending and (remaining := self.deadline - (time.monotonic() - started)) > 0:
+            if self.mode == "first" and self._succeeded(futures):
+                break
+            _, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+
+        succeeded = [future for future in futures if future.done() and future.exception() is None]
+        if not succeeded:
+            errors = [f"{type(futures[future]).__name__}: {future.exception()}" for future in futures if future.done()]
+            if len(errors) == len(futures):
+                raise Exception(f"every provider failed ({'; '.join(errors)})")
+            raise Exception(f"no provider answered within {self.deadline}s" + (f" ({'; '.join(errors)})" if errors else ""))
+
+        if self.mode == "first":
+            return next(future for future in succeeded).result()
+
+        return self._merge([future.result() for future in succeeded])
+
+    def _succeeded(self, futures: dict) -> bool:
+        return any(future.done() and future.exception() is None for future in futures)
+
+    def _merge(self, result_sets: list) -> ListArtifact:
+        merged = {}
+        for results in result_sets:
+            for rank, artifact in enumerate(results.value):
+                result = json.loads(artifact.value)
+                url = canonical_url(result.get("url", ""))
+                score, first_result = merged.get(url, (0.0, result))
+                merged[url] = (score + 1 / (rank + 1), first_result)
+
+        ranked = sorted(merged.values(), key=lambda entry: entry[0], reverse=True)
+
+        return ListArtifact([TextArtifact(json.dumps(result)) for _, result in ranked[: self.results_count]])
+
 
 def init_tool() -> WebSearchTool:
     driver = DuckDuckGoWebSearchDriver()
@@ -18,4 +236,28 @@ def init_tool() -> WebSearchTool:
 
     driver.results_count = int(os.getenv("WEBSEARCH_RESULTS_COUNT", 5))
 
+    # Fan out to every configured provider, in the same priority order, with DuckDuckGo as the fallback
+    if (fan_out_mode := os.getenv("WEBSEARCH_FANOUT")) in FAN_OUT_MODES:
+        drivers = [driver]
+        if os.getenv("TAVILY_API_KEY") is not None and os.getenv("EXA_API_KEY") is not None:
+            drivers.append(ExaWebSearchDriver(api_key=os.environ["EXA_API_KEY"]))
+        if not isinstance(driver, DuckDuckGoWebSearchDriver):
+            drivers.append(DuckDuckGoWebSearchDriver())
+
+        driver = FanOutWebSearchDriver(
+            web_search_drivers=drivers,
+            mode=fan_out_mode,
+            hedge_delay=float(os.getenv("WEBSEARCH_HEDGE_DELAY", DEFAULT_HEDGE_DELAY)),
+            deadline=float(os.getenv("WEBSEARCH_DEADLINE", DEFAULT_DEADLINE)),
+            results_count=driver.results_count,
+        )
+
+    if (cache_ttl := int(os.getenv("WEBSEARCH_CACHE_TTL", DEFAULT_CACHE_TTL))) > 0:
+        driver = CachingWebSearchDriver(
+            web_search_driver=driver,
+            ttl=cache_ttl,
+            max_entries=int(os.getenv("WEBSEARCH_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+            cache_dir=os.getenv("WEBSEARCH_CACHE_DIR"),
+        )
+
     return WebSearchTool(web_search_driver=driver)